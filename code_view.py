@@ -0,0 +1,414 @@
+"""Tk widgets for the generated-code display.
+
+Kept apart from the engine modules: this is the only place besides
+``main.py`` that imports tkinter.
+"""
+import difflib
+import re
+import time
+import tkinter as tk
+import tkinter.font as tkfont
+from array import array
+from bisect import bisect_left
+
+import vhdl_validation
+
+# Outputs larger than this are shown through a VirtualDisplay
+VIRTUAL_THRESHOLD_CHARS = 1024 * 1024
+
+# Longest time one highlighting pass may take before yielding to the event loop
+HIGHLIGHT_FRAME_SECONDS = 0.010
+
+# Types from std, std_logic_1164 and numeric_std highlighted like keywords
+VHDL_TYPES = frozenset({
+    'bit', 'bit_vector', 'boolean', 'character', 'integer', 'natural', 'positive', 'real', 'string',
+    'time', 'std_logic', 'std_logic_vector', 'std_ulogic', 'std_ulogic_vector', 'signed', 'unsigned',
+})
+
+# One line of VHDL: comments, string and character literals, numbers and words.
+# A quote after a name or ")" is an attribute tick (clk'event), not a literal.
+VHDL_TOKEN = re.compile(r"""(?P<comment>--.*)|(?P<string>"[^"]*")|(?P<char>(?<![\w)])'.')"""
+                        r"""|(?P<number>\b\d+\b)|(?P<word>\b[A-Za-z]\w*\b)""")
+
+
+class GeneratedOutput:
+    """The last generated code: what Save, Copy and the next diff start from.
+
+    The display only shows this text; once the user edits it, ``dirty`` is
+    set and the widget contents take over.  Keeping the model avoids
+    copying the whole buffer out of Tk (and stripping it) on every Save,
+    Copy or regeneration.
+    """
+    __slots__ = ('code', 'request', 'dirty')
+
+    def __init__(self, code, request):
+        self.code = code
+        self.request = request
+        self.dirty = False
+
+
+class LineNumberGutter(tk.Canvas):
+    """Line numbers for a Text widget, drawn only for the visible lines.
+
+    The gutter follows the text through its ``yscrollcommand``, which Tk
+    calls whenever the view moves, so it never reads the text itself.  Tk
+    skips that call while the visible fractions stay the same (a document
+    that fits in the view stays at 0.0/1.0 through edits), so changes to
+    the text also schedule a redraw through ``<<Modified>>``.  A redraw
+    costs one canvas item per visible line whatever the size of the
+    buffer, and the gutter is only resized when the line count gains or
+    loses a digit.
+
+    ``scroll_command`` is the command the text's scroll position is passed
+    on to (the scrollbar's ``set``); ``line_offset`` and ``line_count`` let
+    a VirtualDisplay number a window of a larger document.
+    """
+
+    def __init__(self, master, text, font, foreground='black', min_digits=3, padding=8, **kwargs):
+        kwargs.setdefault('highlightthickness', 0)
+        kwargs.setdefault('borderwidth', 0)
+        super().__init__(master, **kwargs)
+        self.text = text
+        self.font = tkfont.Font(font=font)
+        self.foreground = foreground
+        self.min_digits = min_digits
+        self.padding = padding
+        self.digits = 0
+        self.line_offset = 0
+        self.line_count = None
+        self._pending = None
+
+        # Chain onto the existing scroll command (ScrolledText's scrollbar)
+        previous = self.tk.splitlist(text.cget('yscrollcommand'))
+        self.scroll_command = (lambda first, last: self.tk.call(*previous, first, last)) if previous else None
+        text.configure(yscrollcommand=self._on_yscroll)
+        text.bind('<<Modified>>', self._on_modified, add='+')
+        self.bind('<Configure>', lambda event: self.redraw())
+        self._resize(1)
+
+    def _on_yscroll(self, first, last):
+        if self.scroll_command is not None:
+            self.scroll_command(first, last)
+        self.redraw()
+
+    def _on_modified(self, event):
+        if self._pending is None:
+            self._pending = self.after_idle(self._redraw_modified)
+
+    def _redraw_modified(self):
+        self._pending = None
+        self.redraw()
+        # Tk only sends <<Modified>> when the flag is set, so clear it for the
+        # next change unless another handler (SyntaxHighlighter) already has
+        if self.text.edit_modified():
+            self.text.edit_modified(False)
+
+    def _resize(self, line_count):
+        digits = max(len(str(line_count)), self.min_digits)
+        if digits != self.digits:
+            self.digits = digits
+            self.configure(width=self.font.measure('0' * digits) + 2 * self.padding)
+
+    def redraw(self):
+        """Redraw the numbers of the lines currently on screen."""
+        text = self.text
+        self.delete('all')
+        if self.line_count is not None:
+            self._resize(self.line_count)
+        else:
+            self._resize(int(text.index('end-1c').split('.')[0]))
+        x = int(self.cget('width')) - self.padding
+        index = text.index('@0,0')
+        while True:
+            info = text.dlineinfo(index)
+            if info is None:
+                break
+            number = int(index.split('.')[0]) + self.line_offset
+            self.create_text(x, info[1], anchor='ne', text=str(number), font=self.font, fill=self.foreground)
+            following = text.index(f'{index}+1line')
+            if following == index:
+                break
+            index = following
+
+
+def line_edits(old, new):
+    """Return the line edits turning ``old`` into ``new``.
+
+    Each edit is ``(first, last, replacement)``: lines ``first`` up to (not
+    including) ``last`` of ``old``, 0-based, are replaced by the text
+    ``replacement``.  Edits are in ascending order and refer to ``old``, so
+    apply them from the last one backwards.  The common head and tail are
+    skipped before diffing, which makes the usual one-parameter change cost
+    a single pass over the lines.
+    """
+    a = old.splitlines(True)
+    b = new.splitlines(True)
+    limit = min(len(a), len(b))
+    head = 0
+    while head < limit and a[head] == b[head]:
+        head += 1
+    tail = 0
+    while tail < limit - head and a[-1 - tail] == b[-1 - tail]:
+        tail += 1
+
+    matcher = difflib.SequenceMatcher(None, a[head:len(a) - tail], b[head:len(b) - tail], autojunk=False)
+    return [(head + i1, head + i2, ''.join(b[head + j1:head + j2]))
+            for tag, i1, i2, j1, j2 in matcher.get_opcodes() if tag != 'equal']
+
+
+def apply_line_edits(text, edits):
+    """Apply line_edits() to a Text widget, leaving unchanged lines (and the view) alone."""
+    for first, last, replacement in reversed(edits):
+        text.replace(f'{first + 1}.0', f'{last + 1}.0', replacement)
+
+
+class LineIndex:
+    """Finds line starts in a large string without a table of every line.
+
+    Only the number of newlines before each ``block`` characters is stored
+    (one ``str.count`` per block), so indexing 50 MB takes a few tens of
+    milliseconds; a lookup bisects the blocks and then scans at most one.
+    """
+
+    def __init__(self, text, block=64 * 1024):
+        self.text = text
+        self.block = block
+        counts = array('q', [0])
+        total = 0
+        for start in range(0, len(text), block):
+            total += text.count('\n', start, start + block)
+            counts.append(total)
+        self.counts = counts
+        self.lines = total + 1
+
+    def offset(self, line):
+        """Return the index in ``text`` where ``line`` (0-based) starts."""
+        if line <= 0:
+            return 0
+        if line >= self.lines:
+            return len(self.text)
+        # Last block that starts before the line's preceding newline
+        block = bisect_left(self.counts, line) - 1
+        pos = block * self.block
+        find = self.text.find
+        for _ in range(line - self.counts[block]):
+            pos = find('\n', pos) + 1
+        return pos
+
+
+class VirtualDisplay:
+    """Shows a large text read-only by materializing only the lines in view.
+
+    The full text stays in ``code``; the Text widget holds just the visible
+    window, which is rebuilt on every scroll.  The scrollbar, mouse wheel
+    and navigation keys drive the window, so first paint and scrolling cost
+    the same for a 50 MB document as for a small one.
+    """
+
+    def __init__(self, text, gutter, scrollbar):
+        self.text = text
+        self.gutter = gutter
+        self.scrollbar = scrollbar
+        self.code = None
+        self.index = None
+        self.top = 0
+        self._saved_scroll_command = None
+        self._linespace = tkfont.Font(font=text.cget('font')).metrics('linespace')
+
+        for sequence, handler in (('<MouseWheel>', self._on_wheel), ('<Button-4>', self._on_wheel),
+                                  ('<Button-5>', self._on_wheel), ('<Prior>', lambda e: self._key(-1, 'pages')),
+                                  ('<Next>', lambda e: self._key(1, 'pages')), ('<Up>', lambda e: self._key(-1, 'units')),
+                                  ('<Down>', lambda e: self._key(1, 'units')), ('<Control-Home>', lambda e: self._jump(0)),
+                                  ('<Control-End>', lambda e: self._jump(None)), ('<Configure>', self._on_configure)):
+            text.bind(sequence, handler, add='+')
+
+    @property
+    def active(self):
+        return self.code is not None
+
+    def show(self, code):
+        """Display ``code``, staying at the current line if already showing a document."""
+        if not self.active:
+            self._saved_scroll_command = self.gutter.scroll_command
+            self.gutter.scroll_command = None
+            self.scrollbar.configure(command=self.yview)
+            self.top = 0
+        self.code = code
+        self.index = LineIndex(code)
+        self.top = min(self.top, max(self.index.lines - 1, 0))
+        self.gutter.line_count = self.index.lines
+        self._render()
+
+    def clear(self):
+        """Leave virtual mode and hand the Text widget back, empty and editable."""
+        if not self.active:
+            return
+        self.code = self.index = None
+        self.top = 0
+        self.gutter.scroll_command = self._saved_scroll_command
+        self.gutter.line_offset = 0
+        self.gutter.line_count = None
+        self.scrollbar.configure(command=self.text.yview)
+        self.text.configure(state='normal')
+        self.text.delete('1.0', tk.END)
+
+    def yview(self, *args):
+        """Scrollbar command: ``moveto fraction`` or ``scroll n units|pages``."""
+        if not self.active:
+            return
+        if args[0] == 'moveto':
+            self._jump(int(float(args[1]) * self.index.lines))
+        elif args[0] == 'scroll':
+            step = self._rows() - 1 if args[2] == 'pages' else 1
+            self._jump(self.top + int(args[1]) * max(step, 1))
+
+    def _rows(self):
+        height = self.text.winfo_height()
+        if height <= 1:  # not mapped yet
+            return int(self.text.cget('height'))
+        return height // self._linespace + 1
+
+    def _jump(self, line):
+        if not self.active:
+            return None
+        rows = self._rows()
+        last_top = max(self.index.lines - rows + 1, 0)
+        line = last_top if line is None else min(max(line, 0), last_top)
+        if line != self.top:
+            self.top = line
+            self._render()
+        return 'break'
+
+    def _key(self, amount, what):
+        if not self.active:
+            return None
+        self.yview('scroll', amount, what)
+        return 'break'
+
+    def _on_wheel(self, event):
+        if not self.active:
+            return None
+        if event.num == 4 or event.delta > 0:
+            return self._jump(self.top - 3)
+        return self._jump(self.top + 3)
+
+    def _on_configure(self, event):
+        if self.active:
+            self._render()
+
+    def _render(self):
+        rows = self._rows()
+        start = self.index.offset(self.top)
+        end = self.index.offset(self.top + rows)
+        text = self.text
+        text.configure(state='normal')
+        text.delete('1.0', tk.END)
+        text.insert('1.0', self.code[start:end].rstrip('\n'))
+        text.configure(state='disabled')
+        self.gutter.line_offset = self.top
+        self.gutter.redraw()
+        lines = self.index.lines
+        self.scrollbar.set(self.top / lines, min((self.top + rows) / lines, 1.0))
+
+
+class SyntaxHighlighter:
+    """VHDL highlighting for a Text widget, applied only to the lines on screen.
+
+    Whenever the text changes or scrolls, one pass is scheduled for idle
+    time; it tokenizes the visible lines and retags those whose text
+    differs from what was last tagged on that line.  Token spans are cached
+    by line text, and generated code repeats most lines, so a pass is
+    mostly cache hits.  A pass that exceeds HIGHLIGHT_FRAME_SECONDS yields
+    and continues on the next idle turn.  VHDL has no multi-line tokens, so
+    lines never need to know about each other and buffer size does not
+    matter.
+    """
+
+    TAGS = ('keyword', 'type', 'comment', 'string', 'number')
+
+    def __init__(self, text, colors, cache_size=8192):
+        self.text = text
+        self.cache_size = cache_size
+        self._spans = {}
+        self._tagged = {}
+        self._pending = None
+
+        font = tkfont.Font(font=text.cget('font'))
+        bold = font.copy()
+        bold.configure(weight='bold')
+        italic = font.copy()
+        italic.configure(slant='italic')
+        self._fonts = (bold, italic)  # Tk only keeps the names
+        for tag in self.TAGS:
+            options = {'foreground': colors[tag]}
+            if tag == 'keyword':
+                options['font'] = bold
+            elif tag == 'comment':
+                options['font'] = italic
+            text.tag_configure(tag, **options)
+        text.tag_raise('sel')
+
+        previous = text.tk.splitlist(text.cget('yscrollcommand'))
+        self._scroll_command = (lambda first, last: text.tk.call(*previous, first, last)) if previous else None
+        text.configure(yscrollcommand=self._on_yscroll)
+        text.bind('<<Modified>>', self._on_modified, add='+')
+
+    def _on_yscroll(self, first, last):
+        if self._scroll_command is not None:
+            self._scroll_command(first, last)
+        self.schedule()
+
+    def _on_modified(self, event):
+        # Lines may have moved, so what was tagged where is unknown
+        if self.text.edit_modified():
+            self._tagged.clear()
+            self.text.edit_modified(False)
+            self.schedule()
+
+    def schedule(self):
+        """Highlight the visible lines once the event loop is idle."""
+        if self._pending is None:
+            self._pending = self.text.after_idle(self.highlight_visible)
+
+    def spans(self, line):
+        """Return ``(tag, start, end)`` for every highlighted token of one line."""
+        spans = self._spans.get(line)
+        if spans is None:
+            spans = []
+            for match in VHDL_TOKEN.finditer(line):
+                kind = match.lastgroup
+                if kind == 'word':
+                    word = match.group().lower()
+                    if word in vhdl_validation.RESERVED_WORDS:
+                        kind = 'keyword'
+                    elif word in VHDL_TYPES:
+                        kind = 'type'
+                    else:
+                        continue
+                elif kind == 'char':
+                    kind = 'string'
+                spans.append((kind, match.start(), match.end()))
+            spans = tuple(spans)
+            if len(self._spans) >= self.cache_size:
+                self._spans.clear()
+            self._spans[line] = spans
+        return spans
+
+    def highlight_visible(self):
+        self._pending = None
+        text = self.text
+        deadline = time.perf_counter() + HIGHLIGHT_FRAME_SECONDS
+        first = int(text.index('@0,0').split('.')[0])
+        last = int(text.index(f'@0,{text.winfo_height()}').split('.')[0])
+        for number in range(first, last + 1):
+            line = text.get(f'{number}.0', f'{number}.end')
+            if self._tagged.get(number) == line:
+                continue
+            for tag in self.TAGS:
+                text.tag_remove(tag, f'{number}.0', f'{number}.end')
+            for tag, start, end in self.spans(line):
+                text.tag_add(tag, f'{number}.{start}', f'{number}.{end}')
+            self._tagged[number] = line
+            if time.perf_counter() > deadline:
+                self.schedule()
+                return
@@ -0,0 +1,204 @@
+"""Text of the Help window, imported the first time Help is opened."""
+
+# (tab title, text) in display order
+HELP_TABS = (
+    # GUI guide
+    ('واجهة البرنامج', """
+دليل واجهة المستخدم (GUI):
+
+▼ القسم العلوي (شريط العنوان):
+   ┌──────────────────────────────────────┐
+   │  VHDL Code Generator    [Help]       │ ← زر المساعدة في أعلى اليمين
+   └──────────────────────────────────────┘
+
+▼ قسم التكوين (Configuration):
+   ┌──────────────────────────────────────┐
+   │ Component Configuration:             │
+   │ ▶ Select Component: [قائمة منسدلة]   │ ← اختيار نوع المكون
+   │ ▶ Code Type: [Function/Procedure]    │ ← اختيار نوع الكود
+   └──────────────────────────────────────┘
+
+▼ قسم الأسماء (Names):
+   ┌──────────────────────────────────────┐
+   │ Name Configuration:                  │
+   │ ▶ Entity Name: [حقل إدخال]           │ ← اسم الكيان
+   │ ▶ Architecture Name: [حقل إدخال]     │ ← اسم البنية
+   │ ▶ Function Name: [حقل إدخال]         │ ← اسم الدالة
+   └──────────────────────────────────────┘
+
+▼ قسم المعلمات (Parameters):
+   ┌──────────────────────────────────────┐
+   │ Component Parameters:                │
+   │ [تظهر الحقول حسب المكون المختار]     │ ← معلمات خاصة بكل مكون
+   └──────────────────────────────────────┘
+
+▼ أزرار التحكم (Control Buttons):
+   ┌──────────────────────────────────────┐
+   │ [Generate Code] [Clear] [Save] [Copy]│
+   └──────────────────────────────────────┘
+   • Generate Code: إنشاء الكود
+   • Clear: مسح الكود
+   • Save: حفظ في ملف
+   • Copy: نسخ للحافظة
+
+▼ منطقة عرض الكود (Code Display):
+   ┌──────────────────────────────────────┐
+   │                                      │
+   │ [منطقة عرض الكود المُنشأ]            │ ← الكود VHDL المُنشأ
+   │                                      │
+   └──────────────────────────────────────┘
+
+ملاحظات مهمة عن الواجهة:
+• جميع الحقول مطلوبة ويجب ملؤها
+• يتغير قسم المعلمات تلقائياً حسب المكون المختار
+• يمكن تكبير نافذة البرنامج للحصول على عرض أفضل للكود
+• شريط التمرير يظهر تلقائياً عند الحاجة
+• يمكن تحديد الكود باستخدام الماوس أو Ctrl+A
+
+تلميحات سريعة:
+• حرك المؤشر فوق الحقول للحصول على تلميحات إضافية
+• الألوان المختلفة تساعد في تمييز الأقسام المختلفة
+• الأخطاء تظهر في رسائل منبثقة واضحة
+• يمكن تعديل حجم أقسام الواجهة عن طريق السحب
+"""),
+    # Getting started
+    ('البداية', """
+مرحباً بك في برنامج توليد شفرة VHDL!
+
+الخطوات الأساسية لاستخدام البرنامج:
+
+1. اختيار المكون (Component):
+   • انقر على القائمة المنسدلة "Select Component"
+   • اختر المكون الذي تريد إنشاء كود له
+   • مثال: اختر "MUX" لإنشاء مضاعف (multiplexer)
+
+2. إدخال الأسماء:
+   • Entity Name: اسم الكيان (مثل: my_mux)
+   • Architecture Name: اسم البنية (مثل: my_arch)
+   • Function/Procedure Name: اسم الدالة (مثل: my_func)
+   
+   ملاحظة: يجب أن تبدأ الأسماء بحرف وتحتوي فقط على حروف وأرقام وشرطة سفلية (_)
+
+3. إدخال المعلمات:
+   • ستظهر حقول إدخال مختلفة حسب المكون المختار
+   • أدخل القيم المطلوبة (سنشرح كل مكون بالتفصيل في علامة التبويب "المكونات")
+
+4. توليد الكود:
+   • انقر على زر "Generate Code"
+   • سيظهر الكود في النافذة السفلية
+   • يمكنك نسخ الكود أو حفظه في ملف
+
+5. الأزرار الإضافية:
+   • Clear Code: لمسح الكود المولد
+   • Save to File: لحفظ الكود في ملف
+   • Copy to Clipboard: لنسخ الكود إلى الحافظة
+"""),
+    # Components
+    ('Components', """
+شرح تفصيلي للمكونات:
+
+1. المضاعف (MUX):
+   • ما هو؟ دائرة تختار إشارة واحدة من عدة إشارات دخل
+   • المعلمات المطلوبة:
+     - Number of inputs: عدد المدخلات (يجب أن يكون 2، 4، 8، 16، ...)
+     - Width of channels: عرض كل قناة بالبت
+   • مثال عملي:
+     - Number of inputs: 4
+     - Width of channels: 8
+     → سينشئ مضاعف 4×1 مع قنوات عرض 8 بت
+
+2. موزع (DeMUX):
+   • ما هو؟ دائرة توجه إشارة دخل واحدة إلى أحد المخارج المتعددة
+   • المعلمات المطلوبة:
+     - Number of outputs: عدد المخارج (يجب أن يكون 2، 4، 8، 16، ...)
+     - Width of channels: عرض كل قناة بالبت
+   • مثال عملي:
+     - Number of outputs: 4
+     - Width of channels: 8
+     → سينشئ موزع 1×4 مع قنوات عرض 8 بت
+
+3. المشفر (Decoder):
+   • ما هو؟ يحول الشفرة الثنائية إلى إشارات منفصلة
+   • المعلمات المطلوبة:
+     - Width: عرض الدخل بالبت
+   • مثال عملي:
+     - Width: 3
+     → سينشئ مشفر مع 3 مدخلات و 8 مخارج (2^3)
+
+4. المرمز (Encoder):
+   • ما هو؟ يحول الإشارات المنفصلة إلى شفرة ثنائية
+   • المعلمات المطلوبة:
+     - Width: عرض المخرج بالبت
+   • مثال عملي:
+     - Width: 3
+     → سينشئ مرمز مع 8 مدخلات (2^3) و 3 مخارج
+
+5. سجل الإزاحة (Shift Register):
+   • ما هو؟ سجل يخزن البيانات ويمكنه إزاحتها
+   • المعلمات المطلوبة:
+     - Width: عدد البتات في السجل
+     - Type: نوع السجل (SIPO/PISO)
+   • مثال عملي:
+     - Width: 8
+     - Type: Serial-In Parallel-Out
+     → سينشئ سجل إزاحة 8 بت
+
+6. ذاكرة SRAM:
+   • ما هي؟ ذاكرة قراءة/كتابة سريعة
+   • المعلمات المطلوبة:
+     - Address Width: عرض العنوان (يحدد حجم الذاكرة)
+     - Data Width: عرض البيانات
+   • مثال عملي:
+     - Address Width: 4
+     - Data Width: 8
+     → سينشئ ذاكرة بحجم 16 موقع (2^4)، كل موقع 8 بت
+
+7. مقسم التردد (Clock Divider):
+   • ما هو؟ دائرة تقسم تردد الساعة
+   • المعلمات المطلوبة:
+     - Division Factor: معامل القسمة
+   • مثال عملي:
+     - Division Factor: 4
+     → سيقسم تردد الساعة على 4
+"""),
+    # Tips and tricks
+    ('Tips & Tricks', """
+نصائح وحيل مفيدة:
+
+1. اختيار الأسماء:
+   • استخدم أسماء وصفية تدل على وظيفة المكون
+   • تجنب الأسماء المحجوزة في VHDL مثل: signal, process, entity
+   • أمثلة جيدة:
+     - my_mux_4bit
+     - data_decoder
+     - freq_divider_10
+
+2. تحديد الأحجام:
+   • اختر أصغر حجم يلبي احتياجاتك
+   • تذكر أن الأحجام الكبيرة تستهلك موارد أكثر
+   • أمثلة:
+     - لتخزين أرقام من 0 إلى 255، استخدم عرض 8 بت
+     - لـ 4 مدخلات في المضاعف، تحتاج 2 بت للاختيار
+
+3. حل المشاكل الشائعة:
+   • إذا ظهرت رسالة خطأ عن الأسماء:
+     - تأكد أن الاسم يبدأ بحرف
+     - تأكد من عدم وجود مسافات
+     - تأكد من عدم استخدام رموز خاصة
+   
+   • إذا لم يتم توليد الكود:
+     - تأكد من إدخال جميع المعلمات المطلوبة
+     - تأكد أن القيم ضمن النطاق المسموح
+     - تأكد أن عدد المدخلات/المخارج من قوى الرقم 2
+
+4. أفضل الممارسات:
+   • احفظ الكود المولد في ملف فور إنشائه
+   • اختبر الكود مع قيم صغيرة أولاً
+   • استخدم التعليقات لتوثيق التغييرات
+
+5. اختصارات مفيدة:
+   • Ctrl+C: نسخ الكود المحدد
+   • Ctrl+V: لصق النص
+   • Ctrl+A: تحديد كل الكود
+"""),
+)
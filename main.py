@@ -1,9 +1,53 @@
+import sys
+import time
+
+# Taken before any other import, for --startup-time
+_START = time.perf_counter()
+
+if __name__ == "__main__" and sys.argv[1:2] == ["batch"]:
+    # Batch mode is headless: run vhdl_batch as the main module before any GUI
+    # import, so it works without Tk and spawned pool workers re-import only it
+    import runpy
+    del sys.argv[1]
+    runpy.run_module("vhdl_batch", run_name="__main__", alter_sys=True)
+
 import tkinter as tk
-from tkinter import messagebox, scrolledtext, ttk, filedialog
-import math
-import pyperclip
+from tkinter import messagebox, scrolledtext, ttk
 import json
-from string import Template
+import os
+import code_view
+import vhdl_budget
+import vhdl_components
+import vhdl_engine
+import vhdl_history
+import vhdl_jobs
+import vhdl_validation
+
+# How often a running generation is polled for progress
+POLL_INTERVAL_MS = 50
+
+# Live preview renders this long after the last input change
+PREVIEW_DEBOUNCE_MS = 300
+
+# Generated code is added to the display in slices of this size, one per
+# event-loop turn, so the window keeps redrawing while large files load
+INSERT_CHUNK_CHARS = 256 * 1024
+
+# Dragged frames are moved at most once per this many milliseconds (~60 fps)
+DRAG_FRAME_MS = 16
+
+# The layout is written this long after the last drag ends
+LAYOUT_SAVE_DELAY_MS = 500
+
+# Memory held by the compressed generation history
+HISTORY_MAX_BYTES = 32 * 1024 * 1024
+
+# Larger copies go through Tk's own clipboard instead of pyperclip, which may
+# pipe the whole text to a helper process
+TK_CLIPBOARD_MIN_CHARS = 1024 * 1024
+
+# Parameter entries per row of a component's panel
+PARAMS_PER_ROW = 4
 
 class ModernVHDLCodeGenerator:
     def __init__(self, root):
@@ -21,6 +65,12 @@ class ModernVHDLCodeGenerator:
         self.main_container = ttk.Frame(self.root, style='Main.TFrame')
         self.main_container.pack(fill='both', expand=True, padx=20, pady=10)
 
+        # Draggable frames by name, and their positions as placed and as last written
+        self.draggables = {}
+        self.layout = {}
+        self.saved_layout = {}
+        self.layout_save_after = None
+
         # Create header
         self.create_header()
 
@@ -37,261 +87,91 @@ class ModernVHDLCodeGenerator:
         # Create code display
         self.create_code_display()
 
-        # Initialize parameters
+        # Generated code is shared with batch runs through the disk cache, opened on first use
+        self.disk_cache = None
+
+        # Generation running in the background, and code waiting to be displayed
+        self.job = None
+        self.pending_code = None
+        self.pending_pos = 0
+        self.pending_verb = ""
+        self.output_report = ""
+        self.preview_after = None
+
+        # The last generated code (code_view.GeneratedOutput), the source for Save and Copy
+        self.output = None
+
+        # Past generations, recalled without regenerating; the window is built on first use
+        self.history = vhdl_history.GenerationHistory(HISTORY_MAX_BYTES)
+        self.history_window = None
+        self.history_list = None
+        self.history_entries = []
+        self.restoring = False
+
+        # Built on first use
+        self.help_window = None
+
+        # Initialize parameters; one panel per component, built on first use
         self.params = {}
+        self.param_panels = {}
+        self.current_panel = None
         self.update_params()
 
+        # Put back frames moved in an earlier session
+        try:
+            self.apply_layout(self.read_layout())
+            self.saved_layout = dict(self.layout)
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
         # Bind right-click to context menu
         self.root.bind('<Button-3>', self.create_context_menu)
 
     def show_help(self):
+        """Show the Help window, building it the first time it is opened."""
+        if self.help_window is None:
+            self.build_help_window()
+        self.help_window.deiconify()
+        self.help_window.lift()
+
+    def build_help_window(self):
+        """Create the Help window once; closing it only hides it."""
+        import help_content
+
         help_window = tk.Toplevel(self.root)
         help_window.title("VHDL Code Generator Help")
         help_window.geometry("900x700")
-        
-        # Configure style for help window
-        style = ttk.Style()
+        help_window.protocol("WM_DELETE_WINDOW", help_window.withdraw)
+
         help_frame = ttk.Frame(help_window, padding="20")
         help_frame.pack(fill='both', expand=True)
-        
-        # Create notebook for tabbed interface
+
+        # Create notebook for tabbed interface; a tab's text is filled in when it is first selected
         notebook = ttk.Notebook(help_frame)
         notebook.pack(fill='both', expand=True, pady=(0, 10))
+        pending = {}
+        for title, text in help_content.HELP_TABS:
+            tab = ttk.Frame(notebook, padding=10)
+            notebook.add(tab, text=title)
+            pending[str(tab)] = (tab, text)
+
+        def fill_selected_tab(event):
+            entry = pending.pop(notebook.select(), None)
+            if entry is not None:
+                tab, text = entry
+                tab_text = scrolledtext.ScrolledText(tab, wrap=tk.WORD, font=('Segoe UI', 11))
+                tab_text.pack(fill='both', expand=True)
+                tab_text.insert('1.0', text)
+                # Make the text read-only
+                tab_text.configure(state='disabled')
+
+        notebook.bind('<<NotebookTabChanged>>', fill_selected_tab)
+        fill_selected_tab(None)
 
-        # GUI Guide Tab (New First Tab)
-        gui_guide = ttk.Frame(notebook, padding=10)
-        notebook.add(gui_guide, text='واجهة البرنامج')
-        
-        gui_text = scrolledtext.ScrolledText(gui_guide, wrap=tk.WORD, font=('Segoe UI', 11))
-        gui_text.pack(fill='both', expand=True)
-        gui_text.insert('1.0', """
-دليل واجهة المستخدم (GUI):
-
-▼ القسم العلوي (شريط العنوان):
-   ┌──────────────────────────────────────┐
-   │  VHDL Code Generator    [Help]       │ ← زر المساعدة في أعلى اليمين
-   └──────────────────────────────────────┘
-
-▼ قسم التكوين (Configuration):
-   ┌──────────────────────────────────────┐
-   │ Component Configuration:             │
-   │ ▶ Select Component: [قائمة منسدلة]   │ ← اختيار نوع المكون
-   │ ▶ Code Type: [Function/Procedure]    │ ← اختيار نوع الكود
-   └──────────────────────────────────────┘
-
-▼ قسم الأسماء (Names):
-   ┌──────────────────────────────────────┐
-   │ Name Configuration:                  │
-   │ ▶ Entity Name: [حقل إدخال]           │ ← اسم الكيان
-   │ ▶ Architecture Name: [حقل إدخال]     │ ← اسم البنية
-   │ ▶ Function Name: [حقل إدخال]         │ ← اسم الدالة
-   └──────────────────────────────────────┘
-
-▼ قسم المعلمات (Parameters):
-   ┌──────────────────────────────────────┐
-   │ Component Parameters:                │
-   │ [تظهر الحقول حسب المكون المختار]     │ ← معلمات خاصة بكل مكون
-   └──────────────────────────────────────┘
-
-▼ أزرار التحكم (Control Buttons):
-   ┌──────────────────────────────────────┐
-   │ [Generate Code] [Clear] [Save] [Copy]│
-   └──────────────────────────────────────┘
-   • Generate Code: إنشاء الكود
-   • Clear: مسح الكود
-   • Save: حفظ في ملف
-   • Copy: نسخ للحافظة
-
-▼ منطقة عرض الكود (Code Display):
-   ┌──────────────────────────────────────┐
-   │                                      │
-   │ [منطقة عرض الكود المُنشأ]            │ ← الكود VHDL المُنشأ
-   │                                      │
-   └──────────────────────────────────────┘
-
-ملاحظات مهمة عن الواجهة:
-• جميع الحقول مطلوبة ويجب ملؤها
-• يتغير قسم المعلمات تلقائياً حسب المكون المختار
-• يمكن تكبير نافذة البرنامج للحصول على عرض أفضل للكود
-• شريط التمرير يظهر تلقائياً عند الحاجة
-• يمكن تحديد الكود باستخدام الماوس أو Ctrl+A
-
-تلميحات سريعة:
-• حرك المؤشر فوق الحقول للحصول على تلميحات إضافية
-• الألوان المختلفة تساعد في تمييز الأقسام المختلفة
-• الأخطاء تظهر في رسائل منبثقة واضحة
-• يمكن تعديل حجم أقسام الواجهة عن طريق السحب
-""")
-
-        # Make gui_text read-only
-        gui_text.configure(state='disabled')
-        
-        # Add other existing tabs
-        getting_started = ttk.Frame(notebook, padding=10)
-        notebook.add(getting_started, text='البداية')
-        
-        start_text = scrolledtext.ScrolledText(getting_started, wrap=tk.WORD, font=('Segoe UI', 11))
-        start_text.pack(fill='both', expand=True)
-        start_text.insert('1.0', """
-مرحباً بك في برنامج توليد شفرة VHDL!
-
-الخطوات الأساسية لاستخدام البرنامج:
-
-1. اختيار المكون (Component):
-   • انقر على القائمة المنسدلة "Select Component"
-   • اختر المكون الذي تريد إنشاء كود له
-   • مثال: اختر "MUX" لإنشاء مضاعف (multiplexer)
-
-2. إدخال الأسماء:
-   • Entity Name: اسم الكيان (مثل: my_mux)
-   • Architecture Name: اسم البنية (مثل: my_arch)
-   • Function/Procedure Name: اسم الدالة (مثل: my_func)
-   
-   ملاحظة: يجب أن تبدأ الأسماء بحرف وتحتوي فقط على حروف وأرقام وشرطة سفلية (_)
-
-3. إدخال المعلمات:
-   • ستظهر حقول إدخال مختلفة حسب المكون المختار
-   • أدخل القيم المطلوبة (سنشرح كل مكون بالتفصيل في علامة التبويب "المكونات")
-
-4. توليد الكود:
-   • انقر على زر "Generate Code"
-   • سيظهر الكود في النافذة السفلية
-   • يمكنك نسخ الكود أو حفظه في ملف
-
-5. الأزرار الإضافية:
-   • Clear Code: لمسح الكود المولد
-   • Save to File: لحفظ الكود في ملف
-   • Copy to Clipboard: لنسخ الكود إلى الحافظة
-""")
-        
-        # Components Tab
-        components = ttk.Frame(notebook, padding=10)
-        notebook.add(components, text='Components')
-        
-        comp_text = scrolledtext.ScrolledText(components, wrap=tk.WORD, font=('Segoe UI', 11))
-        comp_text.pack(fill='both', expand=True)
-        comp_text.insert('1.0', """
-شرح تفصيلي للمكونات:
-
-1. المضاعف (MUX):
-   • ما هو؟ دائرة تختار إشارة واحدة من عدة إشارات دخل
-   • المعلمات المطلوبة:
-     - Number of inputs: عدد المدخلات (يجب أن يكون 2، 4، 8، 16، ...)
-     - Width of channels: عرض كل قناة بالبت
-   • مثال عملي:
-     - Number of inputs: 4
-     - Width of channels: 8
-     → سينشئ مضاعف 4×1 مع قنوات عرض 8 بت
-
-2. موزع (DeMUX):
-   • ما هو؟ دائرة توجه إشارة دخل واحدة إلى أحد المخارج المتعددة
-   • المعلمات المطلوبة:
-     - Number of outputs: عدد المخارج (يجب أن يكون 2، 4، 8، 16، ...)
-     - Width of channels: عرض كل قناة بالبت
-   • مثال عملي:
-     - Number of outputs: 4
-     - Width of channels: 8
-     → سينشئ موزع 1×4 مع قنوات عرض 8 بت
-
-3. المشفر (Decoder):
-   • ما هو؟ يحول الشفرة الثنائية إلى إشارات منفصلة
-   • المعلمات المطلوبة:
-     - Width: عرض الدخل بالبت
-   • مثال عملي:
-     - Width: 3
-     → سينشئ مشفر مع 3 مدخلات و 8 مخارج (2^3)
-
-4. المرمز (Encoder):
-   • ما هو؟ يحول الإشارات المنفصلة إلى شفرة ثنائية
-   • المعلمات المطلوبة:
-     - Width: عرض المخرج بالبت
-   • مثال عملي:
-     - Width: 3
-     → سينشئ مرمز مع 8 مدخلات (2^3) و 3 مخارج
-
-5. سجل الإزاحة (Shift Register):
-   • ما هو؟ سجل يخزن البيانات ويمكنه إزاحتها
-   • المعلمات المطلوبة:
-     - Width: عدد البتات في السجل
-     - Type: نوع السجل (SIPO/PISO)
-   • مثال عملي:
-     - Width: 8
-     - Type: Serial-In Parallel-Out
-     → سينشئ سجل إزاحة 8 بت
-
-6. ذاكرة SRAM:
-   • ما هي؟ ذاكرة قراءة/كتابة سريعة
-   • المعلمات المطلوبة:
-     - Address Width: عرض العنوان (يحدد حجم الذاكرة)
-     - Data Width: عرض البيانات
-   • مثال عملي:
-     - Address Width: 4
-     - Data Width: 8
-     → سينشئ ذاكرة بحجم 16 موقع (2^4)، كل موقع 8 بت
-
-7. مقسم التردد (Clock Divider):
-   • ما هو؟ دائرة تقسم تردد الساعة
-   • المعلمات المطلوبة:
-     - Division Factor: معامل القسمة
-   • مثال عملي:
-     - Division Factor: 4
-     → سيقسم تردد الساعة على 4
-""")
-        
-        # Tips and Tricks Tab
-        tips = ttk.Frame(notebook, padding=10)
-        notebook.add(tips, text='Tips & Tricks')
-        
-        tips_text = scrolledtext.ScrolledText(tips, wrap=tk.WORD, font=('Segoe UI', 11))
-        tips_text.pack(fill='both', expand=True)
-        tips_text.insert('1.0', """
-نصائح وحيل مفيدة:
-
-1. اختيار الأسماء:
-   • استخدم أسماء وصفية تدل على وظيفة المكون
-   • تجنب الأسماء المحجوزة في VHDL مثل: signal, process, entity
-   • أمثلة جيدة:
-     - my_mux_4bit
-     - data_decoder
-     - freq_divider_10
-
-2. تحديد الأحجام:
-   • اختر أصغر حجم يلبي احتياجاتك
-   • تذكر أن الأحجام الكبيرة تستهلك موارد أكثر
-   • أمثلة:
-     - لتخزين أرقام من 0 إلى 255، استخدم عرض 8 بت
-     - لـ 4 مدخلات في المضاعف، تحتاج 2 بت للاختيار
-
-3. حل المشاكل الشائعة:
-   • إذا ظهرت رسالة خطأ عن الأسماء:
-     - تأكد أن الاسم يبدأ بحرف
-     - تأكد من عدم وجود مسافات
-     - تأكد من عدم استخدام رموز خاصة
-   
-   • إذا لم يتم توليد الكود:
-     - تأكد من إدخال جميع المعلمات المطلوبة
-     - تأكد أن القيم ضمن النطاق المسموح
-     - تأكد أن عدد المدخلات/المخارج من قوى الرقم 2
-
-4. أفضل الممارسات:
-   • احفظ الكود المولد في ملف فور إنشائه
-   • اختبر الكود مع قيم صغيرة أولاً
-   • استخدم التعليقات لتوثيق التغييرات
-
-5. اختصارات مفيدة:
-   • Ctrl+C: نسخ الكود المحدد
-   • Ctrl+V: لصق النص
-   • Ctrl+A: تحديد كل الكود
-""")
-
-        # Make all text widgets read-only
-        start_text.configure(state='disabled')
-        comp_text.configure(state='disabled')
-        tips_text.configure(state='disabled')
-        
         # Close button
-        close_button = ttk.Button(help_frame, text="Close", command=help_window.destroy)
+        close_button = ttk.Button(help_frame, text="Close", command=help_window.withdraw)
         close_button.pack(pady=10)
+        self.help_window = help_window
 
     def create_header(self):
         header_frame = ttk.Frame(self.main_container, style='Header.TFrame')
@@ -344,6 +224,8 @@ class ModernVHDLCodeGenerator:
                        background=container_bg)
         style.configure('Header.TFrame', 
                        background=header_color)
+        style.configure('Panel.TFrame',
+                       background=primary_color)
         
         # Configure label frame style
         style.configure('TLabelframe', 
@@ -411,34 +293,34 @@ class ModernVHDLCodeGenerator:
         # Left column - Make draggable
         left_frame = ttk.Frame(content_frame)
         left_frame.pack(side='left', fill='both', expand=True, padx=10)
-        self.make_draggable(left_frame)
+        self.make_draggable(left_frame, 'left')
 
         # Component selection
         comp_frame = ttk.LabelFrame(left_frame, text="Component Configuration", padding=10)
         comp_frame.pack(fill='x')
-        self.make_draggable(comp_frame)
+        self.make_draggable(comp_frame, 'component')
 
         ttk.Label(comp_frame, text="Select Component:").grid(row=0, column=0, padx=5, pady=5, sticky='w')
         self.component_var = tk.StringVar(value="MUX")
-        components = ["MUX", "DeMUX", "Decoder", "Encoder", "Shift Register", "SRAM", "Clock Divider"]
+        components = list(vhdl_components.COMPONENTS)
         self.component_menu = ttk.Combobox(comp_frame, textvariable=self.component_var, values=components, state='readonly', width=35)
         self.component_menu.grid(row=0, column=1, padx=5, pady=5, sticky='w')
         self.component_menu.bind('<<ComboboxSelected>>', self.update_params)
 
         ttk.Label(comp_frame, text="Code Type:").grid(row=1, column=0, padx=5, pady=5, sticky='w')
         self.code_type_var = tk.StringVar(value="Function")
-        self.code_type_menu = ttk.Combobox(comp_frame, textvariable=self.code_type_var, values=["None", "Function", "Procedure"], state='readonly', width=35)
+        self.code_type_menu = ttk.Combobox(comp_frame, textvariable=self.code_type_var, values=list(vhdl_components.CODE_TYPES), state='readonly', width=35)
         self.code_type_menu.grid(row=1, column=1, padx=5, pady=5, sticky='w')
 
         # Right column - Make draggable
         right_frame = ttk.Frame(content_frame)
         right_frame.pack(side='right', fill='both', expand=True, padx=10)
-        self.make_draggable(right_frame)
+        self.make_draggable(right_frame, 'right')
 
         # Names configuration - Make draggable
         names_frame = ttk.LabelFrame(right_frame, text="Name Configuration", padding=10)
         names_frame.pack(fill='x')
-        self.make_draggable(names_frame)
+        self.make_draggable(names_frame, 'names')
 
         vcmd = (self.root.register(self.validate_length), '%P')
         
@@ -457,43 +339,62 @@ class ModernVHDLCodeGenerator:
         self.func_proc_entry = ttk.Entry(names_frame, textvariable=self.fun_var, validate='key', validatecommand=vcmd, width=35)
         self.func_proc_entry.grid(row=2, column=1, padx=5, pady=5, sticky='w')
 
-    def make_draggable(self, widget):
-        """Make a widget draggable by mouse"""
+        # Live preview follows every input
+        for var in (self.code_type_var, self.entity_var, self.arch_var, self.fun_var):
+            var.trace_add('write', self.schedule_preview)
+
+    def make_draggable(self, widget, name):
+        """Make a widget draggable by mouse; ``name`` identifies it in the saved layout"""
         widget.bind('<Button-1>', self.start_drag)
         widget.bind('<B1-Motion>', self.drag)
         widget.bind('<ButtonRelease-1>', self.stop_drag)
-        widget._drag_data = {'x': 0, 'y': 0, 'dragging': False}
+        widget._drag_data = {'name': name, 'pack': widget.pack_info(), 'dragging': False, 'pending': None}
+        self.draggables[name] = widget
 
     def start_drag(self, event):
         """Begin drag of a widget"""
         widget = event.widget
-        widget._drag_data = {
-            'x': event.x,
-            'y': event.y,
+        widget._drag_data.update({
+            'x_root': event.x_root,
+            'y_root': event.y_root,
             'dragging': True,
             'start_x': widget.winfo_x(),
-            'start_y': widget.winfo_y()
-        }
+            'start_y': widget.winfo_y(),
+            'target': None,
+        })
         # Raise the widget to the top
         widget.lift()
 
     def drag(self, event):
-        """Handle dragging of the widget"""
+        """Record where the widget should go; it is moved at most once per frame"""
         widget = event.widget
-        if widget._drag_data['dragging']:
-            # Calculate the new position
-            dx = event.x - widget._drag_data['x']
-            dy = event.y - widget._drag_data['y']
-            new_x = widget._drag_data['start_x'] + dx
-            new_y = widget._drag_data['start_y'] + dy
-            
-            # Move the widget using place
-            widget.place(x=new_x, y=new_y)
+        data = widget._drag_data
+        if data['dragging']:
+            # Screen coordinates, since the widget itself moves under the pointer
+            data['target'] = (data['start_x'] + event.x_root - data['x_root'],
+                              data['start_y'] + event.y_root - data['y_root'])
+            if data['pending'] is None:
+                data['pending'] = widget.after(DRAG_FRAME_MS, self.apply_drag, widget)
+
+    def apply_drag(self, widget):
+        """Move a dragged widget to the latest pointer position"""
+        data = widget._drag_data
+        data['pending'] = None
+        if data['target'] is not None:
+            x, y = data['target']
+            widget.place(x=x, y=y)
+            self.layout[data['name']] = {'x': x, 'y': y}
 
     def stop_drag(self, event):
         """End drag of a widget"""
         widget = event.widget
-        widget._drag_data['dragging'] = False
+        data = widget._drag_data
+        if data['pending'] is not None:
+            widget.after_cancel(data['pending'])
+        self.apply_drag(widget)
+        data['dragging'] = False
+        if data['target'] is not None:
+            self.schedule_layout_save()
 
     def create_buttons(self):
         button_frame = ttk.Frame(self.main_container)
@@ -503,10 +404,26 @@ class ModernVHDLCodeGenerator:
         buttons_center = ttk.Frame(button_frame)
         buttons_center.pack(anchor='center')
 
-        ttk.Button(buttons_center, text="Generate Code", command=self.generate_code, style='TButton').pack(side='left', padx=5)
+        self.generate_button = ttk.Button(buttons_center, text="Generate Code", command=self.generate_code, style='TButton')
+        self.generate_button.pack(side='left', padx=5)
+        self.cancel_button = ttk.Button(buttons_center, text="Cancel", command=self.cancel_generation, style='TButton', state='disabled')
+        self.cancel_button.pack(side='left', padx=5)
+        self.live_preview_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(buttons_center, text="Live Preview", variable=self.live_preview_var, command=self.toggle_live_preview).pack(side='left', padx=5)
         ttk.Button(buttons_center, text="Clear Code", command=self.clear_code, style='TButton').pack(side='left', padx=5)
         ttk.Button(buttons_center, text="Save to File", command=self.save_code, style='TButton').pack(side='left', padx=5)
         ttk.Button(buttons_center, text="Copy to Clipboard", command=self.copy_code, style='TButton').pack(side='left', padx=5)
+        ttk.Button(buttons_center, text="History", command=self.show_history, style='TButton').pack(side='left', padx=5)
+
+        # Progress of a running generation
+        progress_frame = ttk.Frame(button_frame)
+        progress_frame.pack(anchor='center', pady=(8, 0))
+        self.progress_var = tk.DoubleVar(value=0.0)
+        self.progress_bar = ttk.Progressbar(progress_frame, variable=self.progress_var, maximum=100, length=300, mode='determinate')
+        self.progress_bar.pack(side='left', padx=5)
+        self.status_var = tk.StringVar(value="")
+        # A negative width is a minimum, so longer reports are not cut off
+        ttk.Label(progress_frame, textvariable=self.status_var, width=-60).pack(side='left', padx=5)
 
     def create_code_display(self):
         # Create a frame for the code display with a title
@@ -517,21 +434,6 @@ class ModernVHDLCodeGenerator:
         code_container = ttk.Frame(code_frame, style='Code.TFrame')
         code_container.pack(fill='both', expand=True, padx=5, pady=5)
 
-        # Create line numbers text widget
-        self.line_numbers = tk.Text(
-            code_container,
-            width=8,
-            padx=5,
-            pady=5,
-            takefocus=0,
-            border=0,
-            background='#E8E8E8',
-            foreground='#2F4F4F',
-            font=('Consolas', 16),
-            state='disabled'
-        )
-        self.line_numbers.pack(side='left', fill='y')
-
         # Create the main code text widget
         self.code_text = scrolledtext.ScrolledText(
             code_container,
@@ -548,6 +450,16 @@ class ModernVHDLCodeGenerator:
             padx=20,
             pady=15
         )
+
+        # Line numbers follow the text through its scroll command
+        self.line_numbers = code_view.LineNumberGutter(
+            code_container,
+            self.code_text,
+            font=('Consolas', 16),
+            foreground='#2F4F4F',
+            background='#E8E8E8'
+        )
+        self.line_numbers.pack(side='left', fill='y')
         self.code_text.pack(fill='both', expand=True)
 
         # Add horizontal scrollbar
@@ -555,29 +467,22 @@ class ModernVHDLCodeGenerator:
         h_scroll.pack(side='bottom', fill='x')
         self.code_text.configure(xscrollcommand=h_scroll.set)
 
-        # Bind events for line numbers
-        self.code_text.bind('<KeyRelease>', self.update_line_numbers)
-        self.code_text.bind('<MouseWheel>', self.update_line_numbers)
-        self.code_text.bind('<ButtonRelease-1>', self.update_line_numbers)
+        # VHDL highlighting, applied to the lines on screen only
+        self.highlighter = code_view.SyntaxHighlighter(self.code_text, {
+            'keyword': '#008080',
+            'type': '#5C3C24',
+            'comment': '#808080',
+            'string': '#B22222',
+            'number': '#8B008B',
+        })
 
-    def update_line_numbers(self, event=None):
-        """Update the line numbers in the text widget."""
-        # Enable editing of line numbers
-        self.line_numbers.configure(state='normal')
-        self.line_numbers.delete('1.0', tk.END)
-        
-        # Get the total number of lines
-        total_lines = str(self.code_text.get('1.0', tk.END)).count('\n')
-        
-        # Generate line numbers
-        line_numbers = '\n'.join(str(i).rjust(3) for i in range(1, total_lines + 1))
-        self.line_numbers.insert('1.0', line_numbers)
-        
-        # Disable editing of line numbers
-        self.line_numbers.configure(state='disabled')
-        
-        # Sync scrolling
-        self.line_numbers.yview_moveto(self.code_text.yview()[0])
+        # Anything the user types, pastes or cuts makes the widget the source of the code
+        self.code_text.bind('<Key>', self.on_code_key, add='+')
+        for sequence in ('<<Paste>>', '<<Cut>>', '<<Clear>>', '<<Undo>>', '<<Redo>>'):
+            self.code_text.bind(sequence, self.mark_code_edited, add='+')
+
+        # Very large outputs are shown a window at a time
+        self.virtual_display = code_view.VirtualDisplay(self.code_text, self.line_numbers, self.code_text.vbar)
 
     def validate_length(self, new_value):
         """Validate that the input length does not exceed 15 characters and follows VHDL naming rules."""
@@ -594,115 +499,77 @@ class ModernVHDLCodeGenerator:
 
     def validate_vhdl_name(self, name, field_name):
         """Validate VHDL naming conventions."""
-        if not name:
-            messagebox.showerror("Error", f"{field_name} name cannot be empty")
-            return False
-
-        # VHDL reserved words
-        reserved_words = {
-            'abs', 'access', 'after', 'alias', 'all', 'and', 'architecture', 'array', 'assert', 'attribute',
-            'begin', 'block', 'body', 'buffer', 'bus', 'case', 'component', 'configuration', 'constant',
-            'disconnect', 'downto', 'else', 'elsif', 'end', 'entity', 'exit', 'file', 'for', 'function',
-            'generate', 'generic', 'group', 'guarded', 'if', 'impure', 'in', 'inertial', 'inout', 'is',
-            'label', 'library', 'linkage', 'literal', 'loop', 'map', 'mod', 'nand', 'new', 'next', 'nor',
-            'not', 'null', 'of', 'on', 'open', 'or', 'others', 'out', 'package', 'port', 'postponed',
-            'procedure', 'process', 'pure', 'range', 'record', 'register', 'reject', 'rem', 'report',
-            'return', 'rol', 'ror', 'select', 'severity', 'signal', 'shared', 'sla', 'sll', 'sra', 'srl',
-            'subtype', 'then', 'to', 'transport', 'type', 'unaffected', 'units', 'until', 'use', 'variable',
-            'wait', 'when', 'while', 'with', 'xnor', 'xor'
-        }
-
-        # Check if name is a reserved word
-        if name.lower() in reserved_words:
-            messagebox.showerror("Error", f"{field_name} name '{name}' is a VHDL reserved word")
-            return False
-
-        # Check for spaces
-        if ' ' in name:
-            messagebox.showerror("Error", f"{field_name} name cannot contain spaces")
-            return False
-
-        # Must start with a letter
-        if not name[0].isalpha():
-            messagebox.showerror("Error", f"{field_name} name must start with a letter")
-            return False
-
-        # Can only contain letters, numbers, and underscores
-        if not all(c.isalnum() or c == '_' for c in name):
-            messagebox.showerror("Error", f"{field_name} name can only contain letters, numbers, and underscores")
+        error = vhdl_validation.check_vhdl_name(name, field_name)
+        if error:
+            messagebox.showerror("Error", error)
             return False
-
-        # Cannot end with an underscore
-        if name.endswith('_'):
-            messagebox.showerror("Error", f"{field_name} name cannot end with an underscore")
-            return False
-
-        # Cannot have consecutive underscores
-        if '__' in name:
-            messagebox.showerror("Error", f"{field_name} name cannot contain consecutive underscores")
-            return False
-
         return True
 
     def update_params(self, *args):
-        # Clear previous parameters
-        for widget in self.param_frame.winfo_children():
-            widget.destroy()
-        self.params.clear()
+        """Show the parameter panel of the selected component.
 
+        Panels are built the first time a component is selected and then
+        only swapped in and out, so switching is immediate and each
+        component keeps the values entered for it.
+        """
         component = self.component_var.get()
-        if component == "MUX":
-            self.params["Number of inputs"] = tk.StringVar()
-            tk.Label(self.param_frame, text="Number of inputs:", bg='#E8B88C', fg='#5C3C24', font=('Segoe UI', 11)).grid(row=0, column=0, padx=10, pady=5, sticky='e')
-            ttk.Entry(self.param_frame, textvariable=self.params["Number of inputs"], width=15).grid(row=0, column=1, padx=10, pady=5, sticky='w')
-            self.params["Width of channels"] = tk.StringVar()
-            tk.Label(self.param_frame, text="Width of channels:", bg='#E8B88C', fg='#5C3C24', font=('Segoe UI', 11)).grid(row=0, column=2, padx=10, pady=5, sticky='e')
-            ttk.Entry(self.param_frame, textvariable=self.params["Width of channels"], width=15).grid(row=0, column=3, padx=10, pady=5, sticky='w')
-        elif component == "DeMUX":
-            self.params["Number of outputs"] = tk.StringVar()
-            tk.Label(self.param_frame, text="Number of outputs:", bg='#E8B88C', fg='#5C3C24', font=('Segoe UI', 11)).grid(row=0, column=0, padx=10, pady=5, sticky='e')
-            ttk.Entry(self.param_frame, textvariable=self.params["Number of outputs"], width=15).grid(row=0, column=1, padx=10, pady=5, sticky='w')
-            self.params["Width of channels"] = tk.StringVar()
-            tk.Label(self.param_frame, text="Width of channels:", bg='#E8B88C', fg='#5C3C24', font=('Segoe UI', 11)).grid(row=0, column=2, padx=10, pady=5, sticky='e')
-            ttk.Entry(self.param_frame, textvariable=self.params["Width of channels"], width=15).grid(row=0, column=3, padx=10, pady=5, sticky='w')
-        elif component == "Decoder":
-            self.params["Width"] = tk.StringVar()
-            tk.Label(self.param_frame, text="Width of input:", bg='#E8B88C', fg='#5C3C24', font=('Segoe UI', 11)).grid(row=0, column=0, padx=10, pady=5, sticky='e')
-            ttk.Entry(self.param_frame, textvariable=self.params["Width"], width=15).grid(row=0, column=1, padx=10, pady=5, sticky='w')
-        elif component == "Encoder":
-            self.params["Width"] = tk.StringVar()
-            tk.Label(self.param_frame, text="Width of output:", bg='#E8B88C', fg='#5C3C24', font=('Segoe UI', 11)).grid(row=0, column=0, padx=10, pady=5, sticky='e')
-            ttk.Entry(self.param_frame, textvariable=self.params["Width"], width=15).grid(row=0, column=1, padx=10, pady=5, sticky='w')
-        elif component == "Shift Register":
-            self.params["Width"] = tk.StringVar()
-            tk.Label(self.param_frame, text="Width of register:", bg='#E8B88C', fg='#5C3C24', font=('Segoe UI', 11)).grid(row=0, column=0, padx=10, pady=5, sticky='e')
-            ttk.Entry(self.param_frame, textvariable=self.params["Width"], width=15).grid(row=0, column=1, padx=10, pady=5, sticky='w')
-            self.params["Type"] = tk.StringVar(value="Serial-In Parallel-Out")
-            tk.Label(self.param_frame, text="Type:", bg='#E8B88C', fg='#5C3C24', font=('Segoe UI', 11)).grid(row=0, column=2, padx=10, pady=5, sticky='e')
-            ttk.Combobox(self.param_frame, textvariable=self.params["Type"], values=["Serial-In Parallel-Out", "Parallel-In Serial-Out"], state='readonly', width=20).grid(row=0, column=3, padx=10, pady=5, sticky='w')
-        elif component == "SRAM":
-            self.params["addr_width"] = tk.StringVar()
-            tk.Label(self.param_frame, text="Address Width:", bg='#E8B88C', fg='#5C3C24', font=('Segoe UI', 11)).grid(row=0, column=0, padx=10, pady=5, sticky='e')
-            ttk.Entry(self.param_frame, textvariable=self.params["addr_width"], width=15).grid(row=0, column=1, padx=10, pady=5, sticky='w')
-            self.params["data_width"] = tk.StringVar()
-            tk.Label(self.param_frame, text="Data Width:", bg='#E8B88C', fg='#5C3C24', font=('Segoe UI', 11)).grid(row=0, column=2, padx=10, pady=5, sticky='e')
-            ttk.Entry(self.param_frame, textvariable=self.params["data_width"], width=15).grid(row=0, column=3, padx=10, pady=5, sticky='w')
-        elif component == "Clock Divider":
-            self.params["Division Factor"] = tk.StringVar()
-            tk.Label(self.param_frame, text="Division Factor:", bg='#E8B88C', fg='#5C3C24', font=('Segoe UI', 11)).grid(row=0, column=0, padx=10, pady=5, sticky='e')
-            ttk.Entry(self.param_frame, textvariable=self.params["Division Factor"], width=15).grid(row=0, column=1, padx=10, pady=5, sticky='w')
+        panel = self.param_panels.get(component)
+        if panel is None:
+            panel = self.param_panels[component] = self.build_param_panel(vhdl_components.COMPONENTS[component])
+        if panel is not self.current_panel:
+            if self.current_panel is not None:
+                self.current_panel[0].pack_forget()
+            panel[0].pack(anchor='w')
+            self.current_panel = panel
+        self.params = panel[1]
+        self.schedule_preview()
+
+    def build_param_panel(self, spec):
+        """Return ``(frame, vars)`` with the entry widgets for one component's parameters."""
+        frame = ttk.Frame(self.param_frame, style='Panel.TFrame')
+        variables = {}
+        for index, param in enumerate(spec.params):
+            variables[param.key] = tk.StringVar(value=param.default)
+            variables[param.key].trace_add('write', self.schedule_preview)
+            row, column = divmod(index, PARAMS_PER_ROW)
+            tk.Label(frame, text=f"{param.label}:", bg='#E8B88C', fg='#5C3C24', font=('Segoe UI', 11)).grid(row=row, column=2 * column, padx=10, pady=5, sticky='e')
+            if param.kind == "choice":
+                ttk.Combobox(frame, textvariable=variables[param.key], values=list(param.choices), state='readonly', width=20).grid(row=row, column=2 * column + 1, padx=10, pady=5, sticky='w')
+            else:
+                ttk.Entry(frame, textvariable=variables[param.key], width=15).grid(row=row, column=2 * column + 1, padx=10, pady=5, sticky='w')
+        return frame, variables
 
     def clear_code(self):
         """Clear the generated VHDL code display."""
+        self.cancel_generation()
+        self.output = None
+        self.virtual_display.clear()
         self.code_text.delete(1.0, tk.END)
 
+    def on_code_key(self, event):
+        if event.char and (event.char.isprintable() or event.keysym in ('BackSpace', 'Delete', 'Return', 'Tab')):
+            self.mark_code_edited()
+
+    def mark_code_edited(self, event=None):
+        # The virtual view is read-only, so only the regular view can be edited
+        if self.output is not None and not self.virtual_display.active:
+            self.output.dirty = True
+
+    def displayed_code(self):
+        """Return the code on display, from the output model unless the user edited it."""
+        if self.output is not None and not self.output.dirty:
+            return self.output.code
+        return self.code_text.get(1.0, tk.END).strip()
+
     def save_code(self):
         """Save the generated VHDL code to a .vhdl file."""
-        code = self.code_text.get(1.0, tk.END).strip()
+        code = self.displayed_code()
         if not code:
             messagebox.showwarning("Warning", "No code to save. Please generate code first.")
             return
 
+        from tkinter import filedialog
+
         entity_name = self.entity_entry.get().strip() or "vhdl_code"
         file_path = filedialog.asksaveasfilename(
             defaultextension=".vhdl",
@@ -711,26 +578,47 @@ class ModernVHDLCodeGenerator:
         )
         if file_path:
             try:
+                # Written a slice at a time so the file encoder never holds a second full copy
                 with open(file_path, 'w') as file:
-                    file.write(code)
+                    for start in range(0, len(code), INSERT_CHUNK_CHARS):
+                        file.write(code[start:start + INSERT_CHUNK_CHARS])
                 messagebox.showinfo("Success", f"Code saved to {file_path}")
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to save file: {str(e)}")
 
     def copy_code(self):
         """Copy the generated VHDL code to the clipboard."""
-        code = self.code_text.get(1.0, tk.END).strip()
+        code = self.displayed_code()
         if not code:
             messagebox.showwarning("Warning", "No code to copy. Please generate code first.")
             return
         try:
-            pyperclip.copy(code)
+            if len(code) >= TK_CLIPBOARD_MIN_CHARS:
+                self.root.clipboard_clear()
+                for start in range(0, len(code), INSERT_CHUNK_CHARS):
+                    self.root.clipboard_append(code[start:start + INSERT_CHUNK_CHARS])
+            else:
+                import pyperclip
+                pyperclip.copy(code)
             messagebox.showinfo("Success", "Code copied to clipboard")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to copy code: {str(e)}")
 
     def is_power_of_two(self, n):
-        return n > 0 and (n & (n - 1)) == 0
+        return vhdl_engine.is_power_of_two(n)
+
+    def collect_params(self):
+        """Read the parameter entries into the params dict used by the engine."""
+        spec = vhdl_components.COMPONENTS[self.component_var.get()]
+        params = {}
+        for param in spec.params:
+            value = self.params[param.key].get()
+            if not value:
+                if param.required:
+                    raise ValueError(f"Missing {param.label}")
+                continue
+            params[param.key] = param.parse(value)
+        return vhdl_components.normalize_params(spec.name, params)
 
     def validate_inputs(self):
         component = self.component_var.get()
@@ -750,1132 +638,269 @@ class ModernVHDLCodeGenerator:
         if not self.validate_vhdl_name(func_proc_name, "Function/Procedure"):
             return False
 
-        # Check for duplicate names
-        names = [entity_name.lower(), arch_name.lower(), func_proc_name.lower()]
-        if len(set(names)) != len(names):
-            messagebox.showerror("Error", "Entity, Architecture, and Function/Procedure names must be unique")
-            return False
-
         try:
-            if component == "MUX":
-                required = ["Number of inputs", "Width of channels"]
-                for req in required:
-                    if not self.params[req].get():
-                        messagebox.showerror("Error", f"Missing {req}")
-                        return False
-                inputs = int(self.params["Number of inputs"].get())
-                width = int(self.params["Width of channels"].get())
-                if inputs <= 0 or width <= 0:
-                    raise ValueError("Inputs and width must be positive")
-                if not self.is_power_of_two(inputs):
-                    messagebox.showerror("Error", "Number of inputs must be a power of 2")
-                    return False
-            elif component == "DeMUX":
-                required = ["Number of outputs", "Width of channels"]
-                for req in required:
-                    if not self.params[req].get():
-                        messagebox.showerror("Error", f"Missing {req}")
-                        return False
-                outputs = int(self.params["Number of outputs"].get())
-                width = int(self.params["Width of channels"].get())
-                if outputs <= 0 or width <= 0:
-                    raise ValueError("Outputs and width must be positive")
-                if not self.is_power_of_two(outputs):
-                    messagebox.showerror("Error", "Number of outputs must be a power of 2")
-                    return False
-            elif component == "Decoder":
-                required = ["Width"]
-                for req in required:
-                    if not self.params[req].get():
-                        messagebox.showerror("Error", f"Missing {req}")
-                        return False
-                width = int(self.params["Width"].get())
-                if width <= 0:
-                    raise ValueError("Width must be positive")
-                if width > 8:
-                    messagebox.showerror("Error", "Width cannot exceed 8 (would generate too many outputs)")
-                    return False
-            elif component == "Encoder":
-                required = ["Width"]
-                for req in required:
-                    if not self.params[req].get():
-                        messagebox.showerror("Error", f"Missing {req}")
-                        return False
-                width = int(self.params["Width"].get())
-                if width <= 0:
-                    raise ValueError("Width must be positive")
-                if width > 8:
-                    messagebox.showerror("Error", "Width cannot exceed 8 (would require too many inputs)")
-                    return False
-            elif component == "Shift Register":
-                required = ["Width"]
-                for req in required:
-                    if not self.params[req].get():
-                        messagebox.showerror("Error", f"Missing {req}")
-                        return False
-                width = int(self.params["Width"].get())
-                if width <= 0:
-                    raise ValueError("Width must be positive")
-                if width > 128:
-                    messagebox.showerror("Error", "Width cannot exceed 128 bits")
-                    return False
-                if not self.params["Type"].get():
-                    messagebox.showerror("Error", "Shift Register type must be selected")
-                    return False
-            elif component == "SRAM":
-                required = ["addr_width", "data_width"]
-                for req in required:
-                    if not self.params[req].get():
-                        messagebox.showerror("Error", f"Missing {req}")
-                        return False
-                addr_width = int(self.params["addr_width"].get())
-                data_width = int(self.params["data_width"].get())
-                
-                # Basic validation
-                if addr_width <= 0 or data_width <= 0:
-                    raise ValueError("Address and data width must be positive")
-                
-                # Show warnings for large values but allow them
-                if addr_width > 16:  # 65,536 addresses
-                    result = messagebox.askquestion("Warning", 
-                        f"Large address width ({addr_width} bits) will generate {2**addr_width:,} memory locations.\n" +
-                        "This might require significant hardware resources.\n" +
-                        "Do you want to continue?")
-                    if result != 'yes':
-                        return False
-                
-                if data_width > 128:  # 128-bit data
-                    result = messagebox.askquestion("Warning",
-                        f"Large data width ({data_width} bits) might require significant hardware resources.\n" +
-                        "Do you want to continue?")
-                    if result != 'yes':
-                        return False
-                        
-            elif component == "Clock Divider":
-                required = ["Division Factor"]
-                for req in required:
-                    if not self.params[req].get():
-                        messagebox.showerror("Error", f"Missing {req}")
-                        return False
-                div_factor = int(self.params["Division Factor"].get())
-                if div_factor <= 0:
-                    raise ValueError("Division Factor must be positive")
-                if div_factor > 1048576:  # 2^20
-                    messagebox.showerror("Error", "Division Factor cannot exceed 1048576")
-                    return False
+            params = self.collect_params()
+            vhdl_validation.validate_request(component, self.code_type_var.get(),
+                                             entity_name, arch_name, func_proc_name, params,
+                                             vhdl_budget.DEFAULT_BUDGET)
         except ValueError as e:
             messagebox.showerror("Error", f"Invalid input: {str(e)}")
             return False
+
+        # Ask before generating valid but very large components
+        for param in vhdl_components.COMPONENTS[component].params:
+            message = param.warning_for(params[param.key])
+            if message and messagebox.askquestion("Warning", message) != 'yes':
+                return False
         return True
 
     def generate_code(self):
+        """Validate the inputs and start generating in the background."""
+        if self.job is not None or self.pending_code is not None:
+            return
         try:
             if not self.validate_inputs():
                 return
 
-            component = self.component_var.get()
-            code_type = self.code_type_var.get()
-            entity_name = self.entity_entry.get()
-            arch_name = self.arch_entry.get()
-            func_proc_name = self.func_proc_entry.get()
-
-            params = {}
-            if component == "MUX":
-                params = {
-                    "inputs": int(self.params["Number of inputs"].get()),
-                    "width": int(self.params["Width of channels"].get())
-                }
-            elif component == "DeMUX":
-                params = {
-                    "outputs": int(self.params["Number of outputs"].get()),
-                    "width": int(self.params["Width of channels"].get())
-                }
-            elif component == "Decoder":
-                params = {"width": int(self.params["Width"].get())}
-            elif component == "Encoder":
-                params = {"width": int(self.params["Width"].get())}
-            elif component == "Shift Register":
-                params = {
-                    "width": int(self.params["Width"].get()),
-                    "type": self.params["Type"].get()
-                }
-            elif component == "SRAM":
-                params = {
-                    "addr_width": int(self.params["addr_width"].get()),
-                    "data_width": int(self.params["data_width"].get())
-                }
-            elif component == "Clock Divider":
-                params = {"div_factor": int(self.params["Division Factor"].get())}
-
-            if code_type == "None":
-                vhdl_code = self.get_basic_vhdl_code(component, entity_name, arch_name, params)
-            else:
-                vhdl_code = self.get_vhdl_code(component, code_type, entity_name, arch_name, func_proc_name, params)
-
-            self.code_text.delete(1.0, tk.END)
-            self.code_text.insert(tk.END, vhdl_code)
+            request = self.current_request()
         except Exception as e:
             messagebox.showerror("Error", f"An unexpected error occurred: {str(e)}")
+            return
+        self.start_generation(request)
+
+    def current_request(self):
+        """Return the request described by the inputs; raises ValueError for unreadable parameters."""
+        return {
+            "component": self.component_var.get(),
+            "code_type": self.code_type_var.get(),
+            "entity_name": self.entity_entry.get(),
+            "arch_name": self.arch_entry.get(),
+            "func_proc_name": self.func_proc_entry.get(),
+            "params": self.collect_params(),
+        }
 
-    def get_basic_vhdl_code(self, component, entity_name, arch_name, params):
-        """Generate basic VHDL code without function/procedure"""
-        from string import Template
-        
-        if component == "MUX":
-            inputs = params["inputs"]
-            width = params["width"]
-            
-            template = Template("""library IEEE;
-use IEEE.STD_LOGIC_1164.ALL;
-use IEEE.NUMERIC_STD.ALL;
-
-entity $entity_name is
-    port (
-$mux_inputs
-        sel : in std_logic_vector($sel_width downto 0);
-        Bitout : out std_logic_vector($data_width downto 0)
-    );
-end $entity_name;
-
-architecture $arch_name of $entity_name is
-begin
-    process(sel, $input_list)
-    begin
-        case to_integer(unsigned(sel)) is
-$case_statements
-            when others => Bitout <= (others => '0');
-        end case;
-    end process;
-end $arch_name;""")
-            
-            return template.substitute(
-                entity_name=entity_name,
-                arch_name=arch_name,
-                mux_inputs=self.generate_mux_inputs(inputs, width),
-                sel_width=int(math.log2(inputs))-1,
-                data_width=width-1,
-                input_list=', '.join([f'inp{i}' for i in range(inputs)]),
-                case_statements=self.generate_mux_case_statements(inputs)
-            )
-            
-        elif component == "DeMUX":
-            outputs = params["outputs"]
-            width = params["width"]
-            
-            template = Template("""library IEEE;
-use IEEE.STD_LOGIC_1164.ALL;
-use IEEE.NUMERIC_STD.ALL;
-
-entity $entity_name is
-    port (
-        input : in std_logic_vector($data_width downto 0);
-        sel : in std_logic_vector($sel_width downto 0);
-$demux_outputs
-    );
-end $entity_name;
-
-architecture $arch_name of $entity_name is
-begin
-    process(input, sel)
-    begin
-        $output_init;
-        case to_integer(unsigned(sel)) is
-$case_statements
-            when others => null;
-        end case;
-    end process;
-end $arch_name;""")
-            
-            return template.substitute(
-                entity_name=entity_name,
-                arch_name=arch_name,
-                data_width=width-1,
-                sel_width=int(math.log2(outputs))-1,
-                demux_outputs=self.generate_demux_outputs(outputs, width),
-                output_init='; '.join([f"out{i} <= (others => '0')" for i in range(outputs)]),
-                case_statements=self.generate_demux_case_statements(outputs)
-            )
-            
-        elif component == "Decoder":
-            width = params["width"]
-            num_outputs = 2**width
-            
-            template = Template("""library IEEE;
-use IEEE.STD_LOGIC_1164.ALL;
-use IEEE.NUMERIC_STD.ALL;
-
-entity $entity_name is
-    port (
-        input : in std_logic_vector($width_minus_1 downto 0);
-$outputs
-    );
-end $entity_name;
-
-architecture $arch_name of $entity_name is
-begin
-    process(input)
-    begin
-        $output_init;
-        case to_integer(unsigned(input)) is
-$case_statements
-            when others => null;
-        end case;
-    end process;
-end $arch_name;""")
-            
-            outputs = '\n'.join([f"        out{i} : out std_logic;" for i in range(num_outputs)])
-            output_init = '; '.join([f"out{i} <= '0'" for i in range(num_outputs)])
-            case_statements = '\n'.join([f"            when {i} => out{i} <= '1';" for i in range(num_outputs)])
-            
-            return template.substitute(
-                entity_name=entity_name,
-                arch_name=arch_name,
-                width_minus_1=width-1,
-                outputs=outputs,
-                output_init=output_init,
-                case_statements=case_statements
-            )
-            
-        elif component == "Encoder":
-            width = params["width"]
-            num_inputs = 2**width
-            
-            template = Template("""library IEEE;
-use IEEE.STD_LOGIC_1164.ALL;
-use IEEE.NUMERIC_STD.ALL;
-
-entity $entity_name is
-    port (
-$inputs
-        output : out std_logic_vector($width_minus_1 downto 0)
-    );
-end $entity_name;
-
-architecture $arch_name of $entity_name is
-begin
-    process($input_list)
-    begin
-        output <= (others => '0');
-$case_statements
-    end process;
-end $arch_name;""")
-            
-            inputs = '\n'.join([f"        in{i} : in std_logic;" for i in range(num_inputs)])
-            input_list = ', '.join([f"in{i}" for i in range(num_inputs)])
-            case_statements = '\n'.join([
-                f"        if in{i} = '1' then\n            output <= std_logic_vector(to_unsigned({i}, {width}));\n        end if;"
-                for i in range(num_inputs)
-            ])
-            
-            return template.substitute(
-                entity_name=entity_name,
-                arch_name=arch_name,
-                width_minus_1=width-1,
-                inputs=inputs,
-                input_list=input_list,
-                case_statements=case_statements
-            )
-            
-        elif component == "Shift Register":
-            width = params["width"]
-            shift_type = params["type"]
-            
-            if shift_type == "Serial-In Parallel-Out":
-                template = Template("""library IEEE;
-use IEEE.STD_LOGIC_1164.ALL;
-
-entity $entity_name is
-    port (
-        clk, reset : in std_logic;
-        serial_in : in std_logic;
-        parallel_out : out std_logic_vector($width_minus_1 downto 0)
-    );
-end $entity_name;
-
-architecture $arch_name of $entity_name is
-    signal shift_reg : std_logic_vector($width_minus_1 downto 0);
-begin
-    process(clk, reset)
-    begin
-        if reset = '1' then
-            shift_reg <= (others => '0');
-        elsif rising_edge(clk) then
-            shift_reg <= shift_reg($width_minus_2 downto 0) & serial_in;
-        end if;
-    end process;
-    
-    parallel_out <= shift_reg;
-end $arch_name;""")
-            else:  # Parallel-In Serial-Out
-                template = Template("""library IEEE;
-use IEEE.STD_LOGIC_1164.ALL;
-
-entity $entity_name is
-    port (
-        clk, reset, load : in std_logic;
-        parallel_in : in std_logic_vector($width_minus_1 downto 0);
-        serial_out : out std_logic
-    );
-end $entity_name;
-
-architecture $arch_name of $entity_name is
-    signal shift_reg : std_logic_vector($width_minus_1 downto 0);
-begin
-    process(clk, reset)
-    begin
-        if reset = '1' then
-            shift_reg <= (others => '0');
-        elsif rising_edge(clk) then
-            if load = '1' then
-                shift_reg <= parallel_in;
-            else
-                shift_reg <= shift_reg($width_minus_2 downto 0) & '0';
-            end if;
-        end if;
-    end process;
-    
-    serial_out <= shift_reg($width_minus_1);
-end $arch_name;""")
-            
-            return template.substitute(
-                entity_name=entity_name,
-                arch_name=arch_name,
-                width_minus_1=width-1,
-                width_minus_2=width-2
-            )
-            
-        elif component == "SRAM":
-            addr_width = params["addr_width"]
-            data_width = params["data_width"]
-            
-            template = Template("""library IEEE;
-use IEEE.STD_LOGIC_1164.ALL;
-use IEEE.NUMERIC_STD.ALL;
-
-entity $entity_name is
-    port (
-        clk : in std_logic;
-        we : in std_logic;  -- Write enable
-        addr : in std_logic_vector($addr_width_minus_1 downto 0);
-        data_in : in std_logic_vector($data_width_minus_1 downto 0);
-        data_out : out std_logic_vector($data_width_minus_1 downto 0)
-    );
-end $entity_name;
-
-architecture $arch_name of $entity_name is
-    type ram_type is array (0 to $max_addr) of std_logic_vector($data_width_minus_1 downto 0);
-    signal ram : ram_type := (others => (others => '0'));
-begin
-    process(clk)
-    begin
-        if rising_edge(clk) then
-            if we = '1' then
-                ram(to_integer(unsigned(addr))) <= data_in;
-            end if;
-        end if;
-    end process;
-    
-    data_out <= ram(to_integer(unsigned(addr)));
-end $arch_name;""")
-            
-            return template.substitute(
-                entity_name=entity_name,
-                arch_name=arch_name,
-                addr_width_minus_1=addr_width-1,
-                data_width_minus_1=data_width-1,
-                max_addr=2**addr_width-1
-            )
-            
-        elif component == "Clock Divider":
-            div_factor = params["div_factor"]
-            
-            template = Template("""library IEEE;
-use IEEE.STD_LOGIC_1164.ALL;
-use IEEE.NUMERIC_STD.ALL;
-
-entity $entity_name is
-    port (
-        clk_in : in std_logic;
-        reset : in std_logic;
-        clk_out : out std_logic
-    );
-end $entity_name;
-
-architecture $arch_name of $entity_name is
-    signal counter : integer range 0 to $div_minus_1;
-    signal temp_clk : std_logic;
-begin
-    process(clk_in, reset)
-    begin
-        if reset = '1' then
-            counter <= 0;
-            temp_clk <= '0';
-        elsif rising_edge(clk_in) then
-            if counter = $div_minus_1 then
-                temp_clk <= not temp_clk;
-                counter <= 0;
-            else
-                counter <= counter + 1;
-            end if;
-        end if;
-    end process;
-    
-    clk_out <= temp_clk;
-end $arch_name;""")
-            
-            return template.substitute(
-                entity_name=entity_name,
-                arch_name=arch_name,
-                div_minus_1=div_factor-1
-            )
-            
-        else:
-            return "-- Component type not supported"
-
-    def get_vhdl_code(self, component, code_type, entity_name, arch_name, func_proc_name, params):
-        """Generate VHDL code with function/procedure"""
-        from string import Template
-        
-        if component == "MUX":
-            inputs = params["inputs"]
-            width = params["width"]
-            sel_width = int(math.log2(inputs))-1
-            
-            if code_type == "Function":
-                template = Template("""library IEEE;
-use IEEE.STD_LOGIC_1164.ALL;
-use IEEE.NUMERIC_STD.ALL;
-
-entity $entity_name is
-    port (
-$mux_inputs
-        sel : in std_logic_vector($sel_width downto 0);
-        Bitout : out std_logic_vector($data_width downto 0)
-    );
-end $entity_name;
-
-architecture $arch_name of $entity_name is
-    function $func_name(
-$func_inputs
-        sel : std_logic_vector($sel_width downto 0))
-        return std_logic_vector is
-        variable result : std_logic_vector($data_width downto 0);
-    begin
-        case to_integer(unsigned(sel)) is
-$case_statements
-            when others => result := (others => '0');
-        end case;
-        return result;
-    end function;
-begin
-    Bitout <= $func_name($input_list, sel);
-end $arch_name;""")
-            else:  # Procedure
-                template = Template("""library IEEE;
-use IEEE.STD_LOGIC_1164.ALL;
-use IEEE.NUMERIC_STD.ALL;
-
-entity $entity_name is
-    port (
-$mux_inputs
-        sel : in std_logic_vector($sel_width downto 0);
-        Bitout : out std_logic_vector($data_width downto 0)
-    );
-end $entity_name;
-
-architecture $arch_name of $entity_name is
-    procedure $proc_name(
-$proc_inputs
-        sel : in std_logic_vector($sel_width downto 0);
-        signal output : out std_logic_vector($data_width downto 0)) is
-    begin
-        case to_integer(unsigned(sel)) is
-$case_statements
-            when others => output <= (others => '0');
-        end case;
-    end procedure;
-begin
-    process($input_list, sel)
-    begin
-        $proc_name($input_list, sel, Bitout);
-    end process;
-end $arch_name;""")
-
-            return template.substitute(
-                entity_name=entity_name,
-                arch_name=arch_name,
-                func_name=func_proc_name,
-                proc_name=func_proc_name,
-                mux_inputs=self.generate_mux_inputs(inputs, width),
-                sel_width=sel_width,
-                data_width=width-1,
-                func_inputs=self.generate_mux_func_inputs(inputs, width),
-                proc_inputs=self.generate_mux_proc_inputs(inputs, width),
-                input_list=', '.join([f'inp{i}' for i in range(inputs)]),
-                case_statements=self.generate_mux_case_statements(inputs, code_type)
-            )
-            
-        elif component == "DeMUX":
-            outputs = params["outputs"]
-            width = params["width"]
-            sel_width = int(math.log2(outputs))-1
-            
-            if code_type == "Function":
-                template = Template("""library IEEE;
-use IEEE.STD_LOGIC_1164.ALL;
-use IEEE.NUMERIC_STD.ALL;
-
-entity $entity_name is
-    port (
-        input : in std_logic_vector($data_width downto 0);
-        sel : in std_logic_vector($sel_width downto 0);
-$demux_outputs
-    );
-end $entity_name;
-
-architecture $arch_name of $entity_name is
-    type output_array is array (0 to $max_outputs) of std_logic_vector($data_width downto 0);
-    
-    function $func_name(
-        input : std_logic_vector($data_width downto 0);
-        sel : std_logic_vector($sel_width downto 0))
-        return output_array is
-        variable result : output_array;
-    begin
-        result := (others => (others => '0'));
-        case to_integer(unsigned(sel)) is
-$case_statements
-            when others => null;
-        end case;
-        return result;
-    end function;
-
-    signal output_signals : output_array;
-begin
-    output_signals <= $func_name(input, sel);
-$output_assignments
-end $arch_name;""")
-            else:  # Procedure
-                template = Template("""library IEEE;
-use IEEE.STD_LOGIC_1164.ALL;
-use IEEE.NUMERIC_STD.ALL;
-
-entity $entity_name is
-    port (
-        input : in std_logic_vector($data_width downto 0);
-        sel : in std_logic_vector($sel_width downto 0);
-$demux_outputs
-    );
-end $entity_name;
-
-architecture $arch_name of $entity_name is
-    procedure $proc_name(
-        input : in std_logic_vector($data_width downto 0);
-        sel : in std_logic_vector($sel_width downto 0);
-$proc_outputs) is
-    begin
-$output_init
-        case to_integer(unsigned(sel)) is
-$case_statements
-            when others => null;
-        end case;
-    end procedure;
-begin
-    process(input, sel)
-    begin
-        $proc_name(input, sel, $output_list);
-    end process;
-end $arch_name;""")
-
-            return template.substitute(
-                entity_name=entity_name,
-                arch_name=arch_name,
-                func_name=func_proc_name,
-                proc_name=func_proc_name,
-                data_width=width-1,
-                sel_width=sel_width,
-                max_outputs=outputs-1,
-                demux_outputs=self.generate_demux_outputs(outputs, width),
-                proc_outputs=self.generate_demux_proc_outputs(outputs, width),
-                output_init='; '.join([f"out{i} <= (others => '0')" for i in range(outputs)]),
-                case_statements=self.generate_demux_case_statements(outputs, code_type),
-                output_assignments='\n'.join([f"    out{i} <= output_signals({i});" for i in range(outputs)]),
-                output_list=', '.join([f'out{i}' for i in range(outputs)])
-            )
-            
-        elif component == "Decoder":
-            width = params["width"]
-            num_outputs = 2**width
-            
-            if code_type == "Function":
-                template = Template("""library IEEE;
-use IEEE.STD_LOGIC_1164.ALL;
-use IEEE.NUMERIC_STD.ALL;
-
-entity $entity_name is
-    port (
-        input : in std_logic_vector($width_minus_1 downto 0);
-$outputs
-    );
-end $entity_name;
-
-architecture $arch_name of $entity_name is
-    type output_array is array (0 to $max_outputs) of std_logic;
-    
-    function $func_name(input : std_logic_vector($width_minus_1 downto 0))
-        return output_array is
-        variable result : output_array := (others => '0');
-    begin
-        result(to_integer(unsigned(input))) := '1';
-        return result;
-    end function;
-
-    signal output_signals : output_array;
-begin
-    output_signals <= $func_name(input);
-$output_assignments
-end $arch_name;""")
-            else:  # Procedure
-                template = Template("""library IEEE;
-use IEEE.STD_LOGIC_1164.ALL;
-use IEEE.NUMERIC_STD.ALL;
-
-entity $entity_name is
-    port (
-        input : in std_logic_vector($width_minus_1 downto 0);
-$outputs
-    );
-end $entity_name;
-
-architecture $arch_name of $entity_name is
-    procedure $proc_name(
-        input : in std_logic_vector($width_minus_1 downto 0);
-$proc_outputs) is
-    begin
-$output_init
-        case to_integer(unsigned(input)) is
-$case_statements
-            when others => null;
-        end case;
-    end procedure;
-begin
-    process(input)
-    begin
-        $proc_name(input, $output_list);
-    end process;
-end $arch_name;""")
-
-            outputs = '\n'.join([f"        out{i} : out std_logic;" for i in range(num_outputs)])
-            output_assignments = '\n'.join([f"    out{i} <= output_signals({i});" for i in range(num_outputs)])
-            proc_outputs = '\n'.join([f"        signal out{i} : out std_logic;" for i in range(num_outputs)])
-            output_init = '; '.join([f"out{i} <= '0'" for i in range(num_outputs)])
-            case_statements = '\n'.join([f"            when {i} => out{i} <= '1';" for i in range(num_outputs)])
-            output_list = ', '.join([f'out{i}' for i in range(num_outputs)])
-            
-            return template.substitute(
-                entity_name=entity_name,
-                arch_name=arch_name,
-                func_name=func_proc_name,
-                proc_name=func_proc_name,
-                width_minus_1=width-1,
-                max_outputs=num_outputs-1,
-                outputs=outputs,
-                output_assignments=output_assignments,
-                proc_outputs=proc_outputs,
-                output_init=output_init,
-                case_statements=case_statements,
-                output_list=output_list
-            )
-            
-        elif component == "Encoder":
-            width = params["width"]
-            num_inputs = 2**width
-            
-            if code_type == "Function":
-                template = Template("""library IEEE;
-use IEEE.STD_LOGIC_1164.ALL;
-use IEEE.NUMERIC_STD.ALL;
-
-entity $entity_name is
-    port (
-$inputs
-        output : out std_logic_vector($width_minus_1 downto 0)
-    );
-end $entity_name;
-
-architecture $arch_name of $entity_name is
-    function $func_name($func_inputs)
-        return std_logic_vector is
-        variable result : std_logic_vector($width_minus_1 downto 0);
-    begin
-        result := (others => '0');
-$case_statements
-        return result;
-    end function;
-begin
-    output <= $func_name($input_list);
-end $arch_name;""")
-            else:  # Procedure
-                template = Template("""library IEEE;
-use IEEE.STD_LOGIC_1164.ALL;
-use IEEE.NUMERIC_STD.ALL;
-
-entity $entity_name is
-    port (
-$inputs
-        output : out std_logic_vector($width_minus_1 downto 0)
-    );
-end $entity_name;
-
-architecture $arch_name of $entity_name is
-    procedure $proc_name(
-$proc_inputs
-        signal output : out std_logic_vector($width_minus_1 downto 0)) is
-    begin
-        output <= (others => '0');
-$case_statements
-    end procedure;
-begin
-    process($input_list)
-    begin
-        $proc_name($input_list, output);
-    end process;
-end $arch_name;""")
-
-            inputs = '\n'.join([f"        in{i} : in std_logic;" for i in range(num_inputs)])
-            func_inputs = '\n'.join([f"        in{i} : std_logic;" for i in range(num_inputs)])
-            proc_inputs = '\n'.join([f"        signal in{i} : in std_logic;" for i in range(num_inputs)])
-            input_list = ', '.join([f"in{i}" for i in range(num_inputs)])
-            case_statements = '\n'.join([
-                f"        if in{i} = '1' then\n            {'result' if code_type == 'Function' else 'output'} := std_logic_vector(to_unsigned({i}, {width}));\n        end if;"
-                for i in range(num_inputs)
-            ])
-            
-            return template.substitute(
-                entity_name=entity_name,
-                arch_name=arch_name,
-                func_name=func_proc_name,
-                proc_name=func_proc_name,
-                width_minus_1=width-1,
-                inputs=inputs,
-                func_inputs=func_inputs,
-                proc_inputs=proc_inputs,
-                input_list=input_list,
-                case_statements=case_statements
-            )
-            
-        elif component == "Shift Register":
-            width = params["width"]
-            shift_type = params["type"]
-            
-            if shift_type == "Serial-In Parallel-Out":
-                if code_type == "Function":
-                    template = Template("""library IEEE;
-use IEEE.STD_LOGIC_1164.ALL;
-
-entity $entity_name is
-    port (
-        clk, reset : in std_logic;
-        serial_in : in std_logic;
-        parallel_out : out std_logic_vector($width_minus_1 downto 0)
-    );
-end $entity_name;
-
-architecture $arch_name of $entity_name is
-    signal shift_reg : std_logic_vector($width_minus_1 downto 0);
-    
-    function $func_name(
-        current_reg : std_logic_vector($width_minus_1 downto 0);
-        serial_in : std_logic)
-        return std_logic_vector is
-    begin
-        return current_reg($width_minus_2 downto 0) & serial_in;
-    end function;
-begin
-    process(clk, reset)
-    begin
-        if reset = '1' then
-            shift_reg <= (others => '0');
-        elsif rising_edge(clk) then
-            shift_reg <= $func_name(shift_reg, serial_in);
-        end if;
-    end process;
-    
-    parallel_out <= shift_reg;
-end $arch_name;""")
-                else:  # Procedure
-                    template = Template("""library IEEE;
-use IEEE.STD_LOGIC_1164.ALL;
-
-entity $entity_name is
-    port (
-        clk, reset : in std_logic;
-        serial_in : in std_logic;
-        parallel_out : out std_logic_vector($width_minus_1 downto 0)
-    );
-end $entity_name;
-
-architecture $arch_name of $entity_name is
-    signal shift_reg : std_logic_vector($width_minus_1 downto 0);
-    
-    procedure $proc_name(
-        signal current_reg : in std_logic_vector($width_minus_1 downto 0);
-        signal serial_in : in std_logic;
-        signal next_reg : out std_logic_vector($width_minus_1 downto 0)) is
-    begin
-        next_reg <= current_reg($width_minus_2 downto 0) & serial_in;
-    end procedure;
-begin
-    process(clk, reset)
-    begin
-        if reset = '1' then
-            shift_reg <= (others => '0');
-        elsif rising_edge(clk) then
-            $proc_name(shift_reg, serial_in, shift_reg);
-        end if;
-    end process;
-    
-    parallel_out <= shift_reg;
-end $arch_name;""")
-            
-            return template.substitute(
-                entity_name=entity_name,
-                arch_name=arch_name,
-                width_minus_1=width-1,
-                width_minus_2=width-2
-            )
-            
-        elif component == "SRAM":
-            addr_width = params["addr_width"]
-            data_width = params["data_width"]
-            
-            if code_type == "Function":
-                template = Template("""library IEEE;
-use IEEE.STD_LOGIC_1164.ALL;
-use IEEE.NUMERIC_STD.ALL;
-
-entity $entity_name is
-    port (
-        clk : in std_logic;
-        we : in std_logic;
-        addr : in std_logic_vector($addr_width_minus_1 downto 0);
-        data_in : in std_logic_vector($data_width_minus_1 downto 0);
-        data_out : out std_logic_vector($data_width_minus_1 downto 0)
-    );
-end $entity_name;
-
-architecture $arch_name of $entity_name is
-    type ram_type is array (0 to $max_addr) of std_logic_vector($data_width_minus_1 downto 0);
-    signal ram : ram_type := (others => (others => '0'));
-    
-    function $func_name(
-        memory : ram_type;
-        addr : std_logic_vector($addr_width_minus_1 downto 0))
-        return std_logic_vector is
-    begin
-        return memory(to_integer(unsigned(addr)));
-    end function;
-begin
-    process(clk)
-    begin
-        if rising_edge(clk) then
-            if we = '1' then
-                ram(to_integer(unsigned(addr))) <= data_in;
-            end if;
-        end if;
-    end process;
-    
-    data_out <= $func_name(ram, addr);
-end $arch_name;""")
-            else:  # Procedure
-                template = Template("""library IEEE;
-use IEEE.STD_LOGIC_1164.ALL;
-use IEEE.NUMERIC_STD.ALL;
-
-entity $entity_name is
-    port (
-        clk : in std_logic;
-        we : in std_logic;
-        addr : in std_logic_vector($addr_width_minus_1 downto 0);
-        data_in : in std_logic_vector($data_width_minus_1 downto 0);
-        data_out : out std_logic_vector($data_width_minus_1 downto 0)
-    );
-end $entity_name;
-
-architecture $arch_name of $entity_name is
-    type ram_type is array (0 to $max_addr) of std_logic_vector($data_width_minus_1 downto 0);
-    signal ram : ram_type := (others => (others => '0'));
-    
-    procedure $proc_name(
-        signal memory : in ram_type;
-        signal addr : in std_logic_vector($addr_width_minus_1 downto 0);
-        signal data : out std_logic_vector($data_width_minus_1 downto 0)) is
-    begin
-        data <= memory(to_integer(unsigned(addr)));
-    end procedure;
-begin
-    process(clk)
-    begin
-        if rising_edge(clk) then
-            if we = '1' then
-                ram(to_integer(unsigned(addr))) <= data_in;
-            end if;
-        end if;
-    end process;
-    
-    process(ram, addr)
-    begin
-        $proc_name(ram, addr, data_out);
-    end process;
-end $arch_name;""")
-            
-            return template.substitute(
-                entity_name=entity_name,
-                arch_name=arch_name,
-                func_name=func_proc_name,
-                proc_name=func_proc_name,
-                addr_width_minus_1=addr_width-1,
-                data_width_minus_1=data_width-1,
-                max_addr=2**addr_width-1
-            )
-            
-        elif component == "Clock Divider":
-            div_factor = params["div_factor"]
-            
-            if code_type == "Function":
-                template = Template("""library IEEE;
-use IEEE.STD_LOGIC_1164.ALL;
-use IEEE.NUMERIC_STD.ALL;
-
-entity $entity_name is
-    port (
-        clk_in : in std_logic;
-        reset : in std_logic;
-        clk_out : out std_logic
-    );
-end $entity_name;
-
-architecture $arch_name of $entity_name is
-    signal counter : integer range 0 to $div_minus_1;
-    signal temp_clk : std_logic;
-    
-    function $func_name(
-        current_count : integer;
-        current_clk : std_logic)
-        return std_logic is
-    begin
-        if current_count = $div_minus_1 then
-            return not current_clk;
-        else
-            return current_clk;
-        end if;
-    end function;
-begin
-    process(clk_in, reset)
-    begin
-        if reset = '1' then
-            counter <= 0;
-            temp_clk <= '0';
-        elsif rising_edge(clk_in) then
-            if counter = $div_minus_1 then
-                temp_clk <= $func_name(counter, temp_clk);
-                counter <= 0;
-            else
-                counter <= counter + 1;
-            end if;
-        end if;
-    end process;
-    
-    clk_out <= temp_clk;
-end $arch_name;""")
-            else:  # Procedure
-                template = Template("""library IEEE;
-use IEEE.STD_LOGIC_1164.ALL;
-use IEEE.NUMERIC_STD.ALL;
-
-entity $entity_name is
-    port (
-        clk_in : in std_logic;
-        reset : in std_logic;
-        clk_out : out std_logic
-    );
-end $entity_name;
-
-architecture $arch_name of $entity_name is
-    signal counter : integer range 0 to $div_minus_1;
-    signal temp_clk : std_logic;
-    
-    procedure $proc_name(
-        signal current_count : in integer;
-        signal current_clk : in std_logic;
-        signal next_clk : out std_logic) is
-    begin
-        if current_count = $div_minus_1 then
-            next_clk <= not current_clk;
-        else
-            next_clk <= current_clk;
-        end if;
-    end procedure;
-begin
-    process(clk_in, reset)
-    begin
-        if reset = '1' then
-            counter <= 0;
-            temp_clk <= '0';
-        elsif rising_edge(clk_in) then
-            if counter = $div_minus_1 then
-                $proc_name(counter, temp_clk, temp_clk);
-                counter <= 0;
-            else
-                counter <= counter + 1;
-            end if;
-        end if;
-    end process;
-    
-    clk_out <= temp_clk;
-end $arch_name;""")
-            
-            return template.substitute(
-                entity_name=entity_name,
-                arch_name=arch_name,
-                func_name=func_proc_name,
-                proc_name=func_proc_name,
-                div_minus_1=div_factor-1
-            )
-            
-        else:
-            return "-- Component type not supported"
+    def start_generation(self, request):
+        if self.disk_cache is None:
+            import vhdl_cache
+            self.disk_cache = vhdl_cache.DiskCache()
+        self.job = vhdl_jobs.GenerationJob(**request, disk_cache=self.disk_cache, history=self.history).start()
+        self.set_busy(True, "Generating...")
+        self.root.after(POLL_INTERVAL_MS, self.poll_generation, self.job)
+
+    def toggle_live_preview(self):
+        if self.live_preview_var.get():
+            self.schedule_preview()
+        elif self.preview_after is not None:
+            self.root.after_cancel(self.preview_after)
+            self.preview_after = None
+
+    def schedule_preview(self, *args):
+        """Re-render shortly after the last input change, if live preview is on.
+
+        Each change restarts the delay, so a burst of typing leads to one
+        render at most.
+        """
+        if not self.live_preview_var.get() or self.restoring:
+            return
+        if self.preview_after is not None:
+            self.root.after_cancel(self.preview_after)
+        self.preview_after = self.root.after(PREVIEW_DEBOUNCE_MS, self.run_preview)
 
-    def generate_mux_inputs(self, inputs, width):
-        return '\n'.join([f"        inp{i} : in std_logic_vector({width-1} downto 0);" for i in range(inputs)])
+    def run_preview(self):
+        """Render the current inputs, replacing any render still in flight.
 
-    def generate_mux_func_inputs(self, inputs, width):
-        return '\n'.join([f"        inp{i} : std_logic_vector({width-1} downto 0);" for i in range(inputs)])
+        Problems are shown in the status line instead of message boxes.
+        Parameter sets seen before come straight from the caches.
+        """
+        self.preview_after = None
+        try:
+            request = self.current_request()
+        except ValueError as e:
+            self.status_var.set(str(e))
+            return
+        errors = vhdl_validation.validate(**request, budget=vhdl_budget.DEFAULT_BUDGET)
+        if errors:
+            self.status_var.set(errors[0].message)
+            return
 
-    def generate_mux_proc_inputs(self, inputs, width):
-        return '\n'.join([f"        signal inp{i} : in std_logic_vector({width-1} downto 0);" for i in range(inputs)])
+        # The inputs changed since the running render started, so it is superseded
+        if self.job is not None:
+            self.job.cancel()
+            self.job = None
+        if self.pending_code is not None:
+            # Only part of that output is on display, so the next diff must start from the widget
+            self.pending_code = None
+            self.output = None
+        self.start_generation(request)
+
+    def poll_generation(self, job):
+        """Follow a background job from the Tk event loop until it finishes."""
+        if job is not self.job:
+            return  # superseded by a newer render
+        if not job.done:
+            self.progress_var.set(job.progress * 100)
+            self.status_var.set(f"Generating... {job.progress:.0%}")
+            self.root.after(POLL_INTERVAL_MS, self.poll_generation, job)
+            return
 
-    def generate_mux_case_statements(self, inputs, code_type=None):
-        if code_type == "Function":
-            return '\n'.join([f"            when {i} => result := inp{i};" for i in range(inputs)])
-        elif code_type == "Procedure":
-            return '\n'.join([f"            when {i} => output <= inp{i};" for i in range(inputs)])
+        self.job = None
+        if job.cancelled:
+            self.set_busy(False, "Generation cancelled")
+        elif job.error is not None:
+            self.set_busy(False, "")
+            messagebox.showerror("Error", f"An unexpected error occurred: {str(job.error)}")
         else:
-            return '\n'.join([f"            when {i} => Bitout <= inp{i};" for i in range(inputs)])
+            self.show_output(job.result, job.request, "Generated")
+            self.refresh_history_list()
+
+    def show_output(self, code, request, verb):
+        """Make ``code`` the current output and display it."""
+        # Components such as the MUX describe their structure (logic depth, latency) in the status line
+        spec = vhdl_components.COMPONENTS.get(request["component"])
+        self.output_report = f" - {spec.report(request['params'])}" if spec and spec.report else ""
+        if len(code) > code_view.VIRTUAL_THRESHOLD_CHARS:
+            self.output = code_view.GeneratedOutput(code, request)
+            self.virtual_display.show(code)
+            self.set_busy(False, f"{verb} {self.virtual_display.index.lines:,} lines (read-only view)"
+                                 f"{self.output_report}")
+            return
 
-    def generate_demux_outputs(self, outputs, width):
-        return '\n'.join([f"        out{i} : out std_logic_vector({width-1} downto 0);" for i in range(outputs)])
+        if self.virtual_display.active:
+            old = ''
+        elif self.output is not None and not self.output.dirty:
+            old = self.output.code
+        else:
+            old = self.code_text.get('1.0', 'end-1c')
+        self.output = code_view.GeneratedOutput(code, request)
+        self.virtual_display.clear()
+        edits = code_view.line_edits(old, code) if old else None
+        if edits is not None and sum(len(replacement) for *_, replacement in edits) <= INSERT_CHUNK_CHARS:
+            # Small change: patch the changed lines in place and keep the view where it is
+            code_view.apply_line_edits(self.code_text, edits)
+            lines = code.count('\n') + 1
+            changed = sum(max(last - first, len(replacement.splitlines())) for first, last, replacement in edits)
+            self.set_busy(False, f"{verb} {lines:,} lines, {changed:,} changed{self.output_report}")
+        else:
+            self.code_text.delete(1.0, tk.END)
+            self.pending_code = code
+            self.pending_pos = 0
+            self.pending_verb = verb
+            self.set_busy(True, "Displaying...")
+            self.root.after_idle(self.insert_pending_code)
+
+    def show_history(self):
+        """Show the History window, building it the first time it is opened."""
+        if self.history_window is None:
+            self.build_history_window()
+        self.refresh_history_list()
+        self.history_window.deiconify()
+        self.history_window.lift()
+
+    def build_history_window(self):
+        """Create the History window once; closing it only hides it."""
+        history_window = tk.Toplevel(self.root)
+        history_window.title("Generation History")
+        history_window.geometry("800x400")
+        history_window.protocol("WM_DELETE_WINDOW", history_window.withdraw)
+
+        history_frame = ttk.Frame(history_window, padding="20")
+        history_frame.pack(fill='both', expand=True)
+        self.history_list = tk.Listbox(history_frame, font=('Consolas', 11), activestyle='none')
+        self.history_list.pack(fill='both', expand=True, pady=(0, 10))
+        self.history_list.bind('<Double-Button-1>', lambda event: self.restore_history_entry())
+        self.history_list.bind('<Return>', lambda event: self.restore_history_entry())
+
+        buttons = ttk.Frame(history_frame)
+        buttons.pack()
+        ttk.Button(buttons, text="Restore", command=self.restore_history_entry).pack(side='left', padx=5)
+        ttk.Button(buttons, text="Clear History", command=self.clear_history).pack(side='left', padx=5)
+        ttk.Button(buttons, text="Close", command=history_window.withdraw).pack(side='left', padx=5)
+        self.history_window = history_window
+
+    def refresh_history_list(self):
+        """List the history, newest first."""
+        if self.history_list is None:
+            return
+        self.history_entries = self.history.entries()[::-1]
+        self.history_list.delete(0, tk.END)
+        for entry in self.history_entries:
+            self.history_list.insert(tk.END, entry.describe())
+
+    def clear_history(self):
+        self.history.clear()
+        self.refresh_history_list()
+
+    def restore_history_entry(self):
+        """Bring back the selected generation: its inputs and its code, without regenerating."""
+        selection = self.history_list.curselection()
+        if not selection:
+            return
+        entry = self.history_entries[selection[0]]
 
-    def generate_demux_proc_outputs(self, outputs, width):
-        return '\n'.join([f"        signal out{i} : out std_logic_vector({width-1} downto 0);" for i in range(outputs)])
+        if self.job is not None:
+            self.job.cancel()
+            self.job = None
+        if self.pending_code is not None:
+            self.pending_code = None
+            self.output = None
 
-    def generate_demux_case_statements(self, outputs, code_type=None):
-        if code_type == "Function":
-            return '\n'.join([f"            when {i} => result({i}) := input;" for i in range(outputs)])
-        elif code_type == "Procedure":
-            return '\n'.join([f"            when {i} => out{i} <= input;" for i in range(outputs)])
+        request = entry.request
+        self.restoring = True
+        try:
+            self.component_var.set(request["component"])
+            self.update_params()
+            self.code_type_var.set(request["code_type"])
+            self.entity_var.set(request["entity_name"])
+            self.arch_var.set(request["arch_name"])
+            self.fun_var.set(request["func_proc_name"])
+            for key, value in request["params"].items():
+                self.params[key].set(str(value))
+        finally:
+            self.restoring = False
+        self.show_output(entry.code(), request, "Restored")
+
+    def insert_pending_code(self):
+        """Add the next slice of generated code to the display."""
+        code = self.pending_code
+        if code is None:
+            return
+        end = min(self.pending_pos + INSERT_CHUNK_CHARS, len(code))
+        self.code_text.insert(tk.END, code[self.pending_pos:end])
+        self.pending_pos = end
+        if end < len(code):
+            fraction = end / len(code)
+            self.progress_var.set(fraction * 100)
+            self.status_var.set(f"Displaying... {fraction:.0%}")
+            self.root.after(1, self.insert_pending_code)
         else:
-            return '\n'.join([f"            when {i} => out{i} <= input;" for i in range(outputs)])
+            self.pending_code = None
+            lines = code.count('\n') + 1
+            self.set_busy(False, f"{self.pending_verb} {lines:,} lines{self.output_report}")
+
+    def cancel_generation(self):
+        """Stop a running generation, or the display of its result."""
+        if self.job is not None:
+            self.job.cancel()
+            self.status_var.set("Cancelling...")
+        elif self.pending_code is not None:
+            self.pending_code = None
+            self.output = None
+            self.code_text.delete(1.0, tk.END)
+            self.set_busy(False, "Generation cancelled")
+
+    def set_busy(self, busy, status):
+        self.generate_button.configure(state='disabled' if busy else 'normal')
+        self.cancel_button.configure(state='normal' if busy else 'disabled')
+        self.progress_var.set(0.0)
+        self.status_var.set(status)
+
+    def get_basic_vhdl_code(self, component, entity_name, arch_name, params):
+        """Generate basic VHDL code without function/procedure"""
+        return vhdl_engine.get_basic_vhdl_code(component, entity_name, arch_name, params)
+
+    def get_vhdl_code(self, component, code_type, entity_name, arch_name, func_proc_name, params):
+        """Generate VHDL code with function/procedure"""
+        return vhdl_engine.get_vhdl_code(component, code_type, entity_name, arch_name, func_proc_name, params)
 
     def create_context_menu(self, event):
         """Create right-click context menu"""
@@ -1888,26 +913,59 @@ end $arch_name;""")
 
     def reset_layout(self):
         """Reset all widgets to their original positions"""
-        for widget in self.main_container.winfo_children():
-            widget.pack_forget()
-            widget.place_forget()
-        self.create_content_area()
-        self.create_buttons()
-        self.create_code_display()
-        self.update_params()
+        for widget in self.draggables.values():
+            if widget.winfo_manager() == 'place':
+                widget.place_forget()
+                widget.pack(**widget._drag_data['pack'])
+        self.layout = {}
+        self.schedule_layout_save()
+
+    def apply_layout(self, layout):
+        """Move the draggable widgets to saved positions"""
+        for name, pos in layout.items():
+            widget = self.draggables.get(name)
+            if widget is not None:
+                widget.place(x=pos['x'], y=pos['y'])
+                self.layout[name] = {'x': pos['x'], 'y': pos['y']}
+
+    def schedule_layout_save(self):
+        """Write the layout once dragging has settled"""
+        if self.layout_save_after is not None:
+            self.root.after_cancel(self.layout_save_after)
+        self.layout_save_after = self.root.after(LAYOUT_SAVE_DELAY_MS, self.autosave_layout)
+
+    def autosave_layout(self):
+        self.layout_save_after = None
+        try:
+            self.write_layout()
+        except OSError:
+            pass  # keeping the layout is a convenience
+
+    def write_layout(self):
+        """Write the layout file if the layout changed since it was last written"""
+        if self.layout == self.saved_layout:
+            return
+        path = layout_path()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.layout, f)
+        os.replace(tmp_path, path)
+        self.saved_layout = dict(self.layout)
+
+    def read_layout(self):
+        """Return the saved layout; raises OSError or ValueError if it cannot be read"""
+        with open(layout_path(), 'r') as f:
+            layout = json.load(f)
+        if not isinstance(layout, dict):
+            raise ValueError("layout file must contain an object")
+        return layout
 
     def save_layout(self):
         """Save current layout to a file"""
         try:
-            layout = {}
-            for widget in self.main_container.winfo_children():
-                if hasattr(widget, '_drag_data'):
-                    layout[str(widget)] = {
-                        'x': widget.winfo_x(),
-                        'y': widget.winfo_y()
-                    }
-            with open('layout.json', 'w') as f:
-                json.dump(layout, f)
+            self.saved_layout = None  # write even if unchanged
+            self.write_layout()
             messagebox.showinfo("Success", "Layout saved successfully!")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save layout: {str(e)}")
@@ -1915,19 +973,46 @@ end $arch_name;""")
     def load_layout(self):
         """Load layout from a file"""
         try:
-            with open('layout.json', 'r') as f:
-                layout = json.load(f)
-            for widget in self.main_container.winfo_children():
-                if str(widget) in layout:
-                    pos = layout[str(widget)]
-                    widget.place(x=pos['x'], y=pos['y'])
+            self.apply_layout(self.read_layout())
+            self.saved_layout = dict(self.layout)
             messagebox.showinfo("Success", "Layout loaded successfully!")
         except FileNotFoundError:
             messagebox.showwarning("Warning", "No saved layout found.")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load layout: {str(e)}")
 
+
+def layout_path():
+    """Return the layout file: $VHDL_CODEGEN_CONFIG or the user config dir, then layout.json."""
+    directory = os.environ.get("VHDL_CODEGEN_CONFIG")
+    if not directory:
+        base = os.environ.get("XDG_CONFIG_HOME") or os.path.join(os.path.expanduser("~"), ".config")
+        directory = os.path.join(base, "vhdl_codegen")
+    return os.path.join(directory, "layout.json")
+
+def measure_startup():
+    """Build the window, wait for its first paint and close it.
+
+    Returns ``(import_s, first_paint_s)``: the time spent importing this
+    module's dependencies and the time from there until the window was drawn.
+    """
+    imported = time.perf_counter()
+    root = tk.Tk()
+    ModernVHDLCodeGenerator(root)
+    root.update()
+    painted = time.perf_counter()
+    root.destroy()
+    return imported - _START, painted - imported
+
+
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--startup-time":
+        import_s, paint_s = measure_startup()
+        print(f"imports:     {import_s * 1000:.1f} ms")
+        print(f"first paint: {paint_s * 1000:.1f} ms")
+        print(f"total:       {(import_s + paint_s) * 1000:.1f} ms")
+        sys.exit(0)
+
     root = tk.Tk()
     app = ModernVHDLCodeGenerator(root)
     root.mainloop()
@@ -0,0 +1,75 @@
+"""Tests of batch mode: shared files, output collisions and invalid rows."""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import vhdl_batch  # noqa: E402
+
+
+def mux(entity_name, inputs=4, **fields):
+    return dict(component="MUX", code_type="None", entity_name=entity_name, arch_name="rtl",
+                func_proc_name="f", inputs=inputs, width=8, **fields)
+
+
+def generic_sram(entity_name, addr_width, **fields):
+    return dict(component="SRAM", code_type="None", entity_name=entity_name, arch_name="rtl",
+                func_proc_name="f", addr_width=addr_width, data_width=8, sizes="Generic", **fields)
+
+
+def run(rows, tmp_path):
+    return vhdl_batch.run_batch(rows, str(tmp_path), jobs=1)
+
+
+def failed_rows(summary):
+    return {index: error for index, _, error in summary["failures"]}
+
+
+def test_identical_generic_rows_share_one_file(tmp_path):
+    summary = run([generic_sram("s1", 4), generic_sram("s1", 8)], tmp_path)
+    assert summary["succeeded"] == 2
+    assert summary["shared"] == {1: 0}
+    assert os.listdir(tmp_path) == ["s1.vhdl"]
+
+
+def test_shared_row_with_its_own_output_gets_that_file(tmp_path):
+    summary = run([generic_sram("s1", 4), generic_sram("s1", 8, output="other.vhdl")], tmp_path)
+    assert summary["succeeded"] == 2
+    assert summary["shared"] == {}
+    assert sorted(os.listdir(tmp_path)) == ["other.vhdl", "s1.vhdl"]
+
+
+def test_colliding_rows_fail_instead_of_overwriting(tmp_path):
+    summary = run([mux("E", 2), mux("E", 4), mux("E", 8)], tmp_path)
+    errors = failed_rows(summary)
+    assert sorted(errors) == [1, 2]
+    assert errors[1] == "output file E.vhdl is already written by row 1"
+    with open(tmp_path / "E.vhdl") as f:
+        assert "inp2" not in f.read()
+
+
+def test_collided_row_is_never_a_primary(tmp_path):
+    rows = [mux("m1", output="p.vhdl"), generic_sram("s1", 4, output="p.vhdl"), generic_sram("s1", 8)]
+    summary = run(rows, tmp_path)
+    assert failed_rows(summary) == {1: "output file p.vhdl is already written by row 1"}
+    assert summary["shared"] == {}
+    assert sorted(os.listdir(tmp_path)) == ["p.vhdl", "s1.vhdl"]
+
+
+def test_invalid_rows_do_not_claim_their_output_name(tmp_path):
+    summary = run([mux("m1", 3), mux("m1", 4)], tmp_path)
+    errors = failed_rows(summary)
+    assert list(errors) == [0]
+    assert "power of 2" in errors[0]
+    assert os.listdir(tmp_path) == ["m1.vhdl"]
+
+
+def test_csv_values_are_parsed(tmp_path):
+    path = tmp_path / "manifest.csv"
+    path.write_text("component,code_type,entity_name,arch_name,func_proc_name,inputs,width\n"
+                    "MUX,Function,m2,rtl,f,2,4\n")
+    rows = vhdl_batch.load_manifest(str(path))
+    assert vhdl_batch.normalize_request(rows[0])["params"] == {"inputs": 2, "width": 4}
+    out = tmp_path / "out"
+    assert run(rows, out)["succeeded"] == 1
+    assert os.listdir(out) == ["m2.vhdl"]
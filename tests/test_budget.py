@@ -0,0 +1,52 @@
+"""Tests of output size estimates and generation budgets."""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import vhdl_budget  # noqa: E402
+import vhdl_engine  # noqa: E402
+import vhdl_validation  # noqa: E402
+
+NAMES = ("E", "rtl", "f")
+
+
+def test_estimate_matches_the_output():
+    for component, params in (("MUX", {"inputs": 64, "width": 8}), ("Decoder", {"width": 5}),
+                              ("SRAM", {"addr_width": 6, "data_width": 16})):
+        for code_type in ("None", "Function", "Procedure"):
+            code = vhdl_engine.generate_vhdl(component, code_type, *NAMES, params)
+            estimate = vhdl_budget.estimate(component, code_type, *NAMES, params)
+            assert (estimate.lines, estimate.bytes) == (code.count('\n') + 1, len(code))
+            assert estimate.seconds > vhdl_budget.REQUEST_OVERHEAD_SECONDS
+
+
+def test_huge_design_is_sized_without_rendering():
+    estimate = vhdl_budget.estimate("Decoder", "None", *NAMES, {"width": 30})
+    assert estimate.lines > 2 ** 30
+    assert vhdl_budget.DEFAULT_BUDGET.check(estimate)
+
+
+def test_budget_reports_each_exceeded_limit():
+    estimate = vhdl_budget.Estimate(lines=100, bytes=2048, seconds=2.0)
+    assert vhdl_budget.Budget().check(estimate) == []
+    assert vhdl_budget.Budget(max_bytes=2048, max_lines=100, max_seconds=2.0).check(estimate) == []
+    problems = vhdl_budget.Budget(max_bytes=1024, max_lines=99, max_seconds=1.0).check(estimate)
+    assert [code for code, _ in problems] == ["over_byte_budget", "over_line_budget", "over_time_budget"]
+    assert "2.0 KiB" in problems[0][1]
+
+
+def test_validate_applies_the_budget_only_to_valid_requests():
+    params = {"inputs": 1024, "width": 64}
+    tight = vhdl_budget.Budget(max_lines=1000)
+    errors = vhdl_validation.validate("MUX", "None", *NAMES, params, tight)
+    assert [(error.field, error.code) for error in errors] == [("size", "over_line_budget")]
+    assert vhdl_validation.validate("MUX", "None", *NAMES, params) == []
+    errors = vhdl_validation.validate("MUX", "None", *NAMES, dict(params, inputs=3), tight)
+    assert [error.code for error in errors] == ["not_power_of_two"]
+
+
+def test_format_bytes():
+    assert vhdl_budget.format_bytes(512) == "512 bytes"
+    assert vhdl_budget.format_bytes(1536) == "1.5 KiB"
+    assert vhdl_budget.format_bytes(64 * 1024 * 1024) == "64.0 MiB"
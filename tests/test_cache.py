@@ -0,0 +1,68 @@
+"""Tests of the persistent disk cache."""
+import os
+import stat
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import vhdl_cache  # noqa: E402
+import vhdl_engine  # noqa: E402
+
+REQUEST = {"component": "MUX", "code_type": "None", "entity_name": "E", "arch_name": "rtl",
+           "func_proc_name": "f", "params": {"inputs": 4, "width": 8}}
+
+
+def test_round_trip(tmp_path):
+    cache = vhdl_cache.DiskCache(str(tmp_path))
+    key = cache.key(**REQUEST)
+    assert cache.get(key) is None
+    code = cache.generate(**REQUEST)
+    assert code == vhdl_engine.generate_vhdl(**REQUEST)
+    assert cache.get(key) == code
+    assert cache.lookup(key) == cache.path(key)
+    assert cache.size() == len(code)
+
+
+def test_key_ignores_spelled_out_defaults(tmp_path):
+    cache = vhdl_cache.DiskCache(str(tmp_path))
+    full = dict(REQUEST, params=dict(REQUEST["params"], ports="Scalar", dialect="VHDL-93", radix=4))
+    assert cache.key(**full) == cache.key(**REQUEST)
+    assert cache.key(**dict(REQUEST, entity_name="F")) != cache.key(**REQUEST)
+
+
+def test_entries_follow_the_umask(tmp_path):
+    cache = vhdl_cache.DiskCache(str(tmp_path))
+    key = cache.key(**REQUEST)
+    previous = os.umask(0o022)
+    try:
+        cache.put(key, "x")
+    finally:
+        os.umask(previous)
+    assert stat.S_IMODE(os.stat(cache.path(key)).st_mode) == 0o644
+    assert [name for name in os.listdir(os.path.dirname(cache.path(key))) if name.startswith('.')] == []
+
+
+def test_readable_entry_is_a_hit_without_utime_permission(tmp_path, monkeypatch):
+    cache = vhdl_cache.DiskCache(str(tmp_path))
+    key = cache.key(**REQUEST)
+    cache.put(key, "x")
+
+    def utime(path, *args, **kwargs):
+        raise PermissionError(path)
+    monkeypatch.setattr(os, "utime", utime)
+    assert cache.get(key) == "x"
+    assert cache.lookup(cache.key(**dict(REQUEST, entity_name="F"))) is None
+
+
+def test_prune_removes_least_recently_used(tmp_path):
+    cache = vhdl_cache.DiskCache(str(tmp_path), max_bytes=250)
+    keys = [cache.key(**dict(REQUEST, entity_name=f"E{i}")) for i in range(3)]
+    for age, key in enumerate(keys):
+        cache.put(key, "x" * 100)
+        os.utime(cache.path(key), (1000 + age, 1000 + age))
+    os.utime(cache.path(keys[0]), (2000, 2000))  # most recently used
+    assert cache.prune() == 1
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) == cache.get(keys[2]) == "x" * 100
+    cache.clear()
+    assert cache.size() == 0
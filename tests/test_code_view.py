@@ -0,0 +1,58 @@
+"""Tests of the display helpers that need no window: line edits and the line index."""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+code_view = pytest.importorskip("code_view")  # needs tkinter importable, not a display
+import vhdl_engine  # noqa: E402
+
+
+def apply(old, edits):
+    """Apply line_edits() to a string the way apply_line_edits() does to a Text widget."""
+    lines = old.splitlines(True)
+    for first, last, replacement in reversed(edits):
+        lines[first:last] = [replacement]
+    return ''.join(lines)
+
+
+def test_line_edits_round_trip():
+    cases = [
+        ("", "a\nb\n"),
+        ("a\nb\n", ""),
+        ("a\nb\nc\n", "a\nB\nc\n"),
+        ("a\nb\nc", "a\nc\nd\ne"),
+        ("x\n" * 5, "x\n" * 7),
+    ]
+    for old, new in cases:
+        assert apply(old, code_view.line_edits(old, new)) == new, (old, new)
+
+
+def test_line_edits_touch_only_changed_lines():
+    params = {"inputs": 8, "width": 8}
+    old = vhdl_engine.generate_vhdl("MUX", "None", "E", "rtl", "f", params)
+    new = vhdl_engine.generate_vhdl("MUX", "None", "E", "rtl", "f", dict(params, width=16))
+    edits = code_view.line_edits(old, new)
+    assert apply(old, edits) == new
+    changed = sum(last - first for first, last, _ in edits)
+    assert changed == sum(1 for a, b in zip(old.splitlines(), new.splitlines()) if a != b)
+    assert code_view.line_edits(new, new) == []
+
+
+def test_line_index_offsets():
+    text = "".join(f"line {i}\n" for i in range(1000)) + "last"
+    index = code_view.LineIndex(text, block=64)
+    starts = [0] + [i + 1 for i, char in enumerate(text) if char == '\n']
+    assert index.lines == len(starts) == 1001
+    for line in (0, 1, 7, 8, 9, 500, 999, 1000):
+        assert index.offset(line) == starts[line], line
+    assert index.offset(-1) == 0
+    assert index.offset(5000) == len(text)
+
+
+def test_line_index_of_empty_text():
+    index = code_view.LineIndex("")
+    assert index.lines == 1
+    assert index.offset(0) == index.offset(3) == 0
@@ -0,0 +1,131 @@
+"""Tests of the headless engine: cold start, pinned default output and size estimates."""
+import hashlib
+import itertools
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import vhdl_components  # noqa: E402
+import vhdl_engine  # noqa: E402
+import vhdl_ir  # noqa: E402
+import vhdl_validation  # noqa: E402
+
+CODE_TYPES = ("None", "Function", "Procedure")
+NAMES = ("Entity_1", "Arch_1", "Fun_1")
+
+# The GUI's default parameters for each component
+DEFAULT_PARAMS = {
+    "MUX": {"inputs": 4, "width": 8},
+    "DeMUX": {"outputs": 4, "width": 8},
+    "Decoder": {"width": 2},
+    "Encoder": {"width": 2},
+    "Shift Register": {"width": 8, "type": "Serial-In Parallel-Out"},
+    "SRAM": {"addr_width": 4, "data_width": 8},
+    "Clock Divider": {"div_factor": 10},
+}
+
+# SHA-256 of the default output; a change here needs a GENERATOR_VERSION bump
+DEFAULT_DIGESTS = {
+    ("MUX", "None"): "ca3b97b7755d38ec389f8a7b87c8d748b860c0e2be38bab3c1319b51d951d830",
+    ("MUX", "Function"): "4f271e4d9272d5f42717f8feffa537f08ead6cd78adc092535f4ef71b1a74c00",
+    ("MUX", "Procedure"): "64e385415e4ae2e6505240ea49eb7a4641a5e66e49827c110fb7530dd4e7a2f0",
+    ("DeMUX", "None"): "85b9100f25251968a739c0091a8695c1f6366d2b40aebe1bb8aa69dc2c5c4c0d",
+    ("DeMUX", "Function"): "09a32b8bb513dba63725a64e3204887a54e167a0fe187aaa61b115e51398ca9e",
+    ("DeMUX", "Procedure"): "08a836fef1a2d5befc5fefab54512ef2f29db21890cb0b99028252684a992156",
+    ("Decoder", "None"): "121a3bb9bac62d5652d93ddcb590bc4109d608ce1a25b9cad09d16c1f1d02475",
+    ("Decoder", "Function"): "6ea592dc71036913e273614e4925f3a858d6a8efcbb2c63d8b3ce2aa2dee5363",
+    ("Decoder", "Procedure"): "bdbc81378686eeb9397ccca06e077f6fd706b10fc44e078d63e51b0b67369145",
+    ("Encoder", "None"): "8a3230c8ae65449fb9d46735374c3f72763e3a661855ee39a8e3f4f14b4cbb1c",
+    ("Encoder", "Function"): "d7d291bb9b39ae5a1c75605615538ad907ebbe4d6e00fcb9996efaaf71f499c8",
+    ("Encoder", "Procedure"): "e2d631dd4b8354eb9121ce8cb1b1641d20c5403cbbded444f492ffb15cbffe96",
+    ("Shift Register", "None"): "1fe8acb9c36012780deb321d492fdad0354e7ae29e7494ae90332e9e5e13b3ce",
+    ("Shift Register", "Function"): "9e5bc8bb09228175f72f899ffa4402226eb95d4e428d2cfc1ed1eb565597d15c",
+    ("Shift Register", "Procedure"): "df598f59ed5e3e55085dd541a13a715adf7c16cb1808bfd9324f4c59f489e79e",
+    ("SRAM", "None"): "464f356b1e56498c920d2f69d647f1e3c378340736ee45f2e9691bd9992e48ec",
+    ("SRAM", "Function"): "b0d457db0a30a497cacfd735db1d4f7b434145938c5cc8a44c5572ddff7a5843",
+    ("SRAM", "Procedure"): "ce259eafddb4cb060d563f99f2860f6f78e341ccb30755f7379bc1195c0a70a1",
+    ("Clock Divider", "None"): "e116d568ba46d77c0ea9e9bc279d69c9100d9e57a7a254217515de6316ff02c8",
+    ("Clock Divider", "Function"): "dbc037f731ea921d587f9c117b2e689a74d0a80367ec92ecbf7f32cfd9e62934",
+    ("Clock Divider", "Procedure"): "a4a98ffdd8d8f4aa2d18134760aba7bf2bf459cfeb5f363ff54bc904527d5acf",
+}
+
+SMALL_MUX = """library IEEE;
+use IEEE.STD_LOGIC_1164.ALL;
+use IEEE.NUMERIC_STD.ALL;
+
+entity Entity_1 is
+    port (
+        inp0 : in std_logic_vector(0 downto 0);
+        inp1 : in std_logic_vector(0 downto 0);
+        sel : in std_logic_vector(0 downto 0);
+        Bitout : out std_logic_vector(0 downto 0)
+    );
+end Entity_1;
+
+architecture Arch_1 of Entity_1 is
+begin
+    process(sel, inp0, inp1)
+    begin
+        case to_integer(unsigned(sel)) is
+            when 0 => Bitout <= inp0;
+            when 1 => Bitout <= inp1;
+            when others => Bitout <= (others => '0');
+        end case;
+    end process;
+end Arch_1;"""
+
+# Values tried for the optional integer parameters in test_measure_matches_render
+OPTION_VALUES = {"radix": (2, 4), "pipeline": (0, 1), "fanout": (0, 3)}
+
+
+def test_cold_start_is_headless():
+    stats = vhdl_engine.measure_cold_start()
+    print(f"cold start: import {stats['import_s'] * 1000:.2f} ms, "
+          f"first output {stats['first_output_s'] * 1000:.2f} ms, total {stats['total_s'] * 1000:.2f} ms")
+    assert stats["tk_loaded"] is False
+    assert 0 < stats["import_s"] <= stats["total_s"]
+
+
+def test_small_mux_output():
+    assert vhdl_engine.generate_vhdl("MUX", "None", *NAMES, {"inputs": 2, "width": 1}) == SMALL_MUX
+
+
+def test_default_output_is_pinned():
+    for (component, code_type), digest in DEFAULT_DIGESTS.items():
+        code = vhdl_engine.get_vhdl_code(component, code_type, *NAMES, DEFAULT_PARAMS[component])
+        assert hashlib.sha256(code.encode('utf-8')).hexdigest() == digest, (component, code_type)
+
+
+def test_spelled_out_defaults_give_the_default_output():
+    for component, params in DEFAULT_PARAMS.items():
+        full = vhdl_components.normalize_params(component, params)
+        for code_type in CODE_TYPES:
+            assert (vhdl_engine.get_vhdl_code(component, code_type, *NAMES, full)
+                    == vhdl_engine.get_vhdl_code(component, code_type, *NAMES, params))
+            assert (vhdl_engine.request_key(component, code_type, *NAMES, full)
+                    == vhdl_engine.request_key(component, code_type, *NAMES, params))
+
+
+def test_measure_matches_render():
+    checked = 0
+    for component, base in DEFAULT_PARAMS.items():
+        options = [param for param in vhdl_components.COMPONENTS[component].params if not param.required]
+        choices = [param.choices or OPTION_VALUES[param.key] for param in options]
+        for values in itertools.product(*choices):
+            params = dict(base, **{param.key: value for param, value in zip(options, values)})
+            for code_type in CODE_TYPES:
+                if vhdl_validation.validate(component, code_type, *NAMES, params):
+                    continue
+                design = vhdl_engine.build_design(component, code_type, *NAMES, params)
+                code = vhdl_ir.render(design)
+                assert vhdl_ir.measure(design) == (code.count('\n') + 1, len(code)), (component, code_type, params)
+                assert ''.join(vhdl_engine.iter_vhdl(component, code_type, *NAMES, params)) == code
+                checked += 1
+    assert checked > 100
+
+
+def test_blank_options_take_their_defaults():
+    tree = {"inputs": 4, "width": 8, "architecture": "Mux tree"}
+    assert (vhdl_engine.get_vhdl_code("MUX", "None", *NAMES, dict(tree, radix="", pipeline=None))
+            == vhdl_engine.get_vhdl_code("MUX", "None", *NAMES, tree))
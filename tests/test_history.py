@@ -0,0 +1,63 @@
+"""Tests of the compressed generation history."""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import vhdl_engine  # noqa: E402
+import vhdl_history  # noqa: E402
+
+
+def request(entity_name, inputs=64):
+    return {"component": "MUX", "code_type": "None", "entity_name": entity_name, "arch_name": "rtl",
+            "func_proc_name": "f", "params": {"inputs": inputs, "width": 8}}
+
+
+def add(history, entity_name, inputs=64):
+    req = request(entity_name, inputs)
+    return history.add(req, vhdl_engine.generate_vhdl(**req))
+
+
+def names(history):
+    return [entry.request["entity_name"] for entry in history.entries()]
+
+
+def test_entries_are_compressed_and_recalled():
+    history = vhdl_history.GenerationHistory()
+    entry = add(history, "E", 256)
+    code = vhdl_engine.generate_vhdl(**request("E", 256))
+    assert entry.code() == code
+    assert entry.chars == len(code)
+    assert history.size == len(entry.blob) < len(code) // 4
+    assert "MUX E (inputs=256, width=8) [None]" in entry.describe()
+
+
+def test_repeating_a_request_moves_it_to_the_end():
+    history = vhdl_history.GenerationHistory()
+    first = add(history, "A")
+    add(history, "B")
+    assert add(history, "A") is first
+    assert names(history) == ["B", "A"]
+    assert len(history) == 2
+
+
+def test_oldest_entries_are_evicted_by_count():
+    history = vhdl_history.GenerationHistory(max_entries=3)
+    for name in "ABCDE":
+        add(history, name)
+    assert names(history) == ["C", "D", "E"]
+
+
+def test_oldest_entries_are_evicted_by_size():
+    probe = vhdl_history.GenerationHistory()
+    blob_size = len(add(probe, "A").blob)
+    history = vhdl_history.GenerationHistory(max_bytes=blob_size * 2 + blob_size // 2)
+    for name in "ABCD":
+        add(history, name)
+    assert names(history) == ["C", "D"]
+    assert history.size <= history.max_bytes
+
+    # An entry larger than the whole budget is not kept
+    assert vhdl_history.GenerationHistory(max_bytes=10).add(request("Z"), "x" * 1000) is None
+    history.clear()
+    assert len(history) == history.size == 0
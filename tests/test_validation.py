@@ -0,0 +1,73 @@
+"""Tests of request validation and its error codes."""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import vhdl_validation  # noqa: E402
+
+MUX_PARAMS = {"inputs": 4, "width": 8}
+
+
+def codes(component, entity_name, params, code_type="None", arch_name="rtl", func_proc_name="f", budget=None):
+    errors = vhdl_validation.validate(component, code_type, entity_name, arch_name, func_proc_name, params, budget)
+    return [(error.field, error.code) for error in errors]
+
+
+def test_vhdl2008_reserved_words_need_the_2008_dialect():
+    for word in ("force", "Context", "protected", "vunit"):
+        assert codes("MUX", word, MUX_PARAMS) == []
+        assert codes("MUX", word, dict(MUX_PARAMS, dialect="VHDL-2008")) == [("entity_name", "reserved_word")]
+    assert codes("MUX", "entity", MUX_PARAMS) == [("entity_name", "reserved_word")]
+
+
+def test_valid_request_has_no_errors():
+    assert codes("MUX", "mux4", MUX_PARAMS) == []
+    assert vhdl_validation.validate_request("MUX", "Function", "mux4", "rtl", "f", MUX_PARAMS) is None
+
+
+def test_name_codes():
+    cases = {
+        "": "empty",
+        "entity": "reserved_word",
+        "my mux": "contains_space",
+        "4mux": "bad_start",
+        "mux$": "invalid_character",
+        "mux_": "trailing_underscore",
+        "my__mux": "double_underscore",
+    }
+    for name, code in cases.items():
+        assert codes("MUX", name, MUX_PARAMS) == [("entity_name", code)], name
+    assert codes("MUX", "Same", MUX_PARAMS, arch_name="same") == [("names", "duplicate_name")]
+
+
+def test_parameter_codes():
+    assert codes("MUX", "m", {"width": 8}) == [("inputs", "missing")]
+    assert codes("MUX", "m", {"inputs": 3, "width": 8}) == [("inputs", "not_power_of_two")]
+    assert codes("MUX", "m", {"inputs": 4, "width": 0}) == [("width", "too_small")]
+    assert codes("MUX", "m", {"inputs": 4, "width": "8"}) == [("width", "not_integer")]
+    assert codes("Decoder", "d", {"width": 32}) == [("width", "too_large")]
+    assert codes("MUX", "m", dict(MUX_PARAMS, ports="Bus")) == [("ports", "invalid_choice")]
+    # Optional parameters that are left out fall back to their defaults
+    assert codes("MUX", "m", dict(MUX_PARAMS, architecture="Mux tree", radix="")) == []
+    assert codes("DeMUX", "d", {"outputs": 4, "width": 8, "fanout": "", "ports": "Array"}) == []
+
+
+def test_request_level_codes():
+    assert codes("ALU", "m", {}) == [("component", "unknown_component")]
+    assert codes("MUX", "m", MUX_PARAMS, code_type="Task") == [("code_type", "unknown_code_type")]
+    generic = dict(MUX_PARAMS, ports="Array", sizes="Generic")
+    assert codes("MUX", "m", generic) == [("sizes", "generic_needs_vhdl2008")]
+    assert codes("MUX", "m", dict(generic, dialect="VHDL-2008")) == []
+    assert codes("Decoder", "d", {"width": 3, "sizes": "Generic"}) == [("sizes", "generic_needs_array_ports")]
+    assert (codes("DeMUX", "d", {"outputs": 4, "width": 8, "ports": "Array", "output_stage": "Registered"})
+            == [("ports", "staged_needs_scalar_ports")])
+
+
+def test_all_errors_are_reported_at_once():
+    assert codes("MUX", "mux_", {"inputs": 3}, arch_name="4a") == [
+        ("entity_name", "trailing_underscore"),
+        ("arch_name", "bad_start"),
+        ("inputs", "not_power_of_two"),
+        ("width", "missing"),
+    ]
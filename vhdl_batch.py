@@ -0,0 +1,280 @@
+"""Batch generation of VHDL components from a manifest file.
+
+A manifest is either a JSON list of request objects or a CSV file with one
+request per row.  Each request has the fields ``component``, ``code_type``,
+``entity_name``, ``arch_name``, ``func_proc_name`` and the component
+parameters (``inputs``, ``outputs``, ``width``, ``type``, ``ports``,
+``dialect``, ``sizes``, ``architecture``, ``radix``, ``pipeline``,
+``output_stage``, ``fanout``, ``addr_width``, ``data_width``, ``div_factor``);
+the options from ``ports`` to ``fanout`` may be left out.  In JSON the
+parameters may also be given as a nested ``params`` object.  An optional
+``output`` field overrides the file name, which defaults to
+``<entity_name>.vhdl``.
+
+Rows whose estimated output exceeds the size budget (see vhdl_budget) fail
+before anything is written.  Rows that would write exactly the same file,
+under the same name, as an earlier row - typically rows with generic sizes
+that differ only in their size values - are written once and share that
+row's file.  Any other valid row whose output name is already taken by an
+earlier valid row fails instead of overwriting that file.
+
+Run it through ``python main.py batch MANIFEST [-o DIR] [--jobs N]``.
+"""
+import argparse
+import csv
+import json
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import vhdl_budget
+import vhdl_cache
+import vhdl_components
+import vhdl_engine
+import vhdl_validation
+
+# One DiskCache per cache directory and worker process
+_disk_caches = {}
+
+
+def load_manifest(path):
+    """Read a JSON or CSV manifest into a list of request dicts."""
+    if path.lower().endswith('.csv'):
+        with open(path, newline='') as f:
+            return [dict(row) for row in csv.DictReader(f)]
+    with open(path) as f:
+        rows = json.load(f)
+    if not isinstance(rows, list):
+        raise ValueError("JSON manifest must be a list of requests")
+    return rows
+
+
+def normalize_request(row):
+    """Turn a manifest row into keyword arguments for the engine.
+
+    Parameter values read from CSV arrive as strings and are converted to
+    integers here; blank cells and parameters the component does not take
+    are ignored.
+    """
+    params = dict(row.get("params") or {})
+    for key in vhdl_components.PARAM_KEYS:
+        if row.get(key) not in (None, ""):
+            params[key] = row[key]
+    spec = vhdl_components.COMPONENTS.get(row.get("component"))
+    if spec is not None:
+        # Keep only the component's own parameters, parsed to their types
+        params = {param.key: param.parse(params[param.key])
+                  for param in spec.params if params.get(param.key) not in (None, "")}
+    return {
+        "component": row.get("component", ""),
+        "code_type": row.get("code_type") or "None",
+        "entity_name": row.get("entity_name", ""),
+        "arch_name": row.get("arch_name", ""),
+        "func_proc_name": row.get("func_proc_name", ""),
+        "params": params,
+    }
+
+
+def render_item(item):
+    """Validate, generate and write one manifest row.
+
+    Runs inside the worker processes.  Returns
+    ``(index, bytes_written, error, cache_hit)``.  The code is copied from the
+    disk cache or streamed straight to disk, so it is never held in memory as
+    a whole and never travels back through the pool.
+    """
+    index, row, out_dir, cache_config, budget = item
+    try:
+        request = normalize_request(row)
+        errors = vhdl_validation.validate(**request, budget=budget)
+        if errors:
+            return index, 0, "; ".join(error.message for error in errors), False
+        out_path = os.path.join(out_dir, output_name(row, request))
+
+        cache = key = None
+        if cache_config is not None:
+            cache = _disk_cache(*cache_config)
+            key = cache.key(**request)
+            cached_path = cache.lookup(key)
+            if cached_path is not None:
+                try:
+                    shutil.copyfile(cached_path, out_path)
+                    return index, os.path.getsize(out_path), None, True
+                except FileNotFoundError:  # evicted by another process
+                    pass
+
+        with open(out_path, 'w', encoding='utf-8') as f:
+            size = vhdl_engine.write_vhdl(f, **request)
+        if cache is not None:
+            cache.put_file(key, out_path)
+        return index, size, None, False
+    except Exception as e:
+        return index, 0, str(e) or type(e).__name__, False
+
+
+def output_name(row, request=None):
+    """File name of a row's output: its ``output`` field or ``<entity_name>.vhdl``."""
+    entity_name = (request or row).get("entity_name", "")
+    return row.get("output") or f"{entity_name}.vhdl"
+
+
+def _disk_cache(root, max_bytes):
+    cache = _disk_caches.get(root)
+    if cache is None:
+        cache = _disk_caches[root] = vhdl_cache.DiskCache(root, max_bytes)
+    return cache
+
+
+def plan_outputs(rows, budget=None):
+    """Decide which rows write their output file; returns ``(shared, collisions)``.
+
+    Rows are grouped by output name.  In each group the first row that
+    passes validation (with ``budget``) writes the file.  A later valid row
+    with the same design goes into ``shared``, mapped to the writer whose
+    file it shares.  A later valid row with a different design goes into
+    ``collisions``, also mapped to the writer, because it would overwrite
+    that file.  Designs compare by value and are cheap to build whatever the
+    size, so nothing is rendered here.  They are built only for rows whose
+    name is also used by another row.  Invalid rows claim no name and are
+    left for render_item to report.
+    """
+    groups = {}
+    for index, row in enumerate(rows):
+        groups.setdefault(os.path.normcase(output_name(row)), []).append(index)
+
+    shared = {}
+    collisions = {}
+    for indices in groups.values():
+        if len(indices) < 2:
+            continue
+        writer = writer_design = None
+        for index in indices:
+            try:
+                request = normalize_request(rows[index])
+                if vhdl_validation.validate(**request, budget=budget):
+                    continue
+                design = vhdl_engine.build_design(**request)
+            except Exception:
+                continue
+            if writer is None:
+                writer, writer_design = index, design
+            elif design == writer_design:
+                shared[index] = writer
+            else:
+                collisions[index] = writer
+    return shared, collisions
+
+
+def run_batch(rows, out_dir, jobs=None, cache=None, budget=vhdl_budget.DEFAULT_BUDGET):
+    """Render every row of a manifest into ``out_dir``.
+
+    ``cache`` is an optional vhdl_cache.DiskCache consulted before generating
+    each row, ``budget`` the vhdl_budget.Budget each row must fit (None for
+    no limit).  Failures are collected per row and never stop the batch.
+    Returns a dict with the counts, cache hits, total bytes, elapsed seconds,
+    the list of ``(index, row, error)`` failures and the ``{index: index}``
+    map of rows sharing an earlier row's file (see plan_outputs).
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    jobs = jobs or os.cpu_count() or 1
+    cache_config = (cache.root, cache.max_bytes) if cache is not None else None
+
+    start = time.perf_counter()
+    shared, collisions = plan_outputs(rows, budget)
+    items = [(i, row, out_dir, cache_config, budget) for i, row in enumerate(rows)
+             if i not in shared and i not in collisions]
+    if jobs == 1 or len(items) < 2:
+        results = list(map(render_item, items))
+    else:
+        chunksize = max(1, len(items) // (jobs * 8))
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(render_item, items, chunksize=chunksize))
+    elapsed = time.perf_counter() - start
+    if cache is not None:
+        cache.prune()
+
+    # A shared row has the outcome of the row whose file it shares; that row
+    # is always rendered, since plan_outputs never makes a collision a writer
+    errors = {index: error for index, _, error, _ in results}
+    for index, primary in shared.items():
+        errors[index] = errors[primary]
+    for index, primary in collisions.items():
+        errors[index] = f"output file {output_name(rows[index])} is already written by row {primary + 1}"
+    failures = [(index, rows[index], error) for index, error in sorted(errors.items()) if error]
+    return {
+        "total": len(rows),
+        "succeeded": len(rows) - len(failures),
+        "cache_hits": sum(1 for *_, hit in results if hit),
+        "bytes": sum(size for _, size, _, _ in results),
+        "elapsed": elapsed,
+        "failures": failures,
+        "shared": shared,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="main.py batch",
+                                     description="Generate VHDL components from a JSON/CSV manifest.")
+    parser.add_argument("manifest", help="path to a .json or .csv manifest")
+    parser.add_argument("-o", "--out-dir", default="vhdl_out", help="directory for the generated files")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="number of worker processes (default: number of CPUs)")
+    parser.add_argument("--cache-dir", default=None,
+                        help="disk cache directory (default: $VHDL_CODEGEN_CACHE or ~/.cache/vhdl_codegen)")
+    parser.add_argument("--cache-size", type=int, default=vhdl_cache.DEFAULT_MAX_BYTES // (1024 * 1024),
+                        help="disk cache size limit in MiB")
+    parser.add_argument("--no-cache", action="store_true", help="do not use the disk cache")
+    default = vhdl_budget.DEFAULT_BUDGET
+    parser.add_argument("--max-size", type=float, default=default.max_bytes / (1024 * 1024),
+                        help="largest output per component in MiB, 0 for no limit (default: %(default)g)")
+    parser.add_argument("--max-lines", type=int, default=default.max_lines,
+                        help="largest output per component in lines, 0 for no limit (default: %(default)d)")
+    parser.add_argument("--max-seconds", type=float, default=default.max_seconds,
+                        help="longest estimated generation time per component, 0 for no limit "
+                             "(default: %(default)g)")
+    args = parser.parse_args(argv)
+
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if min(args.max_size, args.max_lines, args.max_seconds) < 0:
+        parser.error("budget limits cannot be negative")
+    budget = vhdl_budget.Budget(max_bytes=int(args.max_size * 1024 * 1024) or None,
+                                max_lines=args.max_lines or None,
+                                max_seconds=args.max_seconds or None)
+
+    try:
+        rows = load_manifest(args.manifest)
+    except (OSError, ValueError) as e:
+        print(f"Error: failed to read manifest: {e}", file=sys.stderr)
+        return 2
+
+    cache = None
+    if not args.no_cache:
+        cache = vhdl_cache.DiskCache(args.cache_dir, args.cache_size * 1024 * 1024)
+    summary = run_batch(rows, args.out_dir, args.jobs, cache, budget)
+
+    for index, row, error in summary["failures"]:
+        name = row.get("entity_name") or "?"
+        print(f"Row {index + 1} ({name}): {error}", file=sys.stderr)
+    failed = {index for index, _, _ in summary["failures"]}
+    for index, primary in summary["shared"].items():
+        if index not in failed:
+            print(f"Row {index + 1} ({rows[index].get('entity_name') or '?'}): "
+                  f"same file as row {primary + 1} ({output_name(rows[primary])})")
+
+    elapsed = max(summary["elapsed"], 1e-9)
+    print(f"Generated {summary['succeeded']}/{summary['total']} components "
+          f"({len(summary['failures'])} failed) in {elapsed:.3f} s")
+    print(f"Throughput: {summary['succeeded'] / elapsed:.1f} components/s, "
+          f"{summary['bytes'] / elapsed / 1e6:.2f} MB/s")
+    if summary["shared"]:
+        print(f"Shared files: {len(summary['shared'])} rows reuse an identical earlier file")
+    if cache is not None:
+        print(f"Disk cache: {summary['cache_hits']} hits ({cache.root})")
+    return 1 if summary["failures"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+"""Output size estimates and generation budgets.
+
+``estimate`` predicts the line count, byte size and generation time of a
+request by building its design and sizing it with ``vhdl_ir.measure``; it
+never renders, so it costs well under a millisecond even for designs with
+billions of lines.  A ``Budget`` turns an estimate into validation errors,
+which replaces fixed per-component size caps: larger designs are allowed
+whenever the budget allows them, and oversized requests are rejected before
+any code is produced.
+"""
+import vhdl_engine
+import vhdl_ir
+
+# Conservative streaming rate of the renderer (measured at 45-110 M chars/s)
+RENDER_CHARS_PER_SECOND = 20e6
+
+# Fixed cost of building and starting to render one design
+REQUEST_OVERHEAD_SECONDS = 0.001
+
+
+class Estimate:
+    """Predicted size of a generated file.
+
+    Generated code is ASCII, so ``bytes`` is also the character count.
+    """
+    __slots__ = ('lines', 'bytes', 'seconds')
+
+    def __init__(self, lines, bytes, seconds):
+        self.lines = lines
+        self.bytes = bytes
+        self.seconds = seconds
+
+    def __repr__(self):
+        return f"Estimate(lines={self.lines}, bytes={self.bytes}, seconds={self.seconds:.3f})"
+
+
+def estimate(component, code_type, entity_name, arch_name, func_proc_name, params,
+             chars_per_second=RENDER_CHARS_PER_SECOND):
+    """Return an Estimate for a valid request without rendering it."""
+    design = vhdl_engine.build_design(component, code_type, entity_name, arch_name, func_proc_name, params)
+    lines, chars = vhdl_ir.measure(design)
+    return Estimate(lines, chars, REQUEST_OVERHEAD_SECONDS + chars / chars_per_second)
+
+
+class Budget:
+    """Limits on the size of one generated file; None means unlimited."""
+    __slots__ = ('max_bytes', 'max_lines', 'max_seconds')
+
+    def __init__(self, max_bytes=None, max_lines=None, max_seconds=None):
+        self.max_bytes = max_bytes
+        self.max_lines = max_lines
+        self.max_seconds = max_seconds
+
+    def __repr__(self):
+        return f"Budget(max_bytes={self.max_bytes}, max_lines={self.max_lines}, max_seconds={self.max_seconds})"
+
+    def check(self, estimate):
+        """Return a list of ``(code, message)`` for every limit ``estimate`` exceeds."""
+        problems = []
+        if self.max_bytes is not None and estimate.bytes > self.max_bytes:
+            problems.append(("over_byte_budget", f"Estimated output size {format_bytes(estimate.bytes)} "
+                                                 f"exceeds the limit of {format_bytes(self.max_bytes)}"))
+        if self.max_lines is not None and estimate.lines > self.max_lines:
+            problems.append(("over_line_budget", f"Estimated output of {estimate.lines:,} lines "
+                                                 f"exceeds the limit of {self.max_lines:,} lines"))
+        if self.max_seconds is not None and estimate.seconds > self.max_seconds:
+            problems.append(("over_time_budget", f"Estimated generation time {estimate.seconds:,.1f} s "
+                                                 f"exceeds the limit of {self.max_seconds:g} s"))
+        return problems
+
+
+# Used by the GUI and, unless overridden, by batch mode
+DEFAULT_BUDGET = Budget(max_bytes=64 * 1024 * 1024, max_lines=2000000, max_seconds=10.0)
+
+
+def format_bytes(n):
+    for unit in ("bytes", "KiB", "MiB", "GiB"):
+        if n < 1024 or unit == "GiB":
+            return f"{n:,} {unit}" if unit == "bytes" else f"{n:,.1f} {unit}"
+        n /= 1024
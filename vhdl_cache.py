@@ -0,0 +1,175 @@
+"""Persistent, content-addressed cache of generated VHDL.
+
+Entries are stored as ``<root>/<first two hex digits>/<sha256>.vhdl`` where
+the hash covers the generator version and the full request, so a cache
+directory can be shared between builds, processes and machines.
+
+Writers create a temporary file next to the entry and ``os.replace`` it into
+place, so readers never see partial files and need no locks.  The total size
+is capped; the least recently used entries (by modification time, refreshed
+on every hit) are removed first.
+"""
+import hashlib
+import json
+import os
+import shutil
+
+import vhdl_components
+import vhdl_engine
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Run a size check after this many writes from one DiskCache instance
+PRUNE_INTERVAL = 64
+
+# Flags for the temporary file each entry is written to; it is created with
+# mode 0666 so the kernel applies the umask, as for any ordinary file, and a
+# shared cache stays readable by every user the umask allows
+TEMP_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
+
+
+def default_cache_dir():
+    """Return the cache directory from $VHDL_CODEGEN_CACHE or the user cache dir."""
+    path = os.environ.get("VHDL_CODEGEN_CACHE")
+    if path:
+        return path
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "vhdl_codegen")
+
+
+class DiskCache:
+    def __init__(self, root=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = root or default_cache_dir()
+        self.max_bytes = max_bytes
+        self._writes = 0
+
+    def key(self, component, code_type, entity_name, arch_name, func_proc_name, params):
+        """Return the hex digest identifying a request for this generator version."""
+        params = vhdl_components.normalize_params(component, params)
+        payload = json.dumps([vhdl_engine.GENERATOR_VERSION, component, code_type, entity_name,
+                              arch_name, func_proc_name, sorted(params.items())],
+                             separators=(',', ':'))
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.root, key[:2], key + ".vhdl")
+
+    def lookup(self, key):
+        """Return the path of a cached entry, or None.  A hit marks the entry as recently used."""
+        path = self.path(key)
+        try:
+            os.utime(path)
+        except PermissionError:
+            # Another user's entry in a shared cache: usable, just not refreshed
+            return path if os.access(path, os.R_OK) else None
+        except OSError:
+            return None
+        return path
+
+    def get(self, key):
+        """Return the cached code for ``key``, or None."""
+        path = self.lookup(key)
+        if path is None:
+            return None
+        try:
+            with open(path, encoding='utf-8', newline='') as f:
+                return f.read()
+        except OSError:  # evicted between lookup and read
+            return None
+
+    def put(self, key, code):
+        """Store ``code`` under ``key``."""
+        self._store(key, lambda f: f.write(code.encode('utf-8')))
+
+    def put_file(self, key, source_path):
+        """Store the contents of an existing file under ``key`` without reading it into memory."""
+        def copy(f):
+            with open(source_path, 'rb') as source:
+                shutil.copyfileobj(source, f)
+        self._store(key, copy)
+
+    def _store(self, key, write):
+        path = self.path(key)
+        directory = os.path.dirname(path)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            tmp_path = os.path.join(directory, f".tmp-{os.urandom(8).hex()}.vhdl")
+            fd = os.open(tmp_path, TEMP_FLAGS, 0o666)
+        except OSError:
+            return  # caching is best effort
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                write(f)
+            os.replace(tmp_path, path)
+        except OSError:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            return
+        self._writes += 1
+        if self._writes % PRUNE_INTERVAL == 0:
+            self.prune()
+
+    def generate(self, component, code_type, entity_name, arch_name, func_proc_name, params):
+        """Return the code for a request, from the cache when possible."""
+        key = self.key(component, code_type, entity_name, arch_name, func_proc_name, params)
+        code = self.get(key)
+        if code is None:
+            code = vhdl_engine.generate_vhdl(component, code_type, entity_name, arch_name,
+                                             func_proc_name, params)
+            self.put(key, code)
+        return code
+
+    def size(self):
+        """Return the total size in bytes of all entries."""
+        return sum(size for _, _, size in self._entries())
+
+    def prune(self):
+        """Remove least recently used entries until the cache fits in ``max_bytes``."""
+        entries = list(self._entries())
+        total = sum(size for _, _, size in entries)
+        if total <= self.max_bytes:
+            return 0
+        removed = 0
+        for _, path, size in sorted(entries):
+            try:
+                os.unlink(path)
+            except OSError:
+                continue  # already removed by another process
+            total -= size
+            removed += 1
+            if total <= self.max_bytes:
+                break
+        return removed
+
+    def clear(self):
+        for _, path, _ in list(self._entries()):
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+    def _entries(self):
+        """Yield ``(mtime, path, size)`` for every entry."""
+        try:
+            subdirs = os.scandir(self.root)
+        except OSError:
+            return
+        with subdirs:
+            for subdir in subdirs:
+                if not subdir.is_dir():
+                    continue
+                try:
+                    files = os.scandir(subdir.path)
+                except OSError:
+                    continue
+                with files:
+                    for entry in files:
+                        if entry.name.startswith('.') or not entry.name.endswith('.vhdl'):
+                            continue
+                        try:
+                            stat = entry.stat()
+                        except OSError:
+                            continue
+                        yield stat.st_mtime, entry.path, stat.st_size
@@ -0,0 +1,1107 @@
+"""IR builders for the components offered by the generator.
+
+Each ``build_*`` function takes the code type ("None", "Function" or
+"Procedure"), the entity/architecture/function names and the component
+parameters, and returns a ``vhdl_ir.Design``.
+"""
+import math
+
+from vhdl_ir import (STANDARD_USES, Architecture, Assign, AttributeDecl, AttributeSpec, Call, CallExpr, Case,
+                     Comment, Design, Each, Entity, For, Generic, If, Null, Package, Param, Port, Process, Return,
+                     Signal, Subprogram, TypeDecl, Variable, VarAssign, When)
+
+CODE_TYPES = ("None", "Function", "Procedure")
+
+# Largest value of the VHDL integer type; every numeric parameter ends up in
+# an integer range, an index or a loop bound
+INTEGER_MAX = 2 ** 31 - 1
+
+# Widths whose 2**width values must be addressable by to_integer()
+INDEX_WIDTH_MAX = 31
+
+# The shift register only needs std_logic_1164
+LOGIC_ONLY_USES = ("IEEE.STD_LOGIC_1164.ALL",)
+
+# Channel ports of the MUX, DeMUX, Decoder and Encoder: one port per channel,
+# or a single array port indexed by the select value.  Array ports keep the
+# file the same size whatever the channel count.
+PORT_STYLES = ("Scalar", "Array")
+
+# Language revisions the output can target.  VHDL-2008 output uses process(all)
+# and aggregate targets where they replace per-channel text.
+DIALECTS = ("VHDL-93", "VHDL-2008")
+
+# "Generic" turns widths, depths and factors into entity generics without
+# defaults: the text no longer depends on them, so one file serves every size
+# and the values are given at instantiation.
+SIZE_MODES = ("Fixed", "Generic")
+
+# MUX implementations: one flat case statement, a tree of radix:1 muxes that
+# can be pipelined, or an AND-OR of the inputs under a one-hot select
+MUX_ARCHITECTURES = ("Flat case", "Mux tree", "One-hot AND-OR")
+MUX_TREE_RADIX = 4
+
+# DeMUX outputs driven straight from the decode, or from registers
+DEMUX_OUTPUT_STAGES = ("Combinational", "Registered")
+
+# Element type of the array port, declared in a package generated with the design
+CHANNEL_ARRAY = "channel_array"
+
+
+def slv(high):
+    return f"std_logic_vector({high} downto 0)"
+
+
+def array_ports(params):
+    return params.get("ports", PORT_STYLES[0]) == "Array"
+
+
+def vhdl2008(params):
+    return params.get("dialect", DIALECTS[0]) == "VHDL-2008"
+
+
+def generic_sizes(params):
+    return params.get("sizes", SIZE_MODES[0]) == "Generic"
+
+
+def size(params, key, generic):
+    """The value of a size parameter, or the name of its generic with generic sizes."""
+    return generic if generic_sizes(params) else params[key]
+
+
+def generics(params, *names):
+    """Entity generics for ``names`` with generic sizes, else none."""
+    return [Generic(name, "positive") for name in names] if generic_sizes(params) else []
+
+
+def minus(value, n=1):
+    """``value - n`` for a number or a generic name."""
+    return value - n if isinstance(value, int) else f"{value} - {n}"
+
+
+def pow2(value):
+    return 2 ** value if isinstance(value, int) else f"2**{value}"
+
+
+def mux_architecture(params):
+    return params.get("architecture", MUX_ARCHITECTURES[0])
+
+
+def sensitivity(params, signals):
+    """Sensitivity list of a combinational process; VHDL-2008 infers it with ``all``."""
+    return ["all"] if vhdl2008(params) else signals
+
+
+def channel_package(entity_name, channels, width):
+    """Return the package declaring the channel array type, the use clauses that see it and the port type.
+
+    With generic sizes the type is left unconstrained, which needs VHDL-2008,
+    and the port declarations constrain it.
+    """
+    if isinstance(width, int):
+        definition = f"array (0 to {channels - 1}) of {slv(width - 1)}"
+        port_type = CHANNEL_ARRAY
+    else:
+        definition = "array (natural range <>) of std_logic_vector"
+        port_type = f"{CHANNEL_ARRAY}(0 to {minus(channels)})({minus(width)} downto 0)"
+    package = Package(f"{entity_name}_pkg", [TypeDecl(CHANNEL_ARRAY, definition)], uses=LOGIC_ONLY_USES)
+    return package, STANDARD_USES + (f"work.{package.name}.ALL",), port_type
+
+
+def build_mux(code_type, entity_name, arch_name, func_name, params):
+    architecture = mux_architecture(params)
+    if architecture == "Mux tree":
+        return build_mux_tree(code_type, entity_name, arch_name, func_name, params)
+    if architecture == "One-hot AND-OR":
+        return build_mux_onehot(code_type, entity_name, arch_name, func_name, params)
+    if array_ports(params):
+        return build_mux_array(code_type, entity_name, arch_name, func_name, params)
+    inputs = params["inputs"]
+    data = slv(minus(size(params, "width", "WIDTH")))
+    sel = slv(int(math.log2(inputs)) - 1)
+    selector = "to_integer(unsigned(sel))"
+    input_list = Each(inputs, "inp{i}")
+
+    ports = [Each(inputs, Port("inp{i}", "in", data)), Port("sel", "in", sel), Port("Bitout", "out", data)]
+    declarations = []
+    if code_type == "Function":
+        declarations.append(Subprogram(func_name, [Each(inputs, Param("inp{i}", data)), Param("sel", sel)], [
+            Case(selector, [
+                Each(inputs, When("{i}", [VarAssign("result", "inp{i}")])),
+                When("others", [VarAssign("result", "(others => '0')")]),
+            ]),
+            Return("result"),
+        ], returns="std_logic_vector", declarations=[Variable("result", data)]))
+        statements = [Assign("Bitout", CallExpr(func_name, [input_list, "sel"]))]
+    elif code_type == "Procedure":
+        declarations.append(Subprogram(func_name, [
+            Each(inputs, Param("inp{i}", data, "in", signal=True)),
+            Param("sel", sel, "in"),
+            Param("output", data, "out", signal=True),
+        ], [
+            Case(selector, [
+                Each(inputs, When("{i}", [Assign("output", "inp{i}")])),
+                When("others", [Assign("output", "(others => '0')")]),
+            ]),
+        ]))
+        statements = [Process(sensitivity(params, [input_list, "sel"]), [
+            Call(func_name, [input_list, "sel", "Bitout"]),
+        ])]
+    else:
+        statements = [Process(sensitivity(params, ["sel", input_list]), [
+            Case(selector, [
+                Each(inputs, When("{i}", [Assign("Bitout", "inp{i}")])),
+                When("others", [Assign("Bitout", "(others => '0')")]),
+            ]),
+        ])]
+    return Design(Entity(entity_name, ports, generics(params, "WIDTH")),
+                  Architecture(arch_name, declarations, statements))
+
+
+def build_mux_array(code_type, entity_name, arch_name, func_name, params):
+    sel_width = "SEL_WIDTH" if generic_sizes(params) else int(math.log2(params["inputs"]))
+    width = size(params, "width", "WIDTH")
+    package, uses, port_type = channel_package(entity_name, pow2(sel_width), width)
+    data = slv(minus(width))
+    sel = slv(minus(sel_width))
+    select = "inputs(to_integer(unsigned(sel)))"
+
+    ports = [Port("inputs", "in", port_type), Port("sel", "in", sel), Port("Bitout", "out", data)]
+    declarations = []
+    if code_type == "Function":
+        declarations.append(Subprogram(func_name, [Param("inputs", CHANNEL_ARRAY), Param("sel", sel)], [
+            Return(select),
+        ], returns="std_logic_vector"))
+        statements = [Assign("Bitout", CallExpr(func_name, ["inputs", "sel"]))]
+    elif code_type == "Procedure":
+        declarations.append(Subprogram(func_name, [
+            Param("inputs", CHANNEL_ARRAY, "in", signal=True),
+            Param("sel", sel, "in"),
+            Param("output", data, "out", signal=True),
+        ], [Assign("output", select)]))
+        statements = [Process(sensitivity(params, ["inputs", "sel"]), [
+            Call(func_name, ["inputs", "sel", "Bitout"]),
+        ])]
+    else:
+        statements = [Assign("Bitout", select)]
+    return Design(Entity(entity_name, ports, generics(params, "SEL_WIDTH", "WIDTH")),
+                  Architecture(arch_name, declarations, statements), uses=uses, packages=[package])
+
+
+class MuxStructure:
+    """Logic depth and latency of a MUX configuration.
+
+    ``radices`` holds the mux size of each tree level from the inputs to the
+    output, ``registered`` the levels followed by a register stage.
+    ``depth`` is the longest path between registers in 2-input levels: an
+    r:1 mux counts as log2(r) levels, an AND-OR as the AND plus its OR tree.
+    """
+    __slots__ = ('architecture', 'inputs', 'radices', 'registered', 'depth', 'latency')
+
+    def __init__(self, architecture, inputs, radices=(), registered=(), depth=0, latency=0):
+        self.architecture = architecture
+        self.inputs = inputs
+        self.radices = radices
+        self.registered = registered
+        self.depth = depth
+        self.latency = latency
+
+    def describe(self):
+        cycles = f"latency {self.latency} clock cycle{'' if self.latency == 1 else 's'}"
+        if self.architecture == "Mux tree":
+            levels = len(self.radices)
+            chain = " -> ".join(f"{radix}:1" for radix in self.radices) or "no muxes"
+            registers = ""
+            if self.registered:
+                registers = (f", registered after level{'s' if len(self.registered) > 1 else ''} "
+                             f"{', '.join(map(str, self.registered))}")
+            return (f"Mux tree {chain} ({levels} level{'' if levels == 1 else 's'}){registers}: "
+                    f"logic depth {self.depth} per stage (in 2:1 mux levels), {cycles}")
+        if self.architecture == "One-hot AND-OR":
+            return (f"One-hot AND-OR of {self.inputs} inputs: logic depth {self.depth} "
+                    f"(in 2-input gate levels), {cycles}")
+        return f"Flat {self.inputs}:1 case mux: logic depth {self.depth} (in 2:1 mux levels), {cycles}"
+
+
+def mux_structure(params):
+    """Return the MuxStructure of a MUX request."""
+    inputs = params["inputs"]
+    bits = int(math.log2(inputs))
+    architecture = mux_architecture(params)
+    if architecture == "One-hot AND-OR":
+        return MuxStructure(architecture, inputs, depth=1 + bits)
+    if architecture != "Mux tree":
+        return MuxStructure(architecture, inputs, depth=bits)
+
+    radix = params.get("radix", MUX_TREE_RADIX)
+    every = params.get("pipeline", 0)
+    radices = []
+    remaining = inputs
+    while remaining > 1:
+        radices.append(min(radix, remaining))
+        remaining //= radices[-1]
+    registered = tuple(level for level in range(1, len(radices) + 1) if every and level % every == 0)
+
+    depth = stage = 0
+    for level, level_radix in enumerate(radices, 1):
+        stage += int(math.log2(level_radix))
+        depth = max(depth, stage)
+        if level in registered:
+            stage = 0
+    return MuxStructure(architecture, inputs, tuple(radices), registered, depth, len(registered))
+
+
+def describe_mux(params):
+    return mux_structure(params).describe()
+
+
+def build_mux_tree(code_type, entity_name, arch_name, func_name, params):
+    """A tree of radix:1 muxes over ``level_array`` signals, one per level.
+
+    Level ``l`` picks from level ``l - 1`` with the next log2(radix) select
+    bits, lowest first.  After each registered level the remaining select
+    bits and a ``valid`` flag move to the next pipeline stage with the data.
+    """
+    inputs = params["inputs"]
+    structure = mux_structure(params)
+    data = slv(minus(size(params, "width", "WIDTH")))
+    sel = slv(int(math.log2(inputs)) - 1)
+    pipelined = structure.latency > 0
+
+    ports = []
+    if pipelined:
+        ports += [Port("clk", "in", "std_logic"), Port("reset", "in", "std_logic"), Port("valid_in", "in", "std_logic")]
+    packages = []
+    uses = STANDARD_USES
+    if array_ports(params):
+        package, uses, port_type = channel_package(entity_name, inputs, params["width"])
+        packages.append(package)
+        ports.append(Port("inputs", "in", port_type))
+        fill = [Assign("level0", "level_array(inputs)")]
+    else:
+        ports.append(Each(inputs, Port("inp{i}", "in", data)))
+        fill = [Each(inputs, Assign("level0({i})", "inp{i}"))]
+    ports += [Port("sel", "in", sel), Port("Bitout", "out", data)]
+    if pipelined:
+        ports.append(Port("valid_out", "out", "std_logic"))
+
+    declarations = [
+        Comment(structure.describe()),
+        TypeDecl("level_array", f"array (natural range <>) of {data}"),
+        Signal("level0", f"level_array(0 to {inputs - 1})"),
+    ]
+    remaining = inputs
+    for level, radix in enumerate(structure.radices, 1):
+        remaining //= radix
+        declarations.append(Signal(f"level{level}", f"level_array(0 to {remaining - 1})"))
+    for stage in range(1, structure.latency + 1):
+        declarations += [Signal(f"sel_p{stage}", sel), Signal(f"valid_p{stage}", "std_logic")]
+
+    # One radix:1 mux per element of the destination level; the width of the
+    # select slice gives the radix
+    pick = "2**sel'length * i + to_integer(unsigned(sel))"
+    if code_type == "Function":
+        declarations.append(Subprogram(func_name, [Param("src", "level_array"), Param("sel", "std_logic_vector")], [
+            For("i", 0, "result'high", [VarAssign("result(i)", f"src({pick})")]),
+            Return("result"),
+        ], returns="level_array", declarations=[Variable("result", "level_array(0 to src'length / 2**sel'length - 1)")]))
+    elif code_type == "Procedure":
+        declarations.append(Subprogram(func_name, [
+            Param("src", "level_array", "in", signal=True),
+            Param("sel", "std_logic_vector", "in"),
+            Param("dst", "level_array", "out", signal=True),
+        ], [For("i", 0, "dst'high", [Assign("dst(i)", f"src({pick})")])]))
+
+    statements = fill
+    low = stage = 0
+    remaining = inputs
+    for level, radix in enumerate(structure.radices, 1):
+        remaining //= radix
+        src, dst = f"level{level - 1}", f"level{level}"
+        sel_signal = f"sel_p{stage}" if stage else "sel"
+        bits = int(math.log2(radix))
+        sel_slice = f"{sel_signal}({low + bits - 1} downto {low})"
+        low += bits
+        if code_type == "Function":
+            step = Assign(dst, CallExpr(func_name, [src, sel_slice]))
+        elif code_type == "Procedure":
+            step = Call(func_name, [src, sel_slice, dst])
+        else:
+            step = For("i", 0, remaining - 1,
+                       [Assign(f"{dst}(i)", f"{src}({radix} * i + to_integer(unsigned({sel_slice})))")])
+
+        if level in structure.registered:
+            stage += 1
+            valid = f"valid_p{stage - 1}" if stage > 1 else "valid_in"
+            # Only valid is reset; the data and select registers get a clock-only
+            # process so that reset does not act as their clock enable
+            statements.append(Process(["clk"], [If([
+                ("rising_edge(clk)", [step, Assign(f"sel_p{stage}", sel_signal)]),
+            ])]))
+            statements.append(Process(["clk", "reset"], [If([
+                ("reset = '1'", [Assign(f"valid_p{stage}", "'0'")]),
+                ("rising_edge(clk)", [Assign(f"valid_p{stage}", valid)]),
+            ])]))
+        elif code_type == "Function":
+            statements.append(step)
+        else:
+            statements.append(Process(sensitivity(params, [src, sel_signal]), [step]))
+
+    statements.append(Assign("Bitout", f"level{len(structure.radices)}(0)"))
+    if pipelined:
+        statements.append(Assign("valid_out", f"valid_p{structure.latency}"))
+    return Design(Entity(entity_name, ports, generics(params, "WIDTH")),
+                  Architecture(arch_name, declarations, statements), uses=uses, packages=packages)
+
+
+def build_mux_onehot(code_type, entity_name, arch_name, func_name, params):
+    """OR of every input ANDed with its bit of a one-hot ``sel``."""
+    width = size(params, "width", "WIDTH")
+    data = slv(minus(width))
+    array = array_ports(params)
+    packages = []
+    uses = STANDARD_USES
+    # With generic sizes and array ports the file serves every input count,
+    # so its comment gives the depth in terms of the NUM_INPUTS generic
+    structure = mux_structure(params)
+    if array:
+        channels = "NUM_INPUTS" if generic_sizes(params) else params["inputs"]
+        if generic_sizes(params):
+            structure = MuxStructure(structure.architecture, channels, depth=f"1 + log2({channels})")
+        package, uses, port_type = channel_package(entity_name, channels, width)
+        packages.append(package)
+        input_ports = [Port("inputs", "in", port_type)]
+        input_list = "inputs"
+        accumulate = For("i", 0, minus(channels),
+                         [VarAssign("result", "result or (inputs(i) and (result'range => sel(i)))")])
+    else:
+        channels = params["inputs"]
+        input_ports = [Each(channels, Port("inp{i}", "in", data))]
+        input_list = Each(channels, "inp{i}")
+        accumulate = Each(channels, VarAssign("result", "result or (inp{i} and (result'range => sel({i})))"))
+    sel = slv(minus(channels))
+    and_or = [VarAssign("result", "(others => '0')"), accumulate]
+    result = [Variable("result", data)]
+
+    ports = input_ports + [Port("sel", "in", sel), Port("Bitout", "out", data)]
+    declarations = [Comment(structure.describe())]
+    if code_type == "Function":
+        inputs_param = Param("inputs", CHANNEL_ARRAY) if array else Each(channels, Param("inp{i}", data))
+        declarations.append(Subprogram(func_name, [inputs_param, Param("sel", sel)], and_or + [Return("result")],
+                                       returns="std_logic_vector", declarations=result))
+        statements = [Assign("Bitout", CallExpr(func_name, [input_list, "sel"]))]
+    elif code_type == "Procedure":
+        inputs_param = (Param("inputs", CHANNEL_ARRAY, "in", signal=True) if array
+                        else Each(channels, Param("inp{i}", data, "in", signal=True)))
+        declarations.append(Subprogram(func_name, [
+            inputs_param,
+            Param("sel", sel, "in"),
+            Param("output", data, "out", signal=True),
+        ], and_or + [Assign("output", "result")], declarations=result))
+        statements = [Process(sensitivity(params, [input_list, "sel"]), [
+            Call(func_name, [input_list, "sel", "Bitout"]),
+        ])]
+    else:
+        statements = [Process(sensitivity(params, ["sel", input_list]), and_or + [Assign("Bitout", "result")],
+                              declarations=result)]
+    generic_names = ("NUM_INPUTS", "WIDTH") if array else ("WIDTH",)
+    return Design(Entity(entity_name, ports, generics(params, *generic_names)),
+                  Architecture(arch_name, declarations, statements), uses=uses, packages=packages)
+
+
+def build_demux(code_type, entity_name, arch_name, func_name, params):
+    if array_ports(params):
+        return build_demux_array(code_type, entity_name, arch_name, func_name, params)
+    structure = demux_structure(params)
+    if structure.registered or structure.copies:
+        return build_demux_registered(code_type, entity_name, arch_name, func_name, params, structure)
+    outputs = params["outputs"]
+    data = slv(minus(size(params, "width", "WIDTH")))
+    sel = slv(int(math.log2(outputs)) - 1)
+    selector = "to_integer(unsigned(sel))"
+    output_list = Each(outputs, "out{i}")
+
+    ports = [Port("input", "in", data), Port("sel", "in", sel), Each(outputs, Port("out{i}", "out", data))]
+    declarations = []
+    clear = Each(outputs, Assign("out{i}", "(others => '0')"))
+    # A single name in parentheses is not an aggregate, so one output is assigned directly
+    aggregate = vhdl2008(params) and outputs > 1
+    if code_type == "Function" or aggregate:
+        declarations.append(TypeDecl("output_array", f"array (0 to {outputs - 1}) of {data}"))
+    if aggregate:
+        # One aggregate assignment clears every port
+        clear = Assign([output_list], "output_array'(others => (others => '0'))")
+    if code_type == "Function":
+        declarations.append(Subprogram(func_name, [Param("input", data), Param("sel", sel)], [
+            VarAssign("result", "(others => (others => '0'))"),
+            Case(selector, [
+                Each(outputs, When("{i}", [VarAssign("result({i})", "input")])),
+                When("others", [Null()]),
+            ]),
+            Return("result"),
+        ], returns="output_array", declarations=[Variable("result", "output_array")]))
+        if aggregate:
+            # An aggregate target spreads the result over the ports in one statement
+            statements = [Assign([output_list], CallExpr(func_name, ["input", "sel"]))]
+        else:
+            declarations.append(Signal("output_signals", "output_array"))
+            statements = [
+                Assign("output_signals", CallExpr(func_name, ["input", "sel"])),
+                Each(outputs, Assign("out{i}", "output_signals({i})")),
+            ]
+    elif code_type == "Procedure":
+        declarations.append(Subprogram(func_name, [
+            Param("input", data, "in"),
+            Param("sel", sel, "in"),
+            Each(outputs, Param("out{i}", data, "out", signal=True)),
+        ], [
+            clear,
+            Case(selector, [
+                Each(outputs, When("{i}", [Assign("out{i}", "input")])),
+                When("others", [Null()]),
+            ]),
+        ]))
+        statements = [Process(sensitivity(params, ["input", "sel"]), [
+            Call(func_name, ["input", "sel", output_list]),
+        ])]
+    else:
+        statements = [Process(sensitivity(params, ["input", "sel"]), [
+            clear,
+            Case(selector, [
+                Each(outputs, When("{i}", [Assign("out{i}", "input")])),
+                When("others", [Null()]),
+            ]),
+        ])]
+    return Design(Entity(entity_name, ports, generics(params, "WIDTH")),
+                  Architecture(arch_name, declarations, statements))
+
+
+class DemuxStructure:
+    """Register stages and fanout of a DeMUX configuration.
+
+    With ``copies`` the input and select are registered once per group of at
+    most ``fanout`` outputs; ``registered`` adds a register on every output.
+    """
+    __slots__ = ('outputs', 'registered', 'fanout', 'copies')
+
+    def __init__(self, outputs, registered, fanout, copies):
+        self.outputs = outputs
+        self.registered = registered
+        self.fanout = fanout
+        self.copies = copies
+
+    @property
+    def latency(self):
+        return (1 if self.copies else 0) + (1 if self.registered else 0)
+
+    @property
+    def max_fanout(self):
+        """Most outputs or register copies fed by one driver of the input data."""
+        return max(self.copies, self.fanout) if self.copies else self.outputs
+
+    def describe(self):
+        stages = []
+        if self.copies:
+            stages.append(f"input and select registered in {self.copies} copies of at most {self.fanout} outputs each")
+        if self.registered:
+            stages.append("registered outputs")
+        cycles = f"latency {self.latency} clock cycle{'' if self.latency == 1 else 's'}"
+        return (f"DeMUX with {' and '.join(stages) or 'combinational outputs'}: "
+                f"largest fanout per driver {self.max_fanout}, {cycles}")
+
+
+def demux_structure(params):
+    """Return the DemuxStructure of a DeMUX request."""
+    outputs = params["outputs"]
+    fanout = min(params.get("fanout", 0), outputs)
+    copies = -(-outputs // fanout) if fanout else 0
+    registered = params.get("output_stage", DEMUX_OUTPUT_STAGES[0]) == "Registered"
+    return DemuxStructure(outputs, registered, fanout, copies)
+
+
+def describe_demux(params):
+    return demux_structure(params).describe()
+
+
+def build_demux_registered(code_type, entity_name, arch_name, func_name, params, structure):
+    """DeMUX whose outputs come from registers and/or from replicated input registers.
+
+    Outputs are split into groups of at most ``fanout``; each group decodes
+    its own copy of the input and select registers, so no driver feeds more
+    than ``structure.max_fanout`` loads.  The copies carry a ``keep``
+    attribute so synthesis does not merge them back into one register.
+    """
+    outputs = params["outputs"]
+    data = slv(minus(size(params, "width", "WIDTH")))
+    sel = slv(int(math.log2(outputs)) - 1)
+    copies = structure.copies
+    zero = "(others => '0')"
+    if copies:
+        groups = [(start, min(structure.fanout, outputs - start), f"input_r{copy}", f"sel_r{copy}")
+                  for copy, start in enumerate(range(0, outputs, structure.fanout))]
+    else:
+        groups = [(0, outputs, "input", "sel")]
+
+    ports = [Port("clk", "in", "std_logic")]
+    if structure.registered:
+        ports.append(Port("reset", "in", "std_logic"))
+    ports += [Port("input", "in", data), Port("sel", "in", sel), Each(outputs, Port("out{i}", "out", data))]
+
+    declarations = [Comment(structure.describe())]
+    if copies:
+        declarations += [
+            Each(copies, Signal("input_r{i}", data)),
+            Each(copies, Signal("sel_r{i}", sel)),
+            AttributeDecl("keep", "string"),
+            Each(copies, AttributeSpec("keep", "input_r{i}", '"true"')),
+            Each(copies, AttributeSpec("keep", "sel_r{i}", '"true"')),
+        ]
+    # The subprograms drive a single output, chosen by index
+    chosen = "to_integer(unsigned(sel)) = index"
+    if code_type == "Function":
+        # The return type is unconstrained, so the zero value needs a constrained variable
+        declarations.append(Subprogram(func_name, [Param("input", data), Param("sel", sel), Param("index", "natural")], [
+            If([(chosen, [VarAssign("result", "input")])]),
+            Return("result"),
+        ], returns="std_logic_vector", declarations=[Variable("result", data, zero)]))
+    elif code_type == "Procedure":
+        declarations.append(Subprogram(func_name, [
+            Param("input", data, "in"),
+            Param("sel", sel, "in"),
+            Param("index", "natural", "in"),
+            Param("output", data, "out", signal=True),
+        ], [If([(chosen, [Assign("output", "input")])], orelse=[Assign("output", zero)])]))
+
+    def drive(start, count, source, selector, clocked):
+        """Drive outputs ``start`` to ``start + count - 1`` from one input/select copy."""
+        if code_type == "Function":
+            node = Assign("out{i}", CallExpr(func_name, [source, selector, "{i}"]))
+        elif code_type == "Procedure":
+            node = Call(func_name, [source, selector, "{i}", "out{i}"])
+        elif clocked:
+            node = If([(f"to_integer(unsigned({selector})) = {{i}}", [Assign("out{i}", source)])],
+                      orelse=[Assign("out{i}", zero)])
+        else:
+            node = Assign("out{i}", f"{source} when to_integer(unsigned({selector})) = {{i}} else {zero}")
+        return Each(count, node, start)
+
+    # The copies are not reset, so they get a process of their own; sharing
+    # the reset process would turn reset into a clock enable on them
+    statements = []
+    if copies:
+        statements.append(Process(["clk"], [If([("rising_edge(clk)", [
+            Each(copies, Assign("input_r{i}", "input")),
+            Each(copies, Assign("sel_r{i}", "sel")),
+        ])])]))
+    if structure.registered:
+        statements.append(Process(["clk", "reset"], [If([
+            ("reset = '1'", [Each(outputs, Assign("out{i}", zero))]),
+            ("rising_edge(clk)", [drive(*group, clocked=True) for group in groups]),
+        ])]))
+    else:
+        for group in groups:
+            if code_type == "Procedure":
+                statements.append(Process(sensitivity(params, list(group[2:])), [drive(*group, clocked=False)]))
+            else:
+                statements.append(drive(*group, clocked=False))
+    return Design(Entity(entity_name, ports, generics(params, "WIDTH")),
+                  Architecture(arch_name, declarations, statements))
+
+
+def build_demux_array(code_type, entity_name, arch_name, func_name, params):
+    sel_width = "SEL_WIDTH" if generic_sizes(params) else int(math.log2(params["outputs"]))
+    width = size(params, "width", "WIDTH")
+    package, uses, port_type = channel_package(entity_name, pow2(sel_width), width)
+    data = slv(minus(width))
+    sel = slv(minus(sel_width))
+    selector = "to_integer(unsigned(sel))"
+    clear = "(others => (others => '0'))"
+
+    ports = [Port("input", "in", data), Port("sel", "in", sel), Port("outputs", "out", port_type)]
+    declarations = []
+    if code_type == "Function":
+        declarations.append(Subprogram(func_name, [Param("input", data), Param("sel", sel)], [
+            VarAssign(f"result({selector})", "input"),
+            Return("result"),
+        ], returns=CHANNEL_ARRAY, declarations=[Variable("result", port_type, clear)]))
+        statements = [Assign("outputs", CallExpr(func_name, ["input", "sel"]))]
+    elif code_type == "Procedure":
+        # With generic sizes the formal is unconstrained, where an others choice is not allowed
+        clear_formal = "(outputs'range => (outputs'element'range => '0'))" if generic_sizes(params) else clear
+        declarations.append(Subprogram(func_name, [
+            Param("input", data, "in"),
+            Param("sel", sel, "in"),
+            Param("outputs", CHANNEL_ARRAY, "out", signal=True),
+        ], [Assign("outputs", clear_formal), Assign(f"outputs({selector})", "input")]))
+        statements = [Process(sensitivity(params, ["input", "sel"]), [
+            Call(func_name, ["input", "sel", "outputs"]),
+        ])]
+    else:
+        statements = [Process(sensitivity(params, ["input", "sel"]), [
+            Assign("outputs", clear),
+            Assign(f"outputs({selector})", "input"),
+        ])]
+    return Design(Entity(entity_name, ports, generics(params, "SEL_WIDTH", "WIDTH")),
+                  Architecture(arch_name, declarations, statements), uses=uses, packages=[package])
+
+
+def build_decoder(code_type, entity_name, arch_name, func_name, params):
+    if array_ports(params):
+        return build_decoder_array(code_type, entity_name, arch_name, func_name, params)
+    width = params["width"]
+    outputs = 2 ** width
+    input_type = slv(width - 1)
+    selector = "to_integer(unsigned(input))"
+    decode = Case(selector, [
+        Each(outputs, When("{i}", [Assign("out{i}", "'1'")])),
+        When("others", [Null()]),
+    ])
+
+    output_list = Each(outputs, "out{i}")
+
+    ports = [Port("input", "in", input_type), Each(outputs, Port("out{i}", "out", "std_logic"))]
+    declarations = []
+    clear = Each(outputs, Assign("out{i}", "'0'"))
+    if code_type == "Function" or vhdl2008(params):
+        declarations.append(TypeDecl("output_array", f"array (0 to {outputs - 1}) of std_logic"))
+    if vhdl2008(params):
+        clear = Assign([output_list], "output_array'(others => '0')")
+    if code_type == "Function":
+        declarations.append(Subprogram(func_name, [Param("input", input_type)], [
+            VarAssign(f"result({selector})", "'1'"),
+            Return("result"),
+        ], returns="output_array", declarations=[Variable("result", "output_array", "(others => '0')")]))
+        if vhdl2008(params):
+            statements = [Assign([output_list], CallExpr(func_name, ["input"]))]
+        else:
+            declarations.append(Signal("output_signals", "output_array"))
+            statements = [
+                Assign("output_signals", CallExpr(func_name, ["input"])),
+                Each(outputs, Assign("out{i}", "output_signals({i})")),
+            ]
+    elif code_type == "Procedure":
+        declarations.append(Subprogram(func_name, [
+            Param("input", input_type, "in"),
+            Each(outputs, Param("out{i}", "std_logic", "out", signal=True)),
+        ], [clear, decode]))
+        statements = [Process(sensitivity(params, ["input"]), [Call(func_name, ["input", output_list])])]
+    else:
+        statements = [Process(sensitivity(params, ["input"]), [clear, decode])]
+    return Design(Entity(entity_name, ports), Architecture(arch_name, declarations, statements))
+
+
+def build_decoder_array(code_type, entity_name, arch_name, func_name, params):
+    # A vector of std_logic is already an array type, so no package is needed
+    width = size(params, "width", "WIDTH")
+    input_type = slv(minus(width))
+    output_type = slv(minus(pow2(width)))
+    selector = "to_integer(unsigned(input))"
+
+    ports = [Port("input", "in", input_type), Port("output", "out", output_type)]
+    declarations = []
+    if code_type == "Function":
+        declarations.append(Subprogram(func_name, [Param("input", input_type)], [
+            VarAssign(f"result({selector})", "'1'"),
+            Return("result"),
+        ], returns="std_logic_vector", declarations=[Variable("result", output_type, "(others => '0')")]))
+        statements = [Assign("output", CallExpr(func_name, ["input"]))]
+    elif code_type == "Procedure":
+        declarations.append(Subprogram(func_name, [
+            Param("input", input_type, "in"),
+            Param("output", output_type, "out", signal=True),
+        ], [Assign("output", "(others => '0')"), Assign(f"output({selector})", "'1'")]))
+        statements = [Process(sensitivity(params, ["input"]), [Call(func_name, ["input", "output"])])]
+    else:
+        statements = [Process(sensitivity(params, ["input"]), [
+            Assign("output", "(others => '0')"),
+            Assign(f"output({selector})", "'1'"),
+        ])]
+    return Design(Entity(entity_name, ports, generics(params, "WIDTH")),
+                  Architecture(arch_name, declarations, statements))
+
+
+def build_encoder(code_type, entity_name, arch_name, func_name, params):
+    if array_ports(params):
+        return build_encoder_array(code_type, entity_name, arch_name, func_name, params)
+    width = params["width"]
+    inputs = 2 ** width
+    output_type = slv(width - 1)
+    code = "std_logic_vector(to_unsigned({i}, " + str(width) + "))"
+    input_list = Each(inputs, "in{i}")
+
+    ports = [Each(inputs, Port("in{i}", "in", "std_logic")), Port("output", "out", output_type)]
+    declarations = []
+    if code_type == "Function":
+        declarations.append(Subprogram(func_name, [Each(inputs, Param("in{i}", "std_logic"))], [
+            VarAssign("result", "(others => '0')"),
+            Each(inputs, If([("in{i} = '1'", [VarAssign("result", code)])])),
+            Return("result"),
+        ], returns="std_logic_vector", declarations=[Variable("result", output_type)]))
+        statements = [Assign("output", CallExpr(func_name, [input_list]))]
+    elif code_type == "Procedure":
+        declarations.append(Subprogram(func_name, [
+            Each(inputs, Param("in{i}", "std_logic", "in", signal=True)),
+            Param("output", output_type, "out", signal=True),
+        ], [
+            Assign("output", "(others => '0')"),
+            Each(inputs, If([("in{i} = '1'", [Assign("output", code)])])),
+        ]))
+        statements = [Process(sensitivity(params, [input_list]), [Call(func_name, [input_list, "output"])])]
+    else:
+        statements = [Process(sensitivity(params, [input_list]), [
+            Assign("output", "(others => '0')"),
+            Each(inputs, If([("in{i} = '1'", [Assign("output", code)])])),
+        ])]
+    return Design(Entity(entity_name, ports), Architecture(arch_name, declarations, statements))
+
+
+def build_encoder_array(code_type, entity_name, arch_name, func_name, params):
+    width = size(params, "width", "WIDTH")
+    last = minus(pow2(width))
+    input_type = slv(last)
+    output_type = slv(minus(width))
+    code = f"std_logic_vector(to_unsigned(i, {width}))"
+
+    def scan(assign, target):
+        # Later inputs win, as in the scalar form's if chain
+        return [assign(target, "(others => '0')"),
+                For("i", 0, last, [If([("inputs(i) = '1'", [assign(target, code)])])])]
+
+    ports = [Port("inputs", "in", input_type), Port("output", "out", output_type)]
+    declarations = []
+    if code_type == "Function":
+        declarations.append(Subprogram(func_name, [Param("inputs", input_type)], scan(VarAssign, "result") + [
+            Return("result"),
+        ], returns="std_logic_vector", declarations=[Variable("result", output_type)]))
+        statements = [Assign("output", CallExpr(func_name, ["inputs"]))]
+    elif code_type == "Procedure":
+        declarations.append(Subprogram(func_name, [
+            Param("inputs", input_type, "in", signal=True),
+            Param("output", output_type, "out", signal=True),
+        ], scan(Assign, "output")))
+        statements = [Process(sensitivity(params, ["inputs"]), [Call(func_name, ["inputs", "output"])])]
+    else:
+        statements = [Process(sensitivity(params, ["inputs"]), scan(Assign, "output"))]
+    return Design(Entity(entity_name, ports, generics(params, "WIDTH")),
+                  Architecture(arch_name, declarations, statements))
+
+
+def build_shift_register(code_type, entity_name, arch_name, func_name, params):
+    width = size(params, "width", "WIDTH")
+    reg_type = slv(minus(width))
+    rest = minus(width, 2)
+    serial_in = params["type"] == "Serial-In Parallel-Out"
+    fill = "serial_in" if serial_in else "'0'"
+
+    if serial_in:
+        ports = [Port("clk", "in", "std_logic"), Port("reset", "in", "std_logic"),
+                 Port("serial_in", "in", "std_logic"), Port("parallel_out", "out", reg_type)]
+    else:
+        ports = [Port("clk", "in", "std_logic"), Port("reset", "in", "std_logic"), Port("load", "in", "std_logic"),
+                 Port("parallel_in", "in", reg_type), Port("serial_out", "out", "std_logic")]
+
+    declarations = [Signal("shift_reg", reg_type)]
+    if code_type == "Function":
+        func_params = [Param("current_reg", reg_type)]
+        args = ["shift_reg"]
+        if serial_in:
+            func_params.append(Param("serial_in", "std_logic"))
+            args.append("serial_in")
+        declarations.append(Subprogram(func_name, func_params, [
+            Return(f"current_reg({rest} downto 0) & {fill}"),
+        ], returns="std_logic_vector"))
+        shift = Assign("shift_reg", CallExpr(func_name, args))
+    elif code_type == "Procedure":
+        proc_params = [Param("current_reg", reg_type, "in", signal=True)]
+        args = ["shift_reg"]
+        if serial_in:
+            proc_params.append(Param("serial_in", "std_logic", "in", signal=True))
+            args.append("serial_in")
+        proc_params.append(Param("next_reg", reg_type, "out", signal=True))
+        args.append("shift_reg")
+        declarations.append(Subprogram(func_name, proc_params, [
+            Assign("next_reg", f"current_reg({rest} downto 0) & {fill}"),
+        ]))
+        shift = Call(func_name, args)
+    else:
+        shift = Assign("shift_reg", f"shift_reg({rest} downto 0) & {fill}")
+
+    if serial_in:
+        clocked = [shift]
+        output = Assign("parallel_out", "shift_reg")
+    else:
+        clocked = [If([("load = '1'", [Assign("shift_reg", "parallel_in")])], orelse=[shift])]
+        output = Assign("serial_out", f"shift_reg({minus(width)})")
+
+    statements = [
+        Process(["clk", "reset"], [If([
+            ("reset = '1'", [Assign("shift_reg", "(others => '0')")]),
+            ("rising_edge(clk)", clocked),
+        ])]),
+        output,
+    ]
+    return Design(Entity(entity_name, ports, generics(params, "WIDTH")),
+                  Architecture(arch_name, declarations, statements), uses=LOGIC_ONLY_USES)
+
+
+def build_sram(code_type, entity_name, arch_name, func_name, params):
+    addr_width = size(params, "addr_width", "ADDR_WIDTH")
+    addr_type = slv(minus(addr_width))
+    data_type = slv(minus(size(params, "data_width", "DATA_WIDTH")))
+    max_addr = minus(pow2(addr_width))
+    read = "(to_integer(unsigned(addr)))"
+
+    ports = [Port("clk", "in", "std_logic"), Port("we", "in", "std_logic", "Write enable"),
+             Port("addr", "in", addr_type), Port("data_in", "in", data_type), Port("data_out", "out", data_type)]
+    declarations = [
+        TypeDecl("ram_type", f"array (0 to {max_addr}) of {data_type}"),
+        Signal("ram", "ram_type", "(others => (others => '0'))"),
+    ]
+    statements = [Process(["clk"], [
+        If([("rising_edge(clk)", [If([("we = '1'", [Assign("ram" + read, "data_in")])])])]),
+    ])]
+    if code_type == "Function":
+        declarations.append(Subprogram(func_name, [Param("memory", "ram_type"), Param("addr", addr_type)], [
+            Return("memory" + read),
+        ], returns="std_logic_vector"))
+        statements.append(Assign("data_out", CallExpr(func_name, ["ram", "addr"])))
+    elif code_type == "Procedure":
+        declarations.append(Subprogram(func_name, [
+            Param("memory", "ram_type", "in", signal=True),
+            Param("addr", addr_type, "in", signal=True),
+            Param("data", data_type, "out", signal=True),
+        ], [Assign("data", "memory" + read)]))
+        statements.append(Process(sensitivity(params, ["ram", "addr"]), [Call(func_name, ["ram", "addr", "data_out"])]))
+    else:
+        statements.append(Assign("data_out", "ram" + read))
+    return Design(Entity(entity_name, ports, generics(params, "ADDR_WIDTH", "DATA_WIDTH")),
+                  Architecture(arch_name, declarations, statements))
+
+
+def build_clock_divider(code_type, entity_name, arch_name, func_name, params):
+    last = minus(size(params, "div_factor", "DIV_FACTOR"))
+
+    ports = [Port("clk_in", "in", "std_logic"), Port("reset", "in", "std_logic"), Port("clk_out", "out", "std_logic")]
+    declarations = [Signal("counter", f"integer range 0 to {last}"), Signal("temp_clk", "std_logic")]
+    if code_type == "Function":
+        declarations.append(Subprogram(func_name, [Param("current_count", "integer"), Param("current_clk", "std_logic")], [
+            If([(f"current_count = {last}", [Return("not current_clk")])], orelse=[Return("current_clk")]),
+        ], returns="std_logic"))
+        toggle = Assign("temp_clk", CallExpr(func_name, ["counter", "temp_clk"]))
+    elif code_type == "Procedure":
+        declarations.append(Subprogram(func_name, [
+            Param("current_count", "integer", "in", signal=True),
+            Param("current_clk", "std_logic", "in", signal=True),
+            Param("next_clk", "std_logic", "out", signal=True),
+        ], [
+            If([(f"current_count = {last}", [Assign("next_clk", "not current_clk")])],
+               orelse=[Assign("next_clk", "current_clk")]),
+        ]))
+        toggle = Call(func_name, ["counter", "temp_clk", "temp_clk"])
+    else:
+        toggle = Assign("temp_clk", "not temp_clk")
+
+    statements = [
+        Process(["clk_in", "reset"], [If([
+            ("reset = '1'", [Assign("counter", "0"), Assign("temp_clk", "'0'")]),
+            ("rising_edge(clk_in)", [
+                If([(f"counter = {last}", [toggle, Assign("counter", "0")])],
+                   orelse=[Assign("counter", "counter + 1")]),
+            ]),
+        ])]),
+        Assign("clk_out", "temp_clk"),
+    ]
+    return Design(Entity(entity_name, ports, generics(params, "DIV_FACTOR")),
+                  Architecture(arch_name, declarations, statements))
+
+
+class ParamSpec:
+    """One component parameter: its ``params`` key, GUI label and constraints.
+
+    ``kind`` is "int" or "choice".  Integer parameters are checked against
+    ``minimum``/``maximum`` and, with ``power_of_two``, must be a power of 2.
+    ``maximum`` is a language limit, not a size cap: how large a design may
+    get is decided by a vhdl_budget.Budget.
+    ``warning`` is an optional ``(threshold, message(value))`` pair for values
+    that are allowed but deserve a confirmation in the GUI.  Parameters that
+    are not ``required`` fall back to ``default`` when left out.
+    """
+    __slots__ = ('key', 'label', 'kind', 'minimum', 'maximum', 'power_of_two', 'choices', 'default',
+                 'limit_note', 'warning', 'required')
+
+    def __init__(self, key, label, kind="int", minimum=1, maximum=INTEGER_MAX, power_of_two=False, choices=(),
+                 default="", limit_note=None, warning=None, required=True):
+        self.key = key
+        self.label = label
+        self.kind = kind
+        self.minimum = minimum
+        self.maximum = maximum
+        self.power_of_two = power_of_two
+        self.choices = choices
+        self.default = default if default or not choices else choices[0]
+        self.limit_note = limit_note
+        self.warning = warning
+        self.required = required
+
+    def parse(self, raw):
+        """Convert a value typed in the GUI or read from CSV."""
+        if self.kind == "choice" or not isinstance(raw, str):
+            return raw
+        try:
+            return int(raw)
+        except ValueError:
+            raise ValueError(f"{self.label} must be an integer, got '{raw}'")
+
+    def check(self, value):
+        """Return ``(code, message)`` if ``value`` is not acceptable, else None."""
+        if value is None or value == "":
+            return ("missing", f"Missing {self.label}") if self.required else None
+        if self.kind == "choice":
+            if value not in self.choices:
+                return "invalid_choice", f"{self.label} must be one of: {', '.join(self.choices)}"
+            return None
+        if type(value) is not int:
+            return "not_integer", f"{self.label} must be an integer"
+        if value < self.minimum:
+            return "too_small", (f"{self.label} must be positive" if self.minimum == 1 else
+                                 f"{self.label} must be at least {self.minimum}")
+        if self.maximum is not None and value > self.maximum:
+            note = f" ({self.limit_note})" if self.limit_note else ""
+            return "too_large", f"{self.label} cannot exceed {self.maximum}{note}"
+        if self.power_of_two and value & (value - 1):
+            return "not_power_of_two", f"{self.label} must be a power of 2"
+        return None
+
+    def warning_for(self, value):
+        """Return the confirmation message for a large but valid value, or None."""
+        if self.warning is not None and value > self.warning[0]:
+            return self.warning[1](value)
+        return None
+
+
+class ComponentSpec:
+    """A component: its parameters and the builder producing its design.
+
+    ``check`` optionally rejects combinations of individually valid
+    parameters; it returns ``(key, code, message)`` or None.  ``report``
+    optionally describes the generated structure for a valid request.
+    """
+    __slots__ = ('name', 'params', 'build', 'check', 'report')
+
+    def __init__(self, name, params, build, check=None, report=None):
+        self.name = name
+        self.params = params
+        self.build = build
+        self.check = check
+        self.report = report
+
+
+def check_channel_sizes(params):
+    if generic_sizes(params) and array_ports(params) and not vhdl2008(params):
+        return ("sizes", "generic_needs_vhdl2008",
+                "Generic sizes with array ports need the VHDL-2008 dialect (unconstrained array elements)")
+    return None
+
+
+def check_mux(params):
+    if mux_architecture(params) == "Mux tree" and generic_sizes(params) and array_ports(params):
+        return "sizes", "generic_needs_fixed_inputs", "A mux tree with array ports needs a fixed number of inputs"
+    return check_channel_sizes(params)
+
+
+def check_demux(params):
+    structure = demux_structure(params)
+    if (structure.registered or structure.copies) and array_ports(params):
+        return "ports", "staged_needs_scalar_ports", "Registered or replicated outputs need scalar ports"
+    return check_channel_sizes(params)
+
+
+def check_index_sizes(params):
+    if generic_sizes(params) and not array_ports(params):
+        return ("sizes", "generic_needs_array_ports",
+                "Generic sizes need array ports, since the number of scalar ports depends on the width")
+    return None
+
+
+# Options shared by several components
+PORTS_PARAM = ParamSpec("ports", "Ports", kind="choice", choices=PORT_STYLES, required=False)
+DIALECT_PARAM = ParamSpec("dialect", "Dialect", kind="choice", choices=DIALECTS, required=False)
+SIZES_PARAM = ParamSpec("sizes", "Sizes", kind="choice", choices=SIZE_MODES, required=False)
+
+# All components offered by the generator, in GUI order
+COMPONENTS = {spec.name: spec for spec in (
+    ComponentSpec("MUX", (
+        ParamSpec("inputs", "Number of inputs", power_of_two=True),
+        ParamSpec("width", "Width of channels"),
+        PORTS_PARAM,
+        DIALECT_PARAM,
+        SIZES_PARAM,
+        ParamSpec("architecture", "Architecture", kind="choice", choices=MUX_ARCHITECTURES, required=False),
+        ParamSpec("radix", "Tree radix", minimum=2, power_of_two=True, default=MUX_TREE_RADIX, required=False),
+        ParamSpec("pipeline", "Register every (levels)", minimum=0, default=0, required=False),
+    ), build_mux, check_mux, describe_mux),
+    ComponentSpec("DeMUX", (
+        ParamSpec("outputs", "Number of outputs", power_of_two=True),
+        ParamSpec("width", "Width of channels"),
+        PORTS_PARAM,
+        DIALECT_PARAM,
+        SIZES_PARAM,
+        ParamSpec("output_stage", "Outputs", kind="choice", choices=DEMUX_OUTPUT_STAGES, required=False),
+        ParamSpec("fanout", "Max fanout (0 = off)", minimum=0, default=0, required=False),
+    ), build_demux, check_demux, describe_demux),
+    ComponentSpec("Decoder", (
+        ParamSpec("width", "Width of input", maximum=INDEX_WIDTH_MAX, limit_note="largest VHDL integer index"),
+        PORTS_PARAM,
+        DIALECT_PARAM,
+        SIZES_PARAM,
+    ), build_decoder, check_index_sizes),
+    ComponentSpec("Encoder", (
+        ParamSpec("width", "Width of output", maximum=INDEX_WIDTH_MAX, limit_note="largest VHDL integer index"),
+        PORTS_PARAM,
+        DIALECT_PARAM,
+        SIZES_PARAM,
+    ), build_encoder, check_index_sizes),
+    ComponentSpec("Shift Register", (
+        ParamSpec("width", "Width of register"),
+        ParamSpec("type", "Type", kind="choice", choices=("Serial-In Parallel-Out", "Parallel-In Serial-Out")),
+        SIZES_PARAM,
+    ), build_shift_register),
+    ComponentSpec("SRAM", (
+        ParamSpec("addr_width", "Address Width", maximum=INDEX_WIDTH_MAX, limit_note="largest VHDL integer index",
+                  warning=(16, lambda value: (
+            f"Large address width ({value} bits) will generate {2**value:,} memory locations.\n"
+            "This might require significant hardware resources.\n"
+            "Do you want to continue?"))),
+        ParamSpec("data_width", "Data Width", warning=(128, lambda value: (
+            f"Large data width ({value} bits) might require significant hardware resources.\n"
+            "Do you want to continue?"))),
+        DIALECT_PARAM,
+        SIZES_PARAM,
+    ), build_sram),
+    ComponentSpec("Clock Divider", (
+        ParamSpec("div_factor", "Division Factor"),
+        SIZES_PARAM,
+    ), build_clock_divider),
+)}
+
+# Every parameter key used by any component
+PARAM_KEYS = tuple(dict.fromkeys(param.key for spec in COMPONENTS.values() for param in spec.params))
+
+
+def normalize_params(component, params):
+    """Return ``params`` with every optional parameter that is left out set to its default.
+
+    Requests are hashed after this, so one that spells out the defaults (the
+    GUI sends every option) and one that omits them (a batch manifest) get
+    the same cache keys.
+    """
+    spec = COMPONENTS.get(component)
+    if spec is None:
+        return params
+    missing = [param for param in spec.params if not param.required and params.get(param.key) in (None, "")]
+    if not missing:
+        return params
+    params = dict(params)
+    for param in missing:
+        params[param.key] = param.default
+    return params
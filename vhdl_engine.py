@@ -0,0 +1,210 @@
+"""Headless VHDL generation engine.
+
+Everything in this module is pure Python: no Tk, no clipboard.  The GUI in
+``main.py`` calls into it, and scripts or worker processes can import it
+directly to turn a request (component, code type, names, params) into VHDL
+text without building a window.
+"""
+import sys
+import threading
+from collections import OrderedDict
+
+import vhdl_components
+import vhdl_ir
+
+# Bump whenever the generated text changes, so persistent caches are invalidated
+GENERATOR_VERSION = "4"
+
+# Target size of each write() issued by write_vhdl
+WRITE_BUFFER_SIZE = 64 * 1024
+
+
+def is_power_of_two(n):
+    return n > 0 and (n & (n - 1)) == 0
+
+
+def generate_vhdl(component, code_type, entity_name, arch_name, func_proc_name, params):
+    """Generate VHDL code for one request.
+
+    ``code_type`` is "None", "Function" or "Procedure", exactly as offered by
+    the GUI.  Results are memoized in ``render_cache``, so repeating a request
+    costs a dictionary lookup.  The function is safe to call from several
+    threads or processes at once.
+    """
+    key = request_key(component, code_type, entity_name, arch_name, func_proc_name, params)
+    code = render_cache.get(key)
+    if code is None:
+        code = ''.join(iter_vhdl(component, code_type, entity_name, arch_name, func_proc_name, params))
+        render_cache.put(key, code)
+    return code
+
+
+def request_key(component, code_type, entity_name, arch_name, func_proc_name, params):
+    """Return a hashable key identifying a request; left-out options count as their defaults."""
+    params = vhdl_components.normalize_params(component, params)
+    return (component, code_type, entity_name, arch_name, func_proc_name, tuple(sorted(params.items())))
+
+
+class RenderCache:
+    """Bounded LRU memo of rendered VHDL, keyed by request_key().
+
+    The cache holds at most ``maxsize`` entries and ``max_chars`` characters
+    in total; outputs larger than ``max_chars`` are never stored.  Hit, miss
+    and eviction counts are kept for stats().
+    """
+
+    def __init__(self, maxsize=256, max_chars=64 * 1024 * 1024):
+        self.maxsize = maxsize
+        self.max_chars = max_chars
+        self._entries = OrderedDict()
+        self._chars = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            code = self._entries.get(key)
+            if code is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return code
+
+    def put(self, key, code):
+        if len(code) > self.max_chars or self.maxsize <= 0:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._chars -= len(previous)
+            self._entries[key] = code
+            self._chars += len(code)
+            while len(self._entries) > self.maxsize or self._chars > self.max_chars:
+                _, evicted = self._entries.popitem(last=False)
+                self._chars -= len(evicted)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._chars = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "chars": self._chars,
+            }
+
+
+render_cache = RenderCache()
+
+
+def iter_vhdl(component, code_type, entity_name, arch_name, func_proc_name, params):
+    """Yield the VHDL code for one request as a sequence of string chunks.
+
+    Joining the chunks gives exactly the text returned by generate_vhdl(),
+    but repeated sections are expanded one line at a time.
+    """
+    return vhdl_ir.iter_render(build_design(component, code_type, entity_name, arch_name, func_proc_name, params))
+
+
+def build_design(component, code_type, entity_name, arch_name, func_proc_name, params):
+    """Return the vhdl_ir.Design for one request; left-out options take their defaults."""
+    spec = vhdl_components.COMPONENTS.get(component)
+    if spec is None:
+        raise ValueError(f"Unknown component '{component}'")
+    params = vhdl_components.normalize_params(component, params)
+    return spec.build(code_type, entity_name, arch_name, func_proc_name, params)
+
+
+def write_vhdl(sink, component, code_type, entity_name, arch_name, func_proc_name, params,
+               encoding=None, buffer_size=WRITE_BUFFER_SIZE):
+    """Stream the VHDL code for one request into a file-like ``sink``.
+
+    ``sink`` only needs a ``write`` method: an open file, ``gzip.open(..., 'wt')``,
+    ``socket.makefile('w')`` and so on.  Pass ``encoding`` for sinks that take
+    bytes.  Chunks are collected into writes of about ``buffer_size``
+    characters, so peak memory stays bounded whatever the component size.
+    A request already in ``render_cache`` is written from there; streamed
+    output is not added to the cache.  Returns the number of characters written.
+    """
+    write = sink.write
+    cached = render_cache.get(request_key(component, code_type, entity_name, arch_name, func_proc_name, params))
+    if cached is not None:
+        write(cached.encode(encoding) if encoding else cached)
+        return len(cached)
+
+    pending = []
+    pending_size = 0
+    total = 0
+    for chunk in iter_vhdl(component, code_type, entity_name, arch_name, func_proc_name, params):
+        pending.append(chunk)
+        pending_size += len(chunk)
+        if pending_size >= buffer_size:
+            data = ''.join(pending)
+            write(data.encode(encoding) if encoding else data)
+            total += pending_size
+            pending.clear()
+            pending_size = 0
+    if pending:
+        data = ''.join(pending)
+        write(data.encode(encoding) if encoding else data)
+        total += pending_size
+    return total
+
+
+def get_basic_vhdl_code(component, entity_name, arch_name, params, dialect=None):
+    """Generate basic VHDL code without function/procedure"""
+    return get_vhdl_code(component, "None", entity_name, arch_name, "", params, dialect)
+
+
+def get_vhdl_code(component, code_type, entity_name, arch_name, func_proc_name, params, dialect=None):
+    """Generate VHDL code with function/procedure
+
+    ``dialect`` ("VHDL-93" or "VHDL-2008") overrides the ``dialect`` parameter.
+    """
+    if dialect is not None:
+        params = dict(params, dialect=dialect)
+    return vhdl_ir.render(build_design(component, code_type, entity_name, arch_name, func_proc_name, params))
+
+
+def measure_cold_start(python=None):
+    """Measure import and first-output latency of the engine in a fresh interpreter.
+
+    Returns a dict with ``import_s``, ``first_output_s`` and ``total_s`` in
+    seconds.  A new interpreter is used so nothing is already imported.
+    """
+    import json
+    import os
+    import subprocess
+
+    probe = (
+        "import json, time\n"
+        "t0 = time.perf_counter()\n"
+        "import vhdl_engine\n"
+        "t1 = time.perf_counter()\n"
+        "vhdl_engine.generate_vhdl('MUX', 'None', 'Entity_1', 'Arch_1', 'Fun_1', {'inputs': 4, 'width': 8})\n"
+        "t2 = time.perf_counter()\n"
+        "print(json.dumps({'import_s': t1 - t0, 'first_output_s': t2 - t1, 'total_s': t2 - t0,\n"
+        "                  'tk_loaded': 'tkinter' in __import__('sys').modules}))\n"
+    )
+    here = os.path.dirname(os.path.abspath(__file__))
+    result = subprocess.run([python or sys.executable, "-c", probe], cwd=here,
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+
+if __name__ == "__main__":
+    stats = measure_cold_start()
+    print(f"import:       {stats['import_s'] * 1000:.2f} ms")
+    print(f"first output: {stats['first_output_s'] * 1000:.2f} ms")
+    print(f"total:        {stats['total_s'] * 1000:.2f} ms")
+    print(f"tkinter loaded: {stats['tk_loaded']}")
@@ -0,0 +1,638 @@
+"""Lightweight intermediate representation of generated VHDL designs.
+
+Components build a tree of the node classes below and ``render`` turns it
+into text.  Expressions stay plain strings; only the structure (units,
+ports, declarations, statements) is modelled.
+
+Per-channel structure is expressed with ``Each``: ``Each(n, node)`` stands
+for ``n`` copies of ``node`` with every ``{i}`` in its strings replaced by the
+copy index.  A 1024-input MUX is therefore a handful of nodes, its size can
+be computed with ``measure`` without rendering, and ``iter_render`` streams
+the text without ever holding it as a whole.
+"""
+
+STANDARD_LIBRARIES = ("IEEE",)
+STANDARD_USES = ("IEEE.STD_LOGIC_1164.ALL", "IEEE.NUMERIC_STD.ALL")
+
+INDENT = "    "
+
+
+class Node:
+    __slots__ = ()
+
+    def __repr__(self):
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+    def __eq__(self, other):
+        return type(self) is type(other) and all(
+            getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __hash__(self):
+        return hash((type(self).__name__,) + tuple(_freeze(getattr(self, name)) for name in self.__slots__))
+
+
+def _freeze(value):
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+# -- design units -------------------------------------------------------------
+
+class Design(Node):
+    """One entity/architecture pair with its context clause.
+
+    ``packages`` are rendered ahead of the entity, each with its own context
+    clause; the design's ``uses`` must name them to see their declarations.
+    """
+    __slots__ = ('entity', 'architecture', 'libraries', 'uses', 'packages')
+
+    def __init__(self, entity, architecture, libraries=STANDARD_LIBRARIES, uses=STANDARD_USES, packages=()):
+        self.entity = entity
+        self.architecture = architecture
+        self.libraries = libraries
+        self.uses = uses
+        self.packages = packages
+
+
+class Package(Node):
+    """A package declaration holding types shared by the entity and its ports."""
+    __slots__ = ('name', 'declarations', 'libraries', 'uses')
+
+    def __init__(self, name, declarations, libraries=STANDARD_LIBRARIES, uses=STANDARD_USES):
+        self.name = name
+        self.declarations = declarations
+        self.libraries = libraries
+        self.uses = uses
+
+
+class Entity(Node):
+    __slots__ = ('name', 'ports', 'generics')
+
+    def __init__(self, name, ports, generics=()):
+        self.name = name
+        self.ports = ports
+        self.generics = generics
+
+
+class Generic(Node):
+    __slots__ = ('name', 'type', 'default')
+
+    def __init__(self, name, type, default=None):
+        self.name = name
+        self.type = type
+        self.default = default
+
+
+class Port(Node):
+    """A port; ``comment`` is rendered at the end of its line."""
+    __slots__ = ('name', 'mode', 'type', 'comment')
+
+    def __init__(self, name, mode, type, comment=None):
+        self.name = name
+        self.mode = mode
+        self.type = type
+        self.comment = comment
+
+
+class Architecture(Node):
+    __slots__ = ('name', 'declarations', 'statements')
+
+    def __init__(self, name, declarations, statements):
+        self.name = name
+        self.declarations = declarations
+        self.statements = statements
+
+
+# -- declarations -------------------------------------------------------------
+
+class Signal(Node):
+    __slots__ = ('name', 'type', 'init')
+
+    def __init__(self, name, type, init=None):
+        self.name = name
+        self.type = type
+        self.init = init
+
+
+class Variable(Node):
+    __slots__ = ('name', 'type', 'init')
+
+    def __init__(self, name, type, init=None):
+        self.name = name
+        self.type = type
+        self.init = init
+
+
+class TypeDecl(Node):
+    __slots__ = ('name', 'definition')
+
+    def __init__(self, name, definition):
+        self.name = name
+        self.definition = definition
+
+
+class AttributeDecl(Node):
+    __slots__ = ('name', 'type')
+
+    def __init__(self, name, type):
+        self.name = name
+        self.type = type
+
+
+class AttributeSpec(Node):
+    """``attribute name of target : entity_class is value``."""
+    __slots__ = ('name', 'target', 'value', 'entity_class')
+
+    def __init__(self, name, target, value, entity_class="signal"):
+        self.name = name
+        self.target = target
+        self.value = value
+        self.entity_class = entity_class
+
+
+class Subprogram(Node):
+    """A function (``returns`` set) or procedure (``returns`` None)."""
+    __slots__ = ('name', 'params', 'statements', 'returns', 'declarations')
+
+    def __init__(self, name, params, statements, returns=None, declarations=()):
+        self.name = name
+        self.params = params
+        self.statements = statements
+        self.returns = returns
+        self.declarations = declarations
+
+
+class Param(Node):
+    """Subprogram parameter; ``signal`` adds the signal class."""
+    __slots__ = ('name', 'type', 'mode', 'signal')
+
+    def __init__(self, name, type, mode=None, signal=False):
+        self.name = name
+        self.type = type
+        self.mode = mode
+        self.signal = signal
+
+
+# -- statements ---------------------------------------------------------------
+
+class Process(Node):
+    __slots__ = ('sensitivity', 'statements', 'declarations')
+
+    def __init__(self, sensitivity, statements, declarations=()):
+        self.sensitivity = sensitivity
+        self.statements = statements
+        self.declarations = declarations
+
+
+class Assign(Node):
+    """Signal assignment ``target <= value``, concurrent or sequential.
+
+    A list ``target`` is an aggregate target, ``(a, b, ...) <= value``.
+    """
+    __slots__ = ('target', 'value')
+
+    def __init__(self, target, value):
+        self.target = target
+        self.value = value
+
+
+class VarAssign(Node):
+    """Variable assignment ``target := value``."""
+    __slots__ = ('target', 'value')
+
+    def __init__(self, target, value):
+        self.target = target
+        self.value = value
+
+
+class Call(Node):
+    """Procedure call statement."""
+    __slots__ = ('name', 'args')
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+
+
+class CallExpr(Node):
+    """Function call used as the value of an assignment or return."""
+    __slots__ = ('name', 'args')
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+
+
+class If(Node):
+    """``if``/``elsif`` chain; ``branches`` is a sequence of (condition, statements)."""
+    __slots__ = ('branches', 'orelse')
+
+    def __init__(self, branches, orelse=None):
+        self.branches = branches
+        self.orelse = orelse
+
+
+class Case(Node):
+    __slots__ = ('selector', 'arms')
+
+    def __init__(self, selector, arms):
+        self.selector = selector
+        self.arms = arms
+
+
+class When(Node):
+    __slots__ = ('choice', 'statements')
+
+    def __init__(self, choice, statements):
+        self.choice = choice
+        self.statements = statements
+
+
+class For(Node):
+    """``for var in low to high loop``; the bounds are expressions."""
+    __slots__ = ('var', 'low', 'high', 'statements')
+
+    def __init__(self, var, low, high, statements):
+        self.var = var
+        self.low = low
+        self.high = high
+        self.statements = statements
+
+
+class Return(Node):
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+
+class Null(Node):
+    __slots__ = ()
+
+
+class Comment(Node):
+    """A ``--`` comment line, allowed among declarations and statements."""
+    __slots__ = ('text',)
+
+    def __init__(self, text):
+        self.text = text
+
+
+class Each(Node):
+    """``count`` copies of ``node`` with ``{i}`` replaced by ``start``, ``start + 1``, ..."""
+    __slots__ = ('count', 'node', 'start')
+
+    def __init__(self, count, node, start=0):
+        self.count = count
+        self.node = node
+        self.start = start
+
+
+def length(items):
+    """Number of elements in a list that may contain Each nodes."""
+    return sum(item.count if isinstance(item, Each) else 1 for item in items)
+
+
+# -- rendering ----------------------------------------------------------------
+
+class Run:
+    """``count`` copies of ``text`` with ``{i}`` replaced by consecutive indices."""
+    __slots__ = ('count', 'text', 'start')
+
+    def __init__(self, count, text, start=0):
+        self.count = count
+        self.text = text
+        self.start = start
+
+    def __iter__(self):
+        text = self.text
+        if '{i}' not in text:
+            for _ in range(self.count):
+                yield text
+            return
+        for i in range(self.start, self.start + self.count):
+            yield text.replace('{i}', str(i))
+
+
+def render(design, indent=INDENT):
+    """Return the VHDL text of ``design``."""
+    return ''.join(iter_render(design, indent))
+
+
+def iter_render(design, indent=INDENT):
+    """Yield the VHDL text of ``design`` in chunks of at most a few lines."""
+    for chunk in _Renderer(indent).design(design):
+        if isinstance(chunk, Run):
+            yield from chunk
+        else:
+            yield chunk
+
+
+def measure(design, indent=INDENT):
+    """Return ``(lines, chars)`` of the rendered text without rendering it.
+
+    Repeated sections are sized arithmetically, so the cost depends on the
+    number of nodes, not on channel counts.
+    """
+    lines = chars = 0
+    for chunk in _Renderer(indent).design(design):
+        if isinstance(chunk, Run):
+            if not chunk.count:
+                continue
+            lines += chunk.text.count('\n') * chunk.count
+            placeholders = chunk.text.count('{i}')
+            chars += (len(chunk.text) - 3 * placeholders) * chunk.count
+            chars += placeholders * _digits_total(chunk.start, chunk.start + chunk.count)
+        else:
+            lines += chunk.count('\n')
+            chars += len(chunk)
+    # A final line without a trailing newline still counts as a line
+    return lines + 1, chars
+
+
+def _digits_total(start, stop):
+    """Total number of decimal digits in ``str(i)`` for ``start <= i < stop`` (non-negative)."""
+    total = 0
+    low, digits = 0, 1
+    while low < stop:
+        high = 10 ** digits
+        a, b = max(start, low), min(stop, high)
+        if a < b:
+            total += (b - a) * digits
+        low, digits = high, digits + 1
+    return total
+
+
+class _Renderer:
+    """Turns IR nodes into a stream of str and Run chunks."""
+
+    def __init__(self, indent):
+        self.indent = indent
+
+    def design(self, d):
+        for package in d.packages:
+            yield from self._context(package)
+            yield from self.package(package)
+            yield "\n\n"
+        yield from self._context(d)
+        yield from self.entity(d.entity)
+        yield "\n\n"
+        yield from self.architecture(d.architecture, d.entity.name)
+
+    def _context(self, unit):
+        for library in unit.libraries:
+            yield f"library {library};\n"
+        for use in unit.uses:
+            yield f"use {use};\n"
+        yield "\n"
+
+    def package(self, p):
+        yield f"package {p.name} is\n"
+        yield from self._declarations(p.declarations, 1)
+        yield f"end {p.name};"
+
+    def entity(self, e):
+        ind = self.indent
+        yield f"entity {e.name} is\n"
+        if e.generics:
+            yield f"{ind}generic (\n"
+            yield from self._items(e.generics, self._generic, 2, ";\n", "\n")
+            yield f"{ind});\n"
+        if e.ports:
+            yield f"{ind}port (\n"
+            yield from self._items(e.ports, self._port, 2, ";\n", "\n")
+            yield f"{ind});\n"
+        yield f"end {e.name};"
+
+    def architecture(self, a, entity_name):
+        yield f"architecture {a.name} of {entity_name} is\n"
+        yield from self._declarations(a.declarations, 1)
+        yield "begin\n"
+        previous = None
+        for statement in a.statements:
+            # Processes are set off from neighbouring statements by a blank line
+            if previous is not None and (_is_block(previous) or _is_block(statement)):
+                yield "\n"
+            yield from self._statement(statement, 1)
+            previous = statement
+        yield f"end {a.name};"
+
+    # -- lists --
+
+    def _items(self, items, render_one, level, sep, last_sep):
+        """Render ``items`` one per line, separated by ``sep`` and closed by ``last_sep``."""
+        prefix = self.indent * level
+        total = len(items)
+        for position, item in enumerate(items):
+            last = position == total - 1
+            if isinstance(item, Each):
+                text = prefix + render_one(item.node)
+                if last:
+                    if item.count > 1:
+                        yield Run(item.count - 1, text + _commented(item.node, sep), item.start)
+                    if item.count:
+                        yield Run(1, text + _commented(item.node, last_sep), item.start + item.count - 1)
+                else:
+                    yield Run(item.count, text + _commented(item.node, sep), item.start)
+            else:
+                yield prefix + render_one(item) + _commented(item, last_sep if last else sep)
+
+    def _inline(self, items, sep=", "):
+        """Render a list of expressions on one line."""
+        total = len(items)
+        for position, item in enumerate(items):
+            tail = "" if position == total - 1 else sep
+            if isinstance(item, Each):
+                if position == total - 1:
+                    if item.count > 1:
+                        yield Run(item.count - 1, item.node + sep, item.start)
+                    if item.count:
+                        yield Run(1, item.node, item.start + item.count - 1)
+                else:
+                    yield Run(item.count, item.node + sep, item.start)
+            else:
+                yield item + tail
+
+    def _generic(self, g):
+        default = f" := {g.default}" if g.default is not None else ""
+        return f"{g.name} : {g.type}{default}"
+
+    def _port(self, p):
+        return f"{p.name} : {p.mode} {p.type}"
+
+    def _param(self, p):
+        kind = "signal " if p.signal else ""
+        mode = f"{p.mode} " if p.mode else ""
+        return f"{kind}{p.name} : {mode}{p.type}"
+
+    # -- declarations --
+
+    def _declarations(self, declarations, level):
+        previous = None
+        for declaration in declarations:
+            # Subprograms are set off from neighbouring declarations by a blank line
+            if previous is not None and (isinstance(previous, Subprogram) or isinstance(declaration, Subprogram)):
+                yield "\n"
+            yield from self._declaration(declaration, level)
+            previous = declaration
+
+    def _declaration(self, d, level):
+        prefix = self.indent * level
+        if isinstance(d, Each):
+            yield Run(d.count, self._flat(self._declaration(d.node, level)), d.start)
+        elif isinstance(d, Signal):
+            init = f" := {d.init}" if d.init is not None else ""
+            yield f"{prefix}signal {d.name} : {d.type}{init};\n"
+        elif isinstance(d, Variable):
+            init = f" := {d.init}" if d.init is not None else ""
+            yield f"{prefix}variable {d.name} : {d.type}{init};\n"
+        elif isinstance(d, TypeDecl):
+            yield f"{prefix}type {d.name} is {d.definition};\n"
+        elif isinstance(d, AttributeDecl):
+            yield f"{prefix}attribute {d.name} : {d.type};\n"
+        elif isinstance(d, AttributeSpec):
+            yield f"{prefix}attribute {d.name} of {d.target} : {d.entity_class} is {d.value};\n"
+        elif isinstance(d, Subprogram):
+            yield from self._subprogram(d, level)
+        elif isinstance(d, Comment):
+            yield f"{prefix}-- {d.text}\n"
+        else:
+            raise TypeError(f"Unsupported declaration node: {type(d).__name__}")
+
+    def _subprogram(self, s, level):
+        prefix = self.indent * level
+        inner = self.indent * (level + 1)
+        kind = "procedure" if s.returns is None else "function"
+        if s.params:
+            yield f"{prefix}{kind} {s.name}(\n"
+            if s.returns is None:
+                yield from self._items(s.params, self._param, level + 1, ";\n", ") is\n")
+            else:
+                yield from self._items(s.params, self._param, level + 1, ";\n", ")\n")
+                yield f"{inner}return {s.returns} is\n"
+        elif s.returns is None:
+            yield f"{prefix}procedure {s.name} is\n"
+        else:
+            yield f"{prefix}function {s.name} return {s.returns} is\n"
+        for declaration in s.declarations:
+            yield from self._declaration(declaration, level + 1)
+        yield f"{prefix}begin\n"
+        yield from self._statements(s.statements, level + 1)
+        yield f"{prefix}end {kind};\n"
+
+    # -- statements --
+
+    def _statements(self, statements, level):
+        for statement in statements:
+            yield from self._statement(statement, level)
+
+    def _statement(self, s, level):
+        prefix = self.indent * level
+        if isinstance(s, Each):
+            yield Run(s.count, self._flat(self._statement(s.node, level)), s.start)
+        elif isinstance(s, (Assign, VarAssign, Return, Null, Call)):
+            yield prefix
+            yield from self._simple(s)
+            yield "\n"
+        elif isinstance(s, Process):
+            yield f"{prefix}process("
+            yield from self._inline(s.sensitivity)
+            yield ")\n"
+            for declaration in s.declarations:
+                yield from self._declaration(declaration, level + 1)
+            yield f"{prefix}begin\n"
+            yield from self._statements(s.statements, level + 1)
+            yield f"{prefix}end process;\n"
+        elif isinstance(s, If):
+            keyword = "if"
+            for condition, statements in s.branches:
+                yield f"{prefix}{keyword} {condition} then\n"
+                yield from self._statements(statements, level + 1)
+                keyword = "elsif"
+            if s.orelse is not None:
+                yield f"{prefix}else\n"
+                yield from self._statements(s.orelse, level + 1)
+            yield f"{prefix}end if;\n"
+        elif isinstance(s, For):
+            yield f"{prefix}for {s.var} in {s.low} to {s.high} loop\n"
+            yield from self._statements(s.statements, level + 1)
+            yield f"{prefix}end loop;\n"
+        elif isinstance(s, Case):
+            yield f"{prefix}case {s.selector} is\n"
+            for arm in s.arms:
+                if isinstance(arm, Each):
+                    yield Run(arm.count, self._flat(self._when(arm.node, level + 1)), arm.start)
+                else:
+                    yield from self._when(arm, level + 1)
+            yield f"{prefix}end case;\n"
+        elif isinstance(s, Comment):
+            yield f"{prefix}-- {s.text}\n"
+        else:
+            raise TypeError(f"Unsupported statement node: {type(s).__name__}")
+
+    def _when(self, w, level):
+        prefix = self.indent * level
+        if len(w.statements) == 1 and isinstance(w.statements[0], (Assign, VarAssign, Null)):
+            yield f"{prefix}when {w.choice} => "
+            yield from self._simple(w.statements[0])
+            yield "\n"
+        else:
+            yield f"{prefix}when {w.choice} =>\n"
+            yield from self._statements(w.statements, level + 1)
+
+    def _simple(self, s):
+        """Render a one-line statement without indentation or newline."""
+        if isinstance(s, Assign):
+            if isinstance(s.target, (list, tuple)):
+                yield "("
+                yield from self._inline(s.target)
+                yield ") <= "
+            else:
+                yield f"{s.target} <= "
+            yield from self._expression(s.value)
+            yield ";"
+        elif isinstance(s, VarAssign):
+            yield f"{s.target} := "
+            yield from self._expression(s.value)
+            yield ";"
+        elif isinstance(s, Return):
+            yield "return "
+            yield from self._expression(s.value)
+            yield ";"
+        elif isinstance(s, Call):
+            yield f"{s.name}("
+            yield from self._inline(s.args)
+            yield ");"
+        else:
+            yield "null;"
+
+    def _expression(self, value):
+        if isinstance(value, CallExpr):
+            yield f"{value.name}("
+            yield from self._inline(value.args)
+            yield ")"
+        else:
+            yield value
+
+    def _flat(self, chunks):
+        """Join the chunks of a node repeated by Each, which must not repeat anything itself."""
+        parts = []
+        for chunk in chunks:
+            if isinstance(chunk, Run):
+                raise ValueError("Each nodes cannot be nested")
+            parts.append(chunk)
+        return ''.join(parts)
+
+
+def _commented(item, sep):
+    """``sep`` with the item's end-of-line comment, if any, before its newline."""
+    comment = getattr(item, 'comment', None)
+    if comment is None:
+        return sep
+    return f"{sep[:-1]}  -- {comment}\n"
+
+
+def _is_block(statement):
+    return isinstance(statement, Process)
@@ -0,0 +1,109 @@
+"""Generation of one request on a background thread.
+
+A GenerationJob renders in a daemon thread so the caller (the Tk window)
+stays responsive.  The caller polls ``progress`` and ``done`` - from Tk via
+``after()``, since Tk widgets must only be touched from the main thread -
+and can ``cancel()`` at any time; the worker checks for cancellation
+between chunks and stops within a few milliseconds.
+"""
+import threading
+
+import vhdl_budget
+import vhdl_engine
+
+
+class GenerationJob:
+    """Renders one request on a worker thread.
+
+    When ``done`` is set exactly one of ``result`` (the code), ``error``
+    (the exception) or ``cancelled`` describes the outcome.  ``progress``
+    goes from 0.0 to 1.0; it is exact because the output size is known from
+    the estimate before rendering starts.  With a vhdl_history.GenerationHistory
+    the result is also recorded there before ``done`` is set.
+    """
+
+    def __init__(self, component, code_type, entity_name, arch_name, func_proc_name, params, disk_cache=None,
+                 history=None):
+        self.request = {
+            "component": component,
+            "code_type": code_type,
+            "entity_name": entity_name,
+            "arch_name": arch_name,
+            "func_proc_name": func_proc_name,
+            "params": params,
+        }
+        self.disk_cache = disk_cache
+        self.history = history
+        self.progress = 0.0
+        self.result = None
+        self.error = None
+        self.cancelled = False
+        self._cancel = threading.Event()
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="vhdl-generate", daemon=True)
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        """Ask the worker to stop; ``done`` becomes true shortly after."""
+        self._cancel.set()
+
+    def wait(self, timeout=None):
+        """Block until the job finishes; returns ``done``."""
+        return self._done.wait(timeout)
+
+    def _run(self):
+        try:
+            self.result = self._generate()
+            if self.history is not None:
+                # Compressing here keeps large outputs off the caller's thread
+                self.history.add(self.request, self.result)
+            self.progress = 1.0
+        except _Cancelled:
+            self.cancelled = True
+        except Exception as e:
+            self.error = e
+        finally:
+            self._done.set()
+
+    def _generate(self):
+        request = self.request
+        key = vhdl_engine.request_key(**request)
+        code = vhdl_engine.render_cache.get(key)
+        if code is not None:
+            return code
+
+        disk_key = None
+        if self.disk_cache is not None:
+            disk_key = self.disk_cache.key(**request)
+            code = self.disk_cache.get(disk_key)
+            if code is not None:
+                vhdl_engine.render_cache.put(key, code)
+                return code
+
+        total = max(vhdl_budget.estimate(**request).bytes, 1)
+        cancel = self._cancel
+        parts = []
+        produced = 0
+        for chunk in vhdl_engine.iter_vhdl(**request):
+            if cancel.is_set():
+                raise _Cancelled()
+            parts.append(chunk)
+            produced += len(chunk)
+            self.progress = produced / total
+        code = ''.join(parts)
+
+        vhdl_engine.render_cache.put(key, code)
+        if disk_key is not None:
+            self.disk_cache.put(disk_key, code)
+        return code
+
+
+class _Cancelled(Exception):
+    pass
@@ -0,0 +1,159 @@
+"""Non-interactive validation of generation requests.
+
+``validate`` checks every field of a request in one pass and returns a list
+of ValidationError objects instead of showing message boxes, so the same
+rules serve the GUI, the batch command and any other caller.  The reserved
+word set and the naming pattern are compiled once at import; a valid name
+costs one regex match and one set lookup.
+"""
+import re
+
+import vhdl_budget
+import vhdl_components
+
+# VHDL reserved words
+RESERVED_WORDS = frozenset({
+    'abs', 'access', 'after', 'alias', 'all', 'and', 'architecture', 'array', 'assert', 'attribute',
+    'begin', 'block', 'body', 'buffer', 'bus', 'case', 'component', 'configuration', 'constant',
+    'disconnect', 'downto', 'else', 'elsif', 'end', 'entity', 'exit', 'file', 'for', 'function',
+    'generate', 'generic', 'group', 'guarded', 'if', 'impure', 'in', 'inertial', 'inout', 'is',
+    'label', 'library', 'linkage', 'literal', 'loop', 'map', 'mod', 'nand', 'new', 'next', 'nor',
+    'not', 'null', 'of', 'on', 'open', 'or', 'others', 'out', 'package', 'port', 'postponed',
+    'procedure', 'process', 'pure', 'range', 'record', 'register', 'reject', 'rem', 'report',
+    'return', 'rol', 'ror', 'select', 'severity', 'signal', 'shared', 'sla', 'sll', 'sra', 'srl',
+    'subtype', 'then', 'to', 'transport', 'type', 'unaffected', 'units', 'until', 'use', 'variable',
+    'wait', 'when', 'while', 'with', 'xnor', 'xor'
+})
+
+# Words reserved from VHDL-2000 (protected) and VHDL-2008 on, checked for the VHDL-2008 dialect
+RESERVED_WORDS_2008 = RESERVED_WORDS | frozenset({
+    'assume', 'assume_guarantee', 'context', 'cover', 'default', 'fairness', 'force', 'parameter',
+    'property', 'protected', 'release', 'restrict', 'restrict_guarantee', 'sequence', 'strong',
+    'vmode', 'vprop', 'vunit'
+})
+
+# A letter, then letters/digits with single underscores between them
+NAME_PATTERN = re.compile(r'[A-Za-z](?:_?[A-Za-z0-9])*\Z')
+NAME_CHARS = re.compile(r'[A-Za-z0-9_]*\Z')
+
+NAME_FIELDS = (
+    ("entity_name", "Entity"),
+    ("arch_name", "Architecture"),
+    ("func_proc_name", "Function/Procedure"),
+)
+
+
+class ValidationError:
+    """One problem with a request.
+
+    ``field`` is the request field (``entity_name``, ``component``, or a
+    parameter key such as ``inputs``), ``code`` a stable identifier such as
+    ``reserved_word`` or ``not_power_of_two``, and ``message`` the text shown
+    to users.
+    """
+    __slots__ = ('field', 'code', 'message')
+
+    def __init__(self, field, code, message):
+        self.field = field
+        self.code = code
+        self.message = message
+
+    def __repr__(self):
+        return f"ValidationError({self.field!r}, {self.code!r}, {self.message!r})"
+
+    def __eq__(self, other):
+        return (isinstance(other, ValidationError) and
+                (self.field, self.code, self.message) == (other.field, other.code, other.message))
+
+    def __hash__(self):
+        return hash((self.field, self.code, self.message))
+
+    def as_dict(self):
+        return {"field": self.field, "code": self.code, "message": self.message}
+
+
+def check_name(name, field_name, reserved=RESERVED_WORDS):
+    """Return ``(code, message)`` if ``name`` breaks VHDL naming conventions, else None.
+
+    ``reserved`` is the reserved word set of the target dialect.
+    """
+    if name and NAME_PATTERN.match(name) and name.lower() not in reserved:
+        return None
+
+    if not name:
+        return "empty", f"{field_name} name cannot be empty"
+    if name.lower() in RESERVED_WORDS:
+        return "reserved_word", f"{field_name} name '{name}' is a VHDL reserved word"
+    if name.lower() in reserved:
+        return "reserved_word", f"{field_name} name '{name}' is a VHDL-2008 reserved word"
+    if ' ' in name:
+        return "contains_space", f"{field_name} name cannot contain spaces"
+    if not ('A' <= name[0] <= 'Z' or 'a' <= name[0] <= 'z'):
+        return "bad_start", f"{field_name} name must start with a letter"
+    if not NAME_CHARS.match(name):
+        return "invalid_character", f"{field_name} name can only contain letters, numbers, and underscores"
+    if name.endswith('_'):
+        return "trailing_underscore", f"{field_name} name cannot end with an underscore"
+    return "double_underscore", f"{field_name} name cannot contain consecutive underscores"
+
+
+def check_vhdl_name(name, field_name):
+    """Return an error message if ``name`` breaks VHDL naming conventions, else None."""
+    problem = check_name(name, field_name)
+    return problem[1] if problem else None
+
+
+def validate(component, code_type, entity_name, arch_name, func_proc_name, params, budget=None):
+    """Return every problem with a request as a list of ValidationError (empty if valid).
+
+    With a vhdl_budget.Budget, a request that is otherwise valid is also
+    sized and rejected (field ``size``) if its output would exceed the
+    budget.  Interactive warnings (such as the large SRAM confirmation) are
+    not errors and are left to the caller.
+    """
+    errors = []
+
+    spec = vhdl_components.COMPONENTS.get(component)
+    if spec is None:
+        errors.append(ValidationError("component", "unknown_component", f"Unknown component '{component}'"))
+    if code_type not in vhdl_components.CODE_TYPES:
+        errors.append(ValidationError("code_type", "unknown_code_type", f"Unknown code type '{code_type}'"))
+
+    names_valid = True
+    reserved = RESERVED_WORDS_2008 if vhdl_components.vhdl2008(params) else RESERVED_WORDS
+    for (field, field_name), name in zip(NAME_FIELDS, (entity_name, arch_name, func_proc_name)):
+        problem = check_name(name, field_name, reserved)
+        if problem:
+            names_valid = False
+            errors.append(ValidationError(field, *problem))
+
+    # Check for duplicate names
+    if names_valid:
+        entity_lower, arch_lower, func_lower = entity_name.lower(), arch_name.lower(), func_proc_name.lower()
+        if entity_lower == arch_lower or entity_lower == func_lower or arch_lower == func_lower:
+            errors.append(ValidationError("names", "duplicate_name",
+                                          "Entity, Architecture, and Function/Procedure names must be unique"))
+
+    if spec is not None:
+        params_valid = True
+        for param in spec.params:
+            problem = param.check(params.get(param.key))
+            if problem:
+                params_valid = False
+                errors.append(ValidationError(param.key, *problem))
+        if params_valid and spec.check is not None:
+            problem = spec.check(vhdl_components.normalize_params(component, params))
+            if problem:
+                errors.append(ValidationError(*problem))
+
+    if budget is not None and not errors:
+        estimate = vhdl_budget.estimate(component, code_type, entity_name, arch_name, func_proc_name, params)
+        errors.extend(ValidationError("size", *problem) for problem in budget.check(estimate))
+    return errors
+
+
+def validate_request(component, code_type, entity_name, arch_name, func_proc_name, params, budget=None):
+    """Raise ValueError with the message of the first problem in a request, if any."""
+    errors = validate(component, code_type, entity_name, arch_name, func_proc_name, params, budget)
+    if errors:
+        raise ValueError(errors[0].message)